@@ -1,15 +1,42 @@
 import logging
+import re
+import time
 from abc import ABC, abstractmethod
 from functools import cached_property
 from types import TracebackType
 from typing import ClassVar, Self
 
 import httpx
+from opentelemetry import metrics
 
 from app.conf import Settings
 
 logger = logging.getLogger(__name__)
 
+meter = metrics.get_meter(__name__)
+
+request_duration_histogram = meter.create_histogram(
+    "api_client.request.duration",
+    unit="s",
+    description="Duration of the requests sent to the upstream APIs",
+)
+
+_REQUEST_START_TIME_KEY = "ffc_request_start_time"
+# The path segments identifying a resource (UUIDs, numbers, FFC ids...) all contain a digit,
+# unlike the other ones apart from the API version
+_ID_SEGMENT_RE = re.compile(r"^(?!v\d+$)[^/]*\d[^/]*$")
+
+
+def get_endpoint_template(path: str) -> str:
+    """
+    Replaces the identifiers in the given path with a placeholder so the requests to the
+    same endpoint share the same metric attributes,
+    e.g. `/organizations/{id}/cloud_accounts`.
+    """
+    return "/".join(
+        "{id}" if _ID_SEGMENT_RE.match(segment) else segment for segment in path.split("/")
+    )
+
 
 class APIClientError(Exception):
     client_name: ClassVar[str]
@@ -49,6 +76,30 @@ class BaseAPIClient(ABC):
                 write=2.0,
                 pool=5.0,
             ),
+            event_hooks={
+                "request": [self._on_request],
+                "response": [self._on_response],
+            },
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        request.extensions[_REQUEST_START_TIME_KEY] = time.perf_counter()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        request = response.request
+        start_time = request.extensions.get(_REQUEST_START_TIME_KEY)
+        if start_time is None:  # pragma: no cover
+            return
+
+        request_duration_histogram.record(
+            time.perf_counter() - start_time,
+            {
+                "api_client": type(self).__name__,
+                "server.address": request.url.host,
+                "http.request.method": request.method,
+                "http.response.status_code": response.status_code,
+                "url.template": get_endpoint_template(request.url.path),
+            },
         )
 
     async def __aenter__(self) -> Self:
@@ -1,15 +1,24 @@
-import inspect
-
+import importlib
+import pathlib
+import pkgutil
+import sys
+import threading
+from typing import Annotated
+
+import click
 import typer
-from pyfiglet import Figlet
 from rich.console import Console
 from rich.text import Text
+from typer.core import TyperGroup
+from typer.main import get_command_from_info
+from typer.models import CommandInfo
 
 from app import commands
 from app.conf import get_settings
 from app.db.base import configure_db_engine
 from app.logging import setup_logging
-from app.telemetry import setup_telemetry
+from app.profiling import SamplingProfiler
+from app.telemetry import set_run_report_path, setup_telemetry
 
 
 def gradient(start_hex, end_hex, num_samples=10):  # pragma: no cover
@@ -28,6 +37,9 @@ def gradient(start_hex, end_hex, num_samples=10):  # pragma: no cover
 
 
 def show_banner():  # pragma: no cover
+    # pyfiglet loads its fonts on import, only pay for it when the banner is shown
+    from pyfiglet import Figlet
+
     program_name = "FFCOps"
     figlet = Figlet("georgia11")
 
@@ -51,28 +63,96 @@ def show_banner():  # pragma: no cover
         console.print(colored_line)
 
 
+class LazyCommandsGroup(TyperGroup):
+    """
+    Group of the `app.commands` modules, each module defining a `command` function.
+
+    The modules are only imported when their command is run (or the help is shown), so the
+    short commands don't pay for the imports of the other ones (e.g. the whole API for
+    `serve` or IPython for `shell`).
+    """
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return [
+            module_info.name.replace("_", "-")
+            for module_info in pkgutil.iter_modules(commands.__path__)
+        ]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.list_commands(ctx):
+            return None
+
+        module = importlib.import_module(f"{commands.__name__}.{cmd_name.replace('-', '_')}")
+        if not hasattr(module, "command"):
+            return None
+
+        return get_command_from_info(
+            CommandInfo(name=cmd_name, callback=module.command),
+            pretty_exceptions_short=True,
+            rich_markup_mode=self.rich_markup_mode,
+        )
+
+
 app = typer.Typer(
+    cls=LazyCommandsGroup,
     help="FinOps for Cloud Operations API Command Line Interface",
     add_completion=False,
     rich_markup_mode="rich",
 )
 
 
-for name, module in inspect.getmembers(commands):
-    if not inspect.ismodule(module):
-        continue
+def start_profiler(ctx: typer.Context, output_path: pathlib.Path) -> None:
+    # The commands run in the main thread, the other ones (e.g. the profiler) are left out
+    profiler = SamplingProfiler(thread_ids={threading.get_ident()})
+
+    def write_profile() -> None:
+        profiler.stop()
+        output_path.write_text(profiler.collapsed_stacks())
 
-    if hasattr(module, "command"):
-        app.command(name=name.replace("_", "-"))(module.command)
+    profiler.start()
+    ctx.call_on_close(write_profile)
 
 
 @app.callback()
 def main(
     ctx: typer.Context,
+    run_report: Annotated[
+        str | None,
+        typer.Option(
+            "--run-report",
+            envvar="FFC_OPERATIONS_CLI_RUN_REPORT",
+            help=(
+                "Write a JSON report of the command run (status, duration of its phases, "
+                "items processed) to the given file, or to stdout with '-'."
+            ),
+        ),
+    ] = None,
+    profile: Annotated[
+        pathlib.Path | None,
+        typer.Option(
+            "--profile",
+            help=(
+                "Profile the command and write the sampled stacks to the given file, in the "
+                "collapsed stacks format read by flamegraph.pl or speedscope."
+            ),
+        ),
+    ] = None,
+    no_banner: Annotated[
+        bool,
+        typer.Option(
+            "--no-banner",
+            help="Don't show the banner, it's never shown when stdout is not a terminal.",
+        ),
+    ] = False,
 ):
-    show_banner()
+    if profile is not None:
+        start_profiler(ctx, profile)
+    # Keep stdout parseable when the report is written to it
+    if not no_banner and run_report != "-" and sys.stdout.isatty():
+        show_banner()
     settings = get_settings()
     ctx.obj = settings
+    set_run_report_path(run_report)
     setup_telemetry(settings)
     if ctx.invoked_subcommand != "serve":
         setup_logging(settings)
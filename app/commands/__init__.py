@@ -1,25 +0,0 @@
-from app.commands import (
-    calculate_accounts_stats,
-    check_expired_invitations,
-    cleanup_obsolete_datasource_expenses,
-    create_operations_account,
-    fetch_datasource_expenses,
-    invite_user,
-    openapi,
-    redeem_entitlements,
-    serve,
-    shell,
-)
-
-__all__ = [
-    "check_expired_invitations",
-    "create_operations_account",
-    "invite_user",
-    "openapi",
-    "redeem_entitlements",
-    "serve",
-    "shell",
-    "calculate_accounts_stats",
-    "fetch_datasource_expenses",
-    "cleanup_obsolete_datasource_expenses",
-]
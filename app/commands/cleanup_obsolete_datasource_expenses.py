@@ -1,14 +1,15 @@
 import asyncio
 import logging
 from datetime import UTC, datetime
+from typing import Annotated
 
 import typer
 from dateutil.relativedelta import relativedelta  # type: ignore[import-untyped]
-from sqlalchemy import delete, func, select
 
 from app.conf import Settings
 from app.db.base import session_factory
 from app.db.models import DatasourceExpense
+from app.db.partitioning import drop_monthly_partitions_before
 from app.notifications import send_info
 from app.telemetry import capture_telemetry_cli_command
 
@@ -16,45 +17,65 @@ logger = logging.getLogger(__name__)
 
 
 @capture_telemetry_cli_command(__name__, "Cleanup Obsolete Datasource Expenses")
-async def main(settings: Settings) -> None:
+async def main(settings: Settings, detach_only: bool = False) -> None:
     async with session_factory.begin() as session:
-        logger.info("Fetching obsolete datasource expenses from the database")
+        threshold_date = (
+            datetime.now(UTC)
+            - relativedelta(months=settings.datasources_expenses_obsolete_after_months)
+        ).date()
+        # Expenses are partitioned by month: a month is obsolete only when all its days are
+        threshold_date = threshold_date.replace(day=1)
 
-        threshold_date = datetime.now(UTC) - relativedelta(
-            months=settings.datasources_expenses_obsolete_after_months
+        logger.info(
+            "Removing datasource expenses partitions older than %s", threshold_date.isoformat()
         )
-        where_cond = DatasourceExpense.created_at < threshold_date
 
-        num_obsolete_expenses = await session.scalar(
-            select(func.count(DatasourceExpense.id)).where(where_cond)
+        removed_partitions = await drop_monthly_partitions_before(
+            session,
+            DatasourceExpense,
+            threshold_date.year,
+            threshold_date.month,
+            detach_only=detach_only,
         )
 
-        logger.info("Found %d obsolete datasource expenses to delete", num_obsolete_expenses)
+        for partition_name, num_expenses in removed_partitions.items():
+            logger.info(
+                "%s %s containing %d datasource expenses",
+                "Detached" if detach_only else "Deleted",
+                partition_name,
+                num_expenses,
+            )
+
+        num_obsolete_expenses = sum(removed_partitions.values())
 
         if num_obsolete_expenses == 0:
             logger.info("No obsolete datasource expenses to delete")
             return
 
-        logger.info(
-            "Deleting %s obsolete datasource expenses from the database", num_obsolete_expenses
-        )
-
-        result = await session.execute(delete(DatasourceExpense).where(where_cond))
-
         message = (
-            f"{result.rowcount} obsolete (older than "
-            f"{threshold_date.isoformat()}) datasource expenses have been deleted."
+            f"{num_obsolete_expenses} obsolete (older than "
+            f"{threshold_date.isoformat()}) datasource expenses have been "
+            f"{'detached' if detach_only else 'deleted'}."
         )
 
         logger.info(message)
-        if result.rowcount > 0:
-            await send_info("Cleanup Obsolete Datasource Expenses Success", message)
+        await send_info("Cleanup Obsolete Datasource Expenses Success", message)
 
 
-def command(ctx: typer.Context) -> None:
+def command(
+    ctx: typer.Context,
+    detach_only: Annotated[
+        bool,
+        typer.Option(
+            "--detach-only",
+            help="Detach the obsolete partitions instead of dropping them. Default: False",
+            show_default=True,
+        ),
+    ] = False,
+) -> None:
     """
     Delete all datasource expenses older than 6 months from the database.
     """
     logger.info("Starting command function")
-    asyncio.run(main(ctx.obj))
+    asyncio.run(main(ctx.obj, detach_only))
     logger.info("Completed command function")
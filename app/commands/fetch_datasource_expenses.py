@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from collections.abc import Sequence
 from datetime import UTC, datetime
 from typing import Annotated
@@ -8,17 +9,24 @@ import typer
 from dateutil.relativedelta import relativedelta
 from fastapi import status
 from httpx import HTTPStatusError, ReadTimeout
+from opentelemetry import trace
 
 from app.api_clients.optscale import OptscaleClient
 from app.conf import Settings
-from app.db.base import session_factory
+from app.db.base import read_only_session, session_factory
 from app.db.handlers import DatasourceExpenseHandler, OrganizationHandler
 from app.db.models import DatasourceExpense, Organization
+from app.db.partitioning import create_monthly_partitions
 from app.enums import DatasourceType, OrganizationStatus
 from app.notifications import send_exception, send_info
-from app.telemetry import capture_telemetry_cli_command
+from app.telemetry import (
+    capture_telemetry_cli_command,
+    cli_command_phase,
+    record_cli_job_throughput,
+)
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 
 def filter_relevant_datasources(datasources: list[dict]) -> list[dict]:
@@ -134,32 +142,79 @@ async def fetch_datasource_expenses(
     day_start = int((datetime(year, month, day, 0, 0, 0, tzinfo=UTC)).timestamp())
     day_end = int((datetime(year, month, day, 23, 59, 59, tzinfo=UTC)).timestamp())
 
-    for organization in organizations:
-        if organization.linked_organization_id is None:
-            logger.warning(
-                "Organization %s - %s has no linked organization ID. Skipping...",
-                organization.id,
-                organization.name,
-            )
-            continue
-
-        if is_daily:
-            organization_expenses = await fetch_daily_organization_expenses(
-                organization,
-                optscale_client,
-                day_start,
-                day_end,
-            )
-        else:
-            organization_expenses = await fetch_total_monthly_organization_expenses(
-                organization,
-                optscale_client,
-            )
-        expenses[organization.id] = organization_expenses
+    frequency = "daily" if is_daily else "monthly"
+    with cli_command_phase("fetch", frequency=frequency):
+        for organization in organizations:
+            if organization.linked_organization_id is None:
+                logger.warning(
+                    "Organization %s - %s has no linked organization ID. Skipping...",
+                    organization.id,
+                    organization.name,
+                )
+                continue
+
+            with tracer.start_as_current_span(
+                "Fetch organization expenses",
+                attributes={"organization.id": organization.id, "frequency": frequency},
+            ):
+                if is_daily:
+                    organization_expenses = await fetch_daily_organization_expenses(
+                        organization,
+                        optscale_client,
+                        day_start,
+                        day_end,
+                    )
+                else:
+                    organization_expenses = await fetch_total_monthly_organization_expenses(
+                        organization,
+                        optscale_client,
+                    )
+            expenses[organization.id] = organization_expenses
 
     return expenses
 
 
+type DatasourceExpenseKey = tuple[str, str, DatasourceType]
+
+
+async def fetch_existing_datasource_expenses(
+    datasource_expense_handler: DatasourceExpenseHandler,
+    expenses_per_organization: dict[str, list[dict]],
+    year: int,
+    month: int,
+    day: int,
+) -> dict[DatasourceExpenseKey, DatasourceExpense]:
+    """
+    Returns the expenses already stored for the given day, by organization, datasource
+    and datasource type, with a single query.
+    """
+    datasource_ids = {
+        datasource["account_id"]
+        for datasources in expenses_per_organization.values()
+        for datasource in datasources
+    }
+    if not datasource_ids:
+        return {}
+
+    datasource_expenses = await datasource_expense_handler.query_db(
+        where_clauses=[
+            DatasourceExpense.organization_id.in_(expenses_per_organization),
+            DatasourceExpense.datasource_id.in_(datasource_ids),
+            DatasourceExpense.year == year,
+            DatasourceExpense.month == month,
+            DatasourceExpense.day == day,
+        ],
+    )
+    return {
+        (
+            datasource_expense.organization_id,
+            datasource_expense.datasource_id,
+            datasource_expense.linked_datasource_type,
+        ): datasource_expense
+        for datasource_expense in datasource_expenses
+    }
+
+
 async def store_datasource_expenses(
     datasource_expense_handler: DatasourceExpenseHandler,
     expenses_per_organization: dict[str, list[dict]],
@@ -168,57 +223,72 @@ async def store_datasource_expenses(
     day: int,
     is_daily: bool = False,
 ) -> None:
+    """
+    Stores the expenses of the datasources of the organizations for the given day with
+    a query for the existing rows, a bulk update and a bulk create, whatever the number of
+    datasources.
+
+    The daily expenses only update the existing rows, the monthly total expenses also
+    create the missing ones. The rows stored before the type of the datasources was known
+    (with the `unknown` type) are updated with it.
+    """
     org_count = 0
     ds_count = 0
+    frequency = "daily" if is_daily else "monthly"
+    start_time = time.perf_counter()
 
-    for organization_id, datasources in expenses_per_organization.items():
-        org_count += 1
-        ds_count += len(datasources)
-
-        for datasource in datasources:
-            defaults = {
-                "datasource_name": datasource["name"],
-                "linked_datasource_id": datasource["id"],
-                "linked_datasource_type": datasource["type"],
-            }
-            if is_daily:
-                defaults["expenses"] = datasource["total"]
-
-                existing_ds_expense = await datasource_expense_handler.first(
-                    where_clauses=[
-                        DatasourceExpense.datasource_id == datasource["account_id"],
-                        DatasourceExpense.organization_id == organization_id,
-                        DatasourceExpense.year == year,
-                        DatasourceExpense.month == month,
-                        DatasourceExpense.day == day,
-                        DatasourceExpense.linked_datasource_type.in_(
-                            [DatasourceType.UNKNOWN, datasource["type"]]
-                        ),
-                    ],
-                )
-                created = False
-            else:
-                defaults["total_expenses"] = datasource["details"]["cost"]
-
-                existing_ds_expense, created = await datasource_expense_handler.get_or_create(
-                    datasource_id=datasource["account_id"],
-                    organization_id=organization_id,
-                    year=year,
-                    month=month,
-                    day=day,
-                    defaults=defaults,
-                    extra_conditions=[
-                        DatasourceExpense.linked_datasource_type.in_(
-                            [DatasourceType.UNKNOWN, datasource["type"]]
-                        )
-                    ],
+    with cli_command_phase("store", frequency=frequency):
+        existing_expenses = await fetch_existing_datasource_expenses(
+            datasource_expense_handler, expenses_per_organization, year, month, day
+        )
+        values_to_update: dict[str, dict] = {}
+        values_to_create: dict[DatasourceExpenseKey, dict] = {}
+
+        for organization_id, datasources in expenses_per_organization.items():
+            org_count += 1
+            ds_count += len(datasources)
+
+            for datasource in datasources:
+                datasource_type = DatasourceType(datasource["type"])
+                values = {
+                    "datasource_name": datasource["name"],
+                    "linked_datasource_id": datasource["id"],
+                    "linked_datasource_type": datasource_type,
+                }
+                if is_daily:
+                    values["expenses"] = datasource["total"]
+                else:
+                    values["total_expenses"] = datasource["details"]["cost"]
+
+                key = (organization_id, datasource["account_id"], datasource_type)
+                existing_expense = existing_expenses.get(key) or existing_expenses.get(
+                    (organization_id, datasource["account_id"], DatasourceType.UNKNOWN)
                 )
+                if existing_expense is not None:
+                    # The partition key is part of the primary key
+                    values_to_update[existing_expense.id] = {
+                        "id": existing_expense.id,
+                        "year": year,
+                        "month": month,
+                        **values,
+                    }
+                elif not is_daily:
+                    values_to_create[key] = {
+                        "datasource_id": datasource["account_id"],
+                        "organization_id": organization_id,
+                        "year": year,
+                        "month": month,
+                        "day": day,
+                        **values,
+                    }
+
+        await datasource_expense_handler.bulk_update(list(values_to_update.values()))
+        await datasource_expense_handler.bulk_create(list(values_to_create.values()))
+
+    duration = time.perf_counter() - start_time
+    for item, count in (("organizations", org_count), ("rows", ds_count)):
+        record_cli_job_throughput(item, count, duration, frequency=frequency)
 
-            if not created and existing_ds_expense:
-                await datasource_expense_handler.update(
-                    existing_ds_expense,
-                    defaults,
-                )
     msg = (
         f"{'Daily' if is_daily else 'Monthly'} expenses of {ds_count} datasources "
         f"configured by {org_count} Organizations have been updated."
@@ -232,25 +302,41 @@ async def main(settings: Settings, organization_id: str | None = None) -> None:
     today = datetime.now(UTC).date()
     yesterday = today - relativedelta(days=1)
 
+    # The organizations are only read, which the replica (if any) can do
+    async with read_only_session() as session:
+        organization_handler = OrganizationHandler(session)
+
+        if organization_id:
+            logger.info(f"Querying for provided organization {organization_id}")
+            organizations = await organization_handler.query_db(
+                where_clauses=[
+                    Organization.id == organization_id,
+                    Organization.status != OrganizationStatus.DELETED,
+                ],
+            )
+        else:
+            logger.info("Querying organizations")
+            organizations = await organization_handler.query_db(
+                where_clauses=[Organization.status != OrganizationStatus.DELETED]
+            )
+        logger.info("Found %d organizations to process", len(organizations))
+
     async with session_factory() as session:
         datasource_expense_handler = DatasourceExpenseHandler(session)
-        organization_handler = OrganizationHandler(session)
 
         async with session.begin():
-            if organization_id:
-                logger.info(f"Querying for provided organization {organization_id}")
-                organizations = await organization_handler.query_db(
-                    where_clauses=[
-                        Organization.id == organization_id,
-                        Organization.status != OrganizationStatus.DELETED,
-                    ],
-                )
-            else:
-                logger.info("Querying organizations")
-                organizations = await organization_handler.query_db(
-                    where_clauses=[Organization.status != OrganizationStatus.DELETED]
+            # Make sure the monthly partitions the expenses will be stored in exist, creating
+            # a few ahead so that they are never missing in case the command doesn't run.
+            created_partitions = await create_monthly_partitions(
+                session,
+                DatasourceExpense,
+                yesterday,
+                months=settings.datasources_expenses_partitions_ahead_months + 2,
+            )
+            if created_partitions:
+                logger.info(
+                    "Created datasource expenses partitions: %s", ", ".join(created_partitions)
                 )
-            logger.info("Found %d organizations to process", len(organizations))
 
         for day, is_daily, frq in [
             (today, False, "monthly"),
@@ -4,6 +4,7 @@ from datetime import UTC, datetime
 
 import httpx
 import typer
+from opentelemetry import trace
 from sqlalchemy.exc import DatabaseError
 
 from app.api_clients.optscale import OptscaleClient
@@ -18,9 +19,10 @@ from app.notifications import (
     send_exception,
     send_info,
 )
-from app.telemetry import capture_telemetry_cli_command
+from app.telemetry import capture_telemetry_cli_command, cli_command_phase, record_cli_job_items
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 BATCH_SIZE = 100
 
@@ -99,6 +101,69 @@ async def process_datasource(
         await send_exception("Redeem Entitlements Error", msg)
 
 
+async def redeem_organization_entitlements(
+    settings: Settings,
+    organization: Organization,
+    entitlement_handler: EntitlementHandler,
+) -> None:
+    logger.info(
+        f"Fetching datasources for organization: {organization.id} - {organization.name}..."
+    )
+    datasources = None
+    try:
+        with cli_command_phase("fetch"):
+            datasources = await fetch_datasources_for_organization(
+                settings,
+                organization.linked_organization_id,  # type: ignore
+            )
+    except (httpx.HTTPError, httpx.ReadTimeout) as e:
+        message = (
+            f"Failed to fetch datasources for organization {organization.id} "
+            f"({type(e).__name__}): {str(e) or repr(e)}"
+        )
+        logger.error(message)
+        await send_exception("Redeem Entitlements Error", message)
+        return
+    redeemed_entitlements = []
+    with cli_command_phase("store"):
+        for datasource in datasources:
+            entitlement = await process_datasource(
+                datasource,
+                organization,
+                entitlement_handler,
+            )
+            if entitlement:
+                redeemed_entitlements.append(entitlement)
+
+    record_cli_job_items("organizations", 1)
+    record_cli_job_items("entitlements", len(redeemed_entitlements))
+
+    if len(redeemed_entitlements) > 0:
+        msg = "Entitlement has" if len(redeemed_entitlements) == 1 else "Entitlements have"
+        msg = f"{len(redeemed_entitlements)} {msg} been successfully redeemed."
+        await send_info(
+            "Redeem Entitlements Success",
+            msg,
+            details=NotificationDetails(
+                header=(
+                    ColumnHeader("Entitlement", width="stretch"),
+                    ColumnHeader("Owner", width="stretch"),
+                    ColumnHeader("Organization", width="stretch"),
+                    ColumnHeader("Datasource", width="stretch"),
+                ),
+                rows=[
+                    (
+                        f"{ent.id}\t/\t{ent.name}",
+                        f"{ent.owner.id}\t/\t{ent.owner.name}",
+                        f"{ent.redeemed_by.id}\t/\t{ent.redeemed_by.name}",  # type: ignore
+                        f"{ent.datasource_id}\t/\t{ent.linked_datasource_name}",
+                    )
+                    for ent in redeemed_entitlements
+                ],
+            ),
+        )
+
+
 @capture_telemetry_cli_command(__name__, "Redeem Entitlements")
 async def redeem_entitlements(settings: Settings):
     # FIXME: Long-lived DB transaction (making API calls inside the transaction)
@@ -112,57 +177,11 @@ async def redeem_entitlements(settings: Settings):
             order_by=[Organization.created_at],
             batch_size=BATCH_SIZE,
         ):
-            logger.info(
-                f"Fetching datasources for organization: {organization.id} - {organization.name}..."
-            )
-            datasources = None
-            try:
-                datasources = await fetch_datasources_for_organization(
-                    settings,
-                    organization.linked_organization_id,  # type: ignore
-                )
-            except (httpx.HTTPError, httpx.ReadTimeout) as e:
-                message = (
-                    f"Failed to fetch datasources for organization {organization.id} "
-                    f"({type(e).__name__}): {str(e) or repr(e)}"
-                )
-                logger.error(message)
-                await send_exception("Redeem Entitlements Error", message)
-                continue
-            redeemed_entitlements = []
-            for datasource in datasources:
-                entitlement = await process_datasource(
-                    datasource,
-                    organization,
-                    entitlement_handler,
-                )
-                if entitlement:
-                    redeemed_entitlements.append(entitlement)
-
-            if len(redeemed_entitlements) > 0:
-                msg = "Entitlement has" if len(redeemed_entitlements) == 1 else "Entitlements have"
-                msg = f"{len(redeemed_entitlements)} {msg} been successfully redeemed."
-                await send_info(
-                    "Redeem Entitlements Success",
-                    msg,
-                    details=NotificationDetails(
-                        header=(
-                            ColumnHeader("Entitlement", width="stretch"),
-                            ColumnHeader("Owner", width="stretch"),
-                            ColumnHeader("Organization", width="stretch"),
-                            ColumnHeader("Datasource", width="stretch"),
-                        ),
-                        rows=[
-                            (
-                                f"{ent.id}\t/\t{ent.name}",
-                                f"{ent.owner.id}\t/\t{ent.owner.name}",
-                                f"{ent.redeemed_by.id}\t/\t{ent.redeemed_by.name}",  # type: ignore
-                                f"{ent.datasource_id}\t/\t{ent.linked_datasource_name}",
-                            )
-                            for ent in redeemed_entitlements
-                        ],
-                    ),
-                )
+            with tracer.start_as_current_span(
+                "Redeem organization entitlements",
+                attributes={"organization.id": organization.id},
+            ):
+                await redeem_organization_entitlements(settings, organization, entitlement_handler)
 
 
 def command(ctx: typer.Context):
@@ -31,6 +31,29 @@ class Settings(BaseSettings):
     postgres_password: str
     postgres_host: str
     postgres_port: int = 5432
+    # Each worker has its own pool, of up to `pool_size + max_overflow` connections
+    postgres_pool_size: int = 5
+    postgres_max_overflow: int = 10
+    # Seconds waited for a connection of the pool before failing
+    postgres_pool_timeout: float = 30
+    postgres_pool_pre_ping: bool = True
+    postgres_pool_recycle: int = 280
+    # Number of prepared statements cached by each connection, 0 to disable the cache
+    postgres_statement_cache_size: int = 100
+    # Connect through an external pooler in transaction mode (e.g. PgBouncer): the pooling,
+    # the pings and the statement caches settings above are then ignored, as the consecutive
+    # transactions of a connection can be served by different server connections
+    postgres_external_pooler: bool = False
+    # Optional read replica serving the read-only queries (e.g. the list endpoints), it's
+    # accessed with the same credentials as the primary
+    postgres_replica_host: str | None = None
+    postgres_replica_port: int | None = None
+    # The primary is used instead of the replica when it lags behind by more than this
+    postgres_replica_max_lag_seconds: float = 30
+    postgres_replica_check_interval_seconds: float = 10
+    # The primary is also used when the lag can't be checked in time, it's the timeout of the
+    # connections to the replica as well
+    postgres_replica_check_timeout_seconds: float = 2
 
     api_modifier_base_url: str
     api_modifier_jwt_secret: str
@@ -45,7 +68,18 @@ class Settings(BaseSettings):
     pwd_reset_token_length_expires_minutes: int = 15
 
     system_jwt_token_max_lifespan_minutes: int = 5
+    actor_references_cache_ttl_seconds: int = 60
+    rql_query_cache_size: int = 512
+    rql_max_nodes: int = 50
+    rql_max_relationship_depth: int = 3
+    rql_max_in_values: int = 100
+    # The maximum total cost, as estimated by EXPLAIN, of the queries built from RQL. Only
+    # the RQL filter is explained, without the conditions added by the endpoints (e.g. the
+    # scope of the affiliate accounts) nor the pagination, so it's the cost of filtering the
+    # whole table: it must be set from the costs of the filters of the operations accounts
+    rql_max_query_cost: float | None = None
     datasources_expenses_obsolete_after_months: int = 6
+    datasources_expenses_partitions_ahead_months: int = 2
     billing_percentage: float = 1.0
     ffc_external_product_id: str = "FIN-0001-P1M"
 
@@ -68,6 +102,27 @@ class Settings(BaseSettings):
     opentelemetry_exporter: OpenTelemetryExporter | None = OpenTelemetryExporter.JAEGER
     opentelemetry_connection_string: str | None = "http://jaeger:4318/v1/traces"
     opentelemetry_sqlalchemy_min_query_duration_ms: int | None = 100
+    # By default the metrics are exported to the same collector as the traces
+    opentelemetry_metrics_connection_string: str | None = None
+    opentelemetry_metrics_export_interval_ms: int = 60000
+    # Ratio of the traces sampled, the requests continuing a trace follow its sampling decision
+    opentelemetry_sampling_ratio: float = 1.0
+    # Sampling ratios overriding the default one for some spans starting a trace, by span name,
+    # e.g. {"GET /expenses": 0.01}
+    opentelemetry_sampling_ratio_overrides: dict[str, float] = {}
+    # Record the spans of the traces not sampled, to export the ones ending with an error.
+    # With a sampling ratio below 1 this keeps recording every span (i.e. their attributes,
+    # events and timings) and only saves exporting them, turn it off to skip the recording
+    opentelemetry_always_sample_errors: bool = True
+    opentelemetry_batch_max_queue_size: int = 2048
+    opentelemetry_batch_max_export_batch_size: int = 512
+    opentelemetry_batch_schedule_delay_ms: int = 5000
+    # A warning is logged for the requests executing more database queries
+    request_db_queries_budget: int | None = 25
+
+    # The debug endpoints, e.g. to profile a worker, are only available to operations accounts
+    debug_endpoints_enabled: bool = False
+    debug_profile_max_duration_seconds: int = 60
 
     msteams_notifications_webhook_url: str | None = None
 
@@ -82,6 +137,20 @@ class Settings(BaseSettings):
             path=self.postgres_db,
         )
 
+    @computed_field
+    def postgres_replica_async_url(self) -> PostgresDsn | None:
+        if self.postgres_replica_host is None:
+            return None
+
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            username=self.postgres_user,
+            password=quote(self.postgres_password),
+            host=self.postgres_replica_host,
+            port=self.postgres_replica_port or self.postgres_port,
+            path=self.postgres_db,
+        )
+
     @computed_field
     def postgres_url(self) -> PostgresDsn:
         return PostgresDsn.build(
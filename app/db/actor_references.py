@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import sqlalchemy
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session
+from sqlalchemy.orm.interfaces import MANYTOONE
+
+from app.conf import get_settings
+from app.db.models import Actor, Base
+from app.enums import ActorType
+
+# The key of the request scoped actor references in `Session.info`, the sessions being
+# request scoped themselves
+SESSION_INFO_KEY = "actor_references"
+
+
+@dataclass(frozen=True, slots=True)
+class ActorReferenceData:
+    id: str
+    name: str
+    type: ActorType
+
+
+class ActorReferenceCache:
+    """
+    Process level cache of the actor references, kept for a short time only as the actors
+    can be renamed by other processes.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_size: int = 10000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: dict[str, tuple[float, ActorReferenceData]] = {}
+
+    def get_many(self, ids: Iterable[str]) -> dict[str, ActorReferenceData]:
+        now = time.monotonic()
+        references = {}
+
+        for id in ids:
+            entry = self._entries.get(id)
+            if entry is None:
+                continue
+
+            expires_at, reference = entry
+            if expires_at <= now:
+                del self._entries[id]
+                continue
+
+            references[id] = reference
+
+        return references
+
+    def set_many(self, references: Iterable[ActorReferenceData]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        for reference in references:
+            if len(self._entries) >= self.max_size:
+                # evict the oldest entry (dicts keep the insertion order)
+                del self._entries[next(iter(self._entries))]
+
+            self._entries.pop(reference.id, None)
+            self._entries[reference.id] = (expires_at, reference)
+
+    def invalidate(self, id: str) -> None:
+        self._entries.pop(id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+actor_references_cache = ActorReferenceCache(
+    ttl_seconds=get_settings().actor_references_cache_ttl_seconds
+)
+
+
+@functools.cache
+def get_actor_relationships(model_cls: type[Base]) -> dict[str, str]:
+    """
+    Returns the many-to-one relationships to actors of the given model (e.g. `created_by`),
+    mapped to the attribute holding their foreign key (e.g. `created_by_id`).
+    """
+    mapper = sqlalchemy.inspect(model_cls, raiseerr=False)
+    relationships: dict[str, str] = {}
+    if mapper is None:
+        return relationships
+
+    for relationship in mapper.relationships:
+        if relationship.direction is not MANYTOONE or not issubclass(
+            relationship.mapper.class_, Actor
+        ):
+            continue
+
+        [column] = relationship.local_columns
+        relationships[relationship.key] = mapper.get_property_by_column(column).key
+
+    return relationships
+
+
+def get_request_actor_references(
+    session: AsyncSession | Session,
+) -> dict[str, ActorReferenceData]:
+    return session.info.setdefault(SESSION_INFO_KEY, {})
+
+
+async def load_actor_references(session: AsyncSession, objects: Iterable[Base]) -> None:
+    """
+    Loads the references (id, name and type) of the actors related to the given objects
+    whose relationships haven't been loaded (e.g. when listing objects with `lazyload`
+    options for the actor relationships), so that they can be serialized without loading
+    the relationships one by one.
+
+    The references are looked up in the request scoped and process level caches first and
+    the missing ones are loaded with a single query for all the objects.
+    """
+    actor_ids = set()
+    for obj in objects:
+        state = sqlalchemy.inspect(obj)
+        for relationship_key, fk_key in get_actor_relationships(type(obj)).items():
+            if relationship_key not in state.dict and fk_key in state.dict:
+                actor_ids.add(state.dict[fk_key])
+
+    actor_ids.discard(None)
+    request_references = get_request_actor_references(session)
+    missing_ids = actor_ids - request_references.keys()
+    if not missing_ids:
+        return
+
+    request_references.update(actor_references_cache.get_many(missing_ids))
+    missing_ids -= request_references.keys()
+    if not missing_ids:
+        return
+
+    result = await session.execute(
+        select(Actor.id, Actor.name, Actor.type).where(Actor.id.in_(missing_ids))
+    )
+    references = [ActorReferenceData(id=id, name=name, type=type) for id, name, type in result]
+    actor_references_cache.set_many(references)
+    request_references.update((reference.id, reference) for reference in references)
+
+
+def get_related_actor(obj: Base, relationship_key: str) -> Any:
+    """
+    Returns the actor related to the given object, or its reference loaded by
+    `load_actor_references` if the relationship itself hasn't been loaded.
+    """
+    fk_key = get_actor_relationships(type(obj)).get(relationship_key)
+    if fk_key is not None:
+        state = sqlalchemy.inspect(obj)
+        if (
+            relationship_key not in state.dict
+            and fk_key in state.dict
+            and state.session is not None
+        ):
+            actor_id = state.dict[fk_key]
+            if actor_id is None:
+                return None
+
+            reference = get_request_actor_references(state.session).get(actor_id)
+            if reference is not None:
+                return reference
+
+    return getattr(obj, relationship_key, None)
+
+
+@event.listens_for(Actor, "after_update", propagate=True)
+def on_actor_after_update(mapper: Mapper, connection: Any, target: Actor) -> None:
+    actor_references_cache.invalidate(target.id)
+
+    session = sqlalchemy.inspect(target).session
+    if session is not None:
+        get_request_actor_references(session).pop(target.id, None)
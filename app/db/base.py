@@ -1,3 +1,8 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from uuid import uuid4
+
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -5,8 +10,12 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 
 from app.conf import Settings
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool
+from app.db.replicas import replica_router
+from app.db.transactions import track_transactions_idle_duration
 from app.telemetry import setup_sqlalchemy_instrumentor
 
 session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
@@ -14,19 +23,92 @@ session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
 )
 
 
-def configure_db_engine(settings: Settings) -> AsyncEngine:
-    db_engine = create_async_engine(
-        str(settings.postgres_async_url),
+def _get_prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def create_db_engine(
+    settings: Settings, url: str, name: str, connect_args: dict[str, Any] | None = None
+) -> AsyncEngine:
+    if settings.postgres_external_pooler:
+        return create_async_engine(
+            url,
+            echo=settings.debug,
+            future=True,
+            # The connections are pooled by the external pooler, checking them out from a
+            # pool of the worker or pinging them would only waste round trips
+            poolclass=NullPool,
+            pool_logging_name=name,
+            connect_args={
+                "prepared_statement_cache_size": 0,
+                "statement_cache_size": 0,
+                # The statements are still prepared (in the transaction executing them), their
+                # names must be unique across the clients sharing the server connections
+                "prepared_statement_name_func": _get_prepared_statement_name,
+                **(connect_args or {}),
+            },
+        )
+
+    return create_async_engine(
+        url,
         echo=settings.debug,
         future=True,
-        pool_pre_ping=True,
-        pool_recycle=280,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.postgres_pool_size,
+        max_overflow=settings.postgres_max_overflow,
+        pool_timeout=settings.postgres_pool_timeout,
+        pool_pre_ping=settings.postgres_pool_pre_ping,
+        pool_recycle=settings.postgres_pool_recycle,
+        pool_logging_name=name,
+        connect_args={
+            # The statements prepared by SQLAlchemy and the ones cached by asyncpg itself
+            "prepared_statement_cache_size": settings.postgres_statement_cache_size,
+            "statement_cache_size": settings.postgres_statement_cache_size,
+            **(connect_args or {}),
+        },
     )
+
+
+def configure_db_engine(settings: Settings) -> AsyncEngine:
+    db_engine = create_db_engine(settings, str(settings.postgres_async_url), "primary")
     session_factory.configure(bind=db_engine)
     setup_sqlalchemy_instrumentor(settings, db_engine)
+    track_transactions_idle_duration(db_engine)
+
+    replica_engine = None
+    if settings.postgres_replica_async_url is not None:
+        replica_engine = create_db_engine(
+            settings,
+            str(settings.postgres_replica_async_url),
+            "replica",
+            connect_args={"timeout": settings.postgres_replica_check_timeout_seconds},
+        )
+        setup_sqlalchemy_instrumentor(settings, replica_engine)
+        track_transactions_idle_duration(replica_engine)
+    replica_router.configure(
+        replica_engine,
+        max_lag=settings.postgres_replica_max_lag_seconds,
+        check_interval=settings.postgres_replica_check_interval_seconds,
+        check_timeout=settings.postgres_replica_check_timeout_seconds,
+    )
+
     return db_engine
 
 
+@asynccontextmanager
+async def read_only_session() -> AsyncIterator[AsyncSession]:
+    """
+    Session for the read-only queries, served by the replica when it's available and by
+    the primary otherwise, in a transaction.
+    """
+    factory = (
+        replica_router.session_factory if await replica_router.is_available() else session_factory
+    )
+    async with factory() as session:
+        async with session.begin():
+            yield session
+
+
 async def verify_db_connection(settings: Settings):
     async with session_factory() as session:
         result = await session.execute(text("SELECT 1"))
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator, Sequence
+import functools
+from collections.abc import AsyncGenerator, Callable, Sequence
 from contextlib import suppress
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, ClassVar
 from uuid import UUID
 
 import sqlalchemy
-from sqlalchemy import ColumnExpressionArgument, Select, func, select, update
+from sqlalchemy import (
+    ColumnExpressionArgument,
+    Select,
+    bindparam,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, lazyload, selectinload
 from sqlalchemy.orm.interfaces import ORMOption
 
 from app.auth.context import auth_context
+from app.db.actor_references import load_actor_references
 from app.db.models import (
     Account,
     AccountUser,
@@ -54,11 +65,36 @@ class NullViolationError(DatabaseError):
 
 
 class ModelHandler[M: BaseModel]:
+    # Whether to re-SELECT the saved objects after each flush. When disabled, only the
+    # server generated values (fetched with RETURNING during the flush) are loaded and the
+    # relationships are kept as set by the caller. Can be overridden per call.
+    refresh_on_save: bool = True
+
+    # ORM options applied to every query of the handler (e.g. `joinedload`s). They're
+    # declared on the class so that the statements using them can be cached, setting them
+    # on an instance is still supported but disables the statements cache for it.
+    default_options: Sequence[ORMOption] = ()
+
+    # ORM options applied instead of `default_options` to the queries returning multiple
+    # objects (i.e. `query_db` and `stream_scalars`). Eager loading the related objects of
+    # a whole page with a `selectinload` avoids repeating them in the rows of every object,
+    # which is what `joinedload` does. Since only references to the related objects are
+    # serialized in the lists, their own relationships are usually made lazy with
+    # `.lazyload("*")`, instead of being eager loaded as well. The actor relationships
+    # (e.g. `created_by`) can be made lazy too: the references of the actors of the whole
+    # list are then loaded with a single (cached) query, see `load_actor_references`.
+    list_options: Sequence[ORMOption] | None = None
+
+    # Whether to reuse the statements built for the common query shapes, see `_statement`
+    cache_statements: bool = True
+
+    _statements: ClassVar[dict[tuple[type[ModelHandler], str], Select]] = {}
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
-        self.default_options: list[ORMOption] = []
 
     @classmethod
+    @functools.cache
     def _get_generic_cls_args(cls):
         """
         Retrieves the generic model class arg dynamically
@@ -73,7 +109,7 @@ class ModelHandler[M: BaseModel]:
     def model_cls(self) -> type[M]:
         return self._get_generic_cls_args()[0]
 
-    async def create(self, obj: M) -> M:
+    async def create(self, obj: M, refresh: bool | None = None) -> M:
         if isinstance(obj, AuditableMixin):  # pragma: no branch
             if obj.created_by is None:
                 with suppress(LookupError):
@@ -84,21 +120,115 @@ class ModelHandler[M: BaseModel]:
                     obj.updated_by = auth_context.get().get_actor()
 
         self.session.add(obj)
-        await self._save_changes(obj)
+        await self._save_changes(obj, refresh=refresh)
 
         return obj
 
+    async def bulk_create(self, values: Sequence[dict[str, Any]]) -> Sequence[M]:
+        """
+        Inserts multiple rows using a single batched INSERT ... RETURNING statement.
+
+        Args:
+            values (Sequence[dict[str, Any]]): The column values of each row to insert.
+
+        Returns:
+            Sequence[M]: The created objects, in the same order as `values`.
+        """
+        if not values:
+            return []
+
+        rows = self._with_audit_fields(values, "created_by_id", "updated_by_id")
+        stmt = insert(self.model_cls).returning(self.model_cls, sort_by_parameter_order=True)
+
+        try:
+            result = await self.session.scalars(stmt, rows)
+        except IntegrityError as e:
+            raise ConstraintViolationError(
+                f"Failed to save changes to {self.model_cls.__name__}: {e}."
+            ) from e
+
+        return result.all()
+
+    async def bulk_update(self, values: Sequence[dict[str, Any]]) -> None:
+        """
+        Updates multiple rows by primary key using a single executemany UPDATE statement.
+
+        Objects already loaded in the session aren't refreshed with the new values.
+
+        Args:
+            values (Sequence[dict[str, Any]]): The primary key and the column values
+                to update of each row.
+        """
+        if not values:
+            return
+
+        rows = self._with_audit_fields(values, "updated_by_id")
+
+        try:
+            await self.session.execute(update(self.model_cls), rows)
+        except IntegrityError as e:
+            raise ConstraintViolationError(
+                f"Failed to save changes to {self.model_cls.__name__}: {e}."
+            ) from e
+
+    async def bulk_upsert(
+        self,
+        values: Sequence[dict[str, Any]],
+        index_elements: Sequence[str],
+        update_fields: Sequence[str] | None = None,
+    ) -> Sequence[M]:
+        """
+        Inserts multiple rows, updating the existing ones, using a single batched
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement.
+
+        Args:
+            values (Sequence[dict[str, Any]]): The column values of each row to upsert.
+            index_elements (Sequence[str]): The columns of the unique constraint used
+                to detect the existing rows.
+            update_fields (Sequence[str] | None, optional): The columns to update on the
+                existing rows. Default is all the given columns except `index_elements`.
+
+        Returns:
+            Sequence[M]: The created or updated objects, in the same order as `values`.
+        """
+        if not values:
+            return []
+
+        rows = self._with_audit_fields(values, "created_by_id", "updated_by_id")
+        if update_fields is None:
+            update_fields = [
+                key
+                for key in rows[0]
+                if key not in index_elements and key not in ("id", "created_at", "created_by_id")
+            ]
+
+        stmt = pg_insert(self.model_cls)
+        set_ = {field: stmt.excluded[field] for field in update_fields}
+        if issubclass(self.model_cls, TimestampMixin):
+            set_["updated_at"] = func.current_timestamp()
+        stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+
+        try:
+            result = await self.session.scalars(
+                stmt.returning(self.model_cls, sort_by_parameter_order=True),
+                rows,
+                execution_options={"populate_existing": True},
+            )
+        except IntegrityError as e:
+            raise ConstraintViolationError(
+                f"Failed to save changes to {self.model_cls.__name__}: {e}."
+            ) from e
+
+        return result.all()
+
     async def get(
         self, id: str, extra_conditions: list[ColumnExpressionArgument] | None = None
     ) -> M:
-        query = select(self.model_cls).where(self.model_cls.id == id)
+        query = self._get_statement()
         if extra_conditions:
             query = query.where(*extra_conditions)
 
-        if self.default_options:
-            query = query.options(*self.default_options)
-
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, {"id": id})
         instance = result.scalar_one_or_none()
 
         if instance is None:
@@ -114,13 +244,11 @@ class ModelHandler[M: BaseModel]:
         **filters: Any,
     ) -> tuple[M, bool]:
         defaults = defaults or {}
-        query = select(self.model_cls).where(
+        query = self._select_statement().where(
             *(getattr(self.model_cls, key) == value for key, value in filters.items())
         )
         if extra_conditions:
             query = query.where(*extra_conditions)
-        if self.default_options:
-            query = query.options(*self.default_options)
         result = await self.session.execute(query)
         obj = result.scalars().first()
 
@@ -133,7 +261,12 @@ class ModelHandler[M: BaseModel]:
         obj = await self.create(self.model_cls(**params))
         return obj, True
 
-    async def update(self, id_or_obj: str | M, data: dict[str, Any] | None = None) -> M:
+    async def update(
+        self,
+        id_or_obj: str | M,
+        data: dict[str, Any] | None = None,
+        refresh: bool | None = None,
+    ) -> M:
         obj = await self._get_model_obj(id_or_obj)
 
         if data:
@@ -146,7 +279,7 @@ class ModelHandler[M: BaseModel]:
             with suppress(LookupError):
                 obj.updated_by = auth_context.get().get_actor()
 
-        await self._save_changes(obj)
+        await self._save_changes(obj, refresh=refresh)
 
         return obj
 
@@ -231,9 +364,8 @@ class ModelHandler[M: BaseModel]:
                 - If no records are found, returns an empty list.
 
         """
-        # default query
-        query = select(self.model_cls) if base_query is None else base_query
-        # add the default options, if any
+        # default query, with the default options
+        query = self._get_base_query(base_query, many=True)
         query = self._apply_conditions_to_the_query(
             query=query, where_clauses=where_clauses, options=options, order_by=order_by
         )
@@ -244,9 +376,9 @@ class ModelHandler[M: BaseModel]:
             # apply offset
             query = query.offset(offset)
         results = await self.session.scalars(query)
-        if unique:
-            return results.unique().all()
-        return results.all()
+        objects = results.unique().all() if unique else results.all()
+        await load_actor_references(self.session, objects)
+        return objects
 
     async def stream_scalars(
         self,
@@ -254,9 +386,10 @@ class ModelHandler[M: BaseModel]:
         order_by: list[ColumnExpressionArgument] | None = None,
         batch_size: int = 100,
     ) -> AsyncGenerator[M, None]:
-        query = select(self.model_cls)
         query = self._apply_conditions_to_the_query(
-            query=query, where_clauses=extra_conditions, order_by=order_by
+            query=self._select_statement(many=True),
+            where_clauses=extra_conditions,
+            order_by=order_by,
         )
         result = await self.session.stream_scalars(
             query,
@@ -287,7 +420,7 @@ class ModelHandler[M: BaseModel]:
             if base_query.whereclause is not None:
                 query = query.where(base_query.whereclause)
         else:
-            query = select(func.count(self.model_cls.id))
+            query = self._statement("count", lambda: select(func.count(self.model_cls.id)))
         if where_clauses:
             query = query.where(*where_clauses)
         result = await self.session.execute(query)
@@ -298,7 +431,7 @@ class ModelHandler[M: BaseModel]:
         base_query: Select | None = None,
         where_clauses: Sequence[ColumnExpressionArgument] | None = None,
     ) -> M | None:
-        query = select(self.model_cls) if base_query is None else base_query
+        query = self._get_base_query(base_query)
         query = self._apply_conditions_to_the_query(query=query, where_clauses=where_clauses)
 
         result = await self.session.execute(query)
@@ -310,14 +443,100 @@ class ModelHandler[M: BaseModel]:
 
         return id_or_obj
 
-    async def _save_changes(self, obj: M):
+    async def _save_changes(self, obj: M, refresh: bool | None = None):
+        if refresh is None:
+            refresh = self.refresh_on_save
+
+        if not refresh and isinstance(obj, TimestampMixin) and obj in self.session.new:
+            # The UPDATE issued after the INSERT for `post_update` relationships (i.e.
+            # `updated_by`) would set `updated_at` server side, without RETURNING it
+            obj.updated_at = datetime.now(UTC)
+
         try:
             await self.session.flush()
         except IntegrityError as e:
             raise ConstraintViolationError(
                 f"Failed to save changes to {self.model_cls.__name__}: {e}."
             ) from e
-        await self.session.refresh(obj)
+
+        if refresh:
+            await self.session.refresh(obj)
+            return
+
+        # Only load what has not been returned by the flush, if anything
+        expired_attributes = sqlalchemy.inspect(obj).expired_attributes
+        if expired_attributes:
+            await self.session.refresh(obj, attribute_names=expired_attributes)
+
+    def _with_audit_fields(
+        self, values: Sequence[dict[str, Any]], *fields: str
+    ) -> list[dict[str, Any]]:
+        """
+        Returns a copy of the rows' values with the given audit fields set to the current
+        actor when they're missing.
+        """
+        rows = [dict(row) for row in values]
+        if not issubclass(self.model_cls, AuditableMixin):
+            return rows
+
+        try:
+            actor = auth_context.get().get_actor()
+        except LookupError:
+            return rows
+
+        if actor is not None:
+            for row in rows:
+                for field in fields:
+                    row.setdefault(field, actor.id)
+
+        return rows
+
+    def _statement(self, name: str, build: Callable[[], Select]) -> Select:
+        """
+        Returns the statement for the given query shape, built with `build` only once per
+        handler class.
+
+        Reusing the same statement object saves both building it and computing its cache
+        key (which SQLAlchemy memoizes on the statement) to look up its compiled SQL, so the
+        statements must use bound parameters for the values that change between calls.
+        """
+        if not self.cache_statements or {"default_options", "list_options"} & self.__dict__.keys():
+            return build()
+
+        key = (type(self), name)
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = build()
+
+        return statement
+
+    def _get_options(self, many: bool = False) -> Sequence[ORMOption]:
+        if many and self.list_options is not None:
+            return self.list_options
+
+        return self.default_options
+
+    def _select_statement(self, many: bool = False) -> Select:
+        return self._statement(
+            "select_many" if many else "select",
+            lambda: select(self.model_cls).options(*self._get_options(many)),
+        )
+
+    def _get_statement(self) -> Select:
+        return self._statement(
+            "get",
+            lambda: self._select_statement().where(self.model_cls.id == bindparam("id")),
+        )
+
+    def _get_base_query(self, base_query: Select | None, many: bool = False) -> Select:
+        if base_query is None:
+            return self._select_statement(many)
+
+        options = self._get_options(many)
+        if options:
+            return base_query.options(*options)
+
+        return base_query
 
     def _apply_conditions_to_the_query(
         self,
@@ -327,7 +546,7 @@ class ModelHandler[M: BaseModel]:
         order_by: Sequence[ColumnExpressionArgument] | None = None,
     ) -> Select:
         """
-        Applies default options and extra conditions to the query.
+        Applies extra conditions, ordering and options to the query.
 
         Args:
             query (Select): The query to modify.
@@ -338,11 +557,10 @@ class ModelHandler[M: BaseModel]:
         """
         if where_clauses:
             query = query.where(*where_clauses)
-        orm_options = (list(self.default_options) or []) + (list(options or []))
         if order_by:
             query = query.order_by(*order_by)
-        if orm_options:
-            query = query.options(*orm_options)
+        if options:
+            query = query.options(*options)
         return query
 
 
@@ -351,14 +569,21 @@ class EntitlementHandler(ModelHandler[Entitlement]):
     Handles CRUD operations for the Entitlement model.
     """
 
-    def __init__(self, session):
-        super().__init__(session)
-        self.default_options = [
-            joinedload(Entitlement.owner),
-            joinedload(Entitlement.created_by),
-            joinedload(Entitlement.updated_by),
-            joinedload(Entitlement.redeemed_by),
-        ]
+    refresh_on_save = False
+
+    default_options = (
+        joinedload(Entitlement.owner),
+        joinedload(Entitlement.created_by),
+        joinedload(Entitlement.updated_by),
+        joinedload(Entitlement.redeemed_by),
+    )
+    list_options = (
+        selectinload(Entitlement.owner).lazyload("*"),
+        selectinload(Entitlement.redeemed_by).lazyload("*"),
+        lazyload(Entitlement.created_by),
+        lazyload(Entitlement.updated_by),
+        lazyload(Entitlement.deleted_by),
+    )
 
     async def terminate(self, entitlement: Entitlement) -> Entitlement:
         return await self.update(
@@ -423,14 +648,20 @@ class SystemHandler(ModelHandler[System]):
     Handles CRUD operations for the System model.
     """
 
-    def __init__(self, session):
-        super().__init__(session)
-        self.default_options = [
-            joinedload(System.owner),
-            joinedload(System.created_by),
-            joinedload(System.updated_by),
-            joinedload(System.deleted_by),
-        ]
+    refresh_on_save = False
+
+    default_options = (
+        joinedload(System.owner),
+        joinedload(System.created_by),
+        joinedload(System.updated_by),
+        joinedload(System.deleted_by),
+    )
+    list_options = (
+        selectinload(System.owner).lazyload("*"),
+        lazyload(System.created_by),
+        lazyload(System.updated_by),
+        lazyload(System.deleted_by),
+    )
 
 
 class AccountHandler(ModelHandler[Account]):
@@ -438,13 +669,16 @@ class AccountHandler(ModelHandler[Account]):
     Handles CRUD operations for the Account model.
     """
 
-    def __init__(self, session):
-        super().__init__(session)
-        self.default_options = [
-            joinedload(Account.created_by),
-            joinedload(Account.updated_by),
-            joinedload(Account.deleted_by),
-        ]
+    default_options = (
+        joinedload(Account.created_by),
+        joinedload(Account.updated_by),
+        joinedload(Account.deleted_by),
+    )
+    list_options = (
+        lazyload(Account.created_by),
+        lazyload(Account.updated_by),
+        lazyload(Account.deleted_by),
+    )
 
 
 class UserHandler(ModelHandler[User]):
@@ -452,14 +686,18 @@ class UserHandler(ModelHandler[User]):
     Handles CRUD operations for the User model.
     """
 
-    def __init__(self, session):
-        super().__init__(session)
-        self.default_options = [
-            joinedload(User.last_used_account),
-            joinedload(User.created_by),
-            joinedload(User.updated_by),
-            joinedload(User.deleted_by),
-        ]
+    default_options = (
+        joinedload(User.last_used_account),
+        joinedload(User.created_by),
+        joinedload(User.updated_by),
+        joinedload(User.deleted_by),
+    )
+    list_options = (
+        selectinload(User.last_used_account).lazyload("*"),
+        lazyload(User.created_by),
+        lazyload(User.updated_by),
+        lazyload(User.deleted_by),
+    )
 
 
 class AccountUserHandler(ModelHandler[AccountUser]):
@@ -467,12 +705,10 @@ class AccountUserHandler(ModelHandler[AccountUser]):
     Handles CRUD operations for the AccountUser model.
     """
 
-    def __init__(self, session):
-        super().__init__(session)
-        self.default_options = [
-            joinedload(AccountUser.account),
-            joinedload(AccountUser.user),
-        ]
+    default_options = (
+        joinedload(AccountUser.account),
+        joinedload(AccountUser.user),
+    )
 
     async def delete_by_user(self, user_id: str):
         """
@@ -503,15 +739,16 @@ class AccountUserHandler(ModelHandler[AccountUser]):
         user_id: str,
         extra_conditions: list[ColumnExpressionArgument] | None = None,
     ) -> AccountUser | None:
-        query = select(self.model_cls).where(
-            self.model_cls.account_id == account_id,
-            self.model_cls.user_id == user_id,
+        query = self._statement(
+            "get_account_user",
+            lambda: self._select_statement().where(
+                self.model_cls.account_id == bindparam("account_id"),
+                self.model_cls.user_id == bindparam("user_id"),
+            ),
         )
         if extra_conditions:
             query = query.where(*extra_conditions)
-        if self.default_options:
-            query = query.options(*self.default_options)
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, {"account_id": account_id, "user_id": user_id})
         return result.scalar_one_or_none()
 
 
@@ -520,11 +757,7 @@ class DatasourceExpenseHandler(ModelHandler[DatasourceExpense]):
     Handles CRUD operations for the DatasourceExpense model.
     """
 
-    def __init__(self, session):
-        super().__init__(session)
-        self.default_options = [
-            joinedload(DatasourceExpense.organization),
-        ]
+    default_options = (joinedload(DatasourceExpense.organization),)
 
 
 class AdditionalAdminRequestHandler(ModelHandler[AdditionalAdminRequest]):
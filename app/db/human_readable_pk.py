@@ -1,8 +1,12 @@
 import random
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from typing import Any
 
-from sqlalchemy import event, exists, select
-from sqlalchemy.engine import Connection
-from sqlalchemy.orm import Mapper
+from sqlalchemy import String, any_, bindparam, event, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Connection, Result
+from sqlalchemy.orm import Mapper, ORMExecuteState, Session, UOWTransaction
 
 
 class HumanReadablePKMixin:
@@ -36,6 +40,61 @@ class HumanReadablePKMixin:
 
         return f"{cls.PK_PREFIX}-{grouped_number}"
 
+    @classmethod
+    def allocate_human_readable_pks(cls, connection: Connection, count: int) -> list[str]:
+        """
+        Generate `count` distinct primary keys not used by any existing row.
+
+        All the candidates of an attempt are checked for collisions with a single query,
+        only the colliding ones are generated again in the next attempt.
+
+        :param connection: The connection used to check the collisions.
+        :param count: The number of primary keys to generate.
+        :return: A list with the generated primary keys.
+        """
+        model_id = cls.id  # type: ignore[attr-defined]
+        allocated: list[str] = []
+
+        for _ in range(cls.PK_MAX_RETRIES):
+            candidates = {
+                cls.generate_human_readable_pk() for _ in range(count - len(allocated))
+            }.difference(allocated)
+
+            if candidates:
+                stmt = select(model_id).where(
+                    model_id == any_(bindparam("pks", list(candidates), type_=ARRAY(String())))
+                )
+                candidates.difference_update(connection.scalars(stmt))
+                allocated.extend(candidates)
+
+            if len(allocated) == count:
+                return allocated
+
+        raise ValueError(
+            f"Unable to generate unique primary key after {cls.PK_MAX_RETRIES} attempts."
+        )
+
+    @classmethod
+    def with_human_readable_pks(
+        cls, connection: Connection, rows: Sequence[Mapping[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Return copies of the rows of a bulk insert, with a primary key allocated for the
+        ones without one, e.g. for a Core `connection.execute(insert(table), rows)`.
+
+        :param connection: The connection used to check the collisions.
+        :param rows: The parameters of the inserted rows.
+        :return: A list with the copies of the rows.
+        """
+        rows_with_pks = [dict(row) for row in rows]
+        rows_without_pk = [row for row in rows_with_pks if row.get("id") is None]
+        if rows_without_pk:
+            pks = cls.allocate_human_readable_pks(connection, len(rows_without_pk))
+            for row, pk in zip(rows_without_pk, pks, strict=True):
+                row["id"] = pk
+
+        return rows_with_pks
+
     @classmethod
     def build_id_regex(cls) -> str:
         prefix_part = f"^{cls.PK_PREFIX}"
@@ -45,24 +104,60 @@ class HumanReadablePKMixin:
         return f"{prefix_part}{group_part}$"
 
 
+@event.listens_for(Session, "before_flush")
+def on_before_flush(session: Session, flush_context: UOWTransaction, instances: Any) -> None:
+    """
+    Assigns the primary keys of all the pending objects of a flush, allocating them in
+    batches (one collision check per model) instead of once per inserted row.
+    """
+    pending_objects: defaultdict[type[HumanReadablePKMixin], list[HumanReadablePKMixin]] = (
+        defaultdict(list)
+    )
+    for obj in session.new:
+        if isinstance(obj, HumanReadablePKMixin) and obj.id is None:  # type: ignore[attr-defined]
+            pending_objects[obj.__class__].append(obj)
+
+    for model_cls, objects in pending_objects.items():
+        pks = model_cls.allocate_human_readable_pks(session.connection(), len(objects))
+        for obj, pk in zip(objects, pks, strict=True):
+            obj.id = pk  # type: ignore[attr-defined]
+
+
 @event.listens_for(HumanReadablePKMixin, "before_insert", propagate=True)
 def on_before_insert(mapper: Mapper, connection: Connection, obj: HumanReadablePKMixin) -> None:
-    from app.db.models import Base
-
-    if not isinstance(obj, Base):  # pragma: no cover
-        return
+    # Objects cascaded into the session during the flush aren't seen by `on_before_flush`
+    if obj.id is None:  # type: ignore[attr-defined]
+        obj.id = obj.allocate_human_readable_pks(connection, 1)[0]  # type: ignore[attr-defined]
 
-    model_cls = obj.__class__
 
-    for _ in range(model_cls.PK_MAX_RETRIES):
-        pk = obj.generate_human_readable_pk()
-        # Check for collision
-        stmt = select(exists().where(model_cls.id == pk))
-        result = connection.scalar(stmt)
-        if not result:  # No collision found
-            obj.id = pk
-            return
+@event.listens_for(Session, "do_orm_execute")
+def on_do_orm_execute(orm_execute_state: ORMExecuteState) -> Result | None:
+    """
+    Assigns the missing primary keys of ORM bulk inserts, e.g.
+    `session.execute(insert(Model), [{...}, {...}])`, executing the statement with copies
+    of the given parameters.
 
-    raise ValueError(
-        f"Unable to generate unique primary key after {model_cls.PK_MAX_RETRIES} attempts."
+    The Core inserts (`connection.execute(insert(table), rows)`) and the inserts of
+    multiple VALUES (`insert(Model).values([...])`) are not covered, their rows must be
+    given primary keys with `HumanReadablePKMixin.with_human_readable_pks`.
+    """
+    mapper = orm_execute_state.bind_mapper
+    parameters = orm_execute_state.parameters
+    if (
+        not orm_execute_state.is_insert
+        or mapper is None
+        or not issubclass(mapper.class_, HumanReadablePKMixin)
+        or not parameters
+    ):
+        return None
+
+    rows = parameters if isinstance(parameters, list) else [parameters]
+    if all(row.get("id") is not None for row in rows):
+        return None
+
+    rows_with_pks = mapper.class_.with_human_readable_pks(
+        orm_execute_state.session.connection(), rows
+    )
+    return orm_execute_state.invoke_statement(
+        params=rows_with_pks if isinstance(parameters, list) else rows_with_pks[0]
     )
@@ -30,6 +30,7 @@ from sqlalchemy_utils.types.encrypted.encrypted_type import FernetEngine
 
 from app.conf import get_settings
 from app.db.human_readable_pk import HumanReadablePKMixin
+from app.db.partitioning import MonthlyPartitionMixin
 from app.enums import (
     AccountStatus,
     AccountType,
@@ -55,6 +56,10 @@ class Base(DeclarativeBase):
         index=True,
     )
 
+    # Fetch the server generated values (defaults, onupdate, computed columns) with
+    # RETURNING as part of the flush, so they don't need to be loaded afterwards
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class TimestampMixin:
     created_at: Mapped[datetime.datetime] = mapped_column(
@@ -89,6 +94,7 @@ class Actor(Base, HumanReadablePKMixin):
 
     __mapper_args__ = {
         "polymorphic_on": "type",
+        "eager_defaults": True,
     }
 
 
@@ -184,6 +190,7 @@ class System(Actor, AuditableMixin):
         "polymorphic_identity": ActorType.SYSTEM.value,
         "inherit_condition": id == Actor.id,
         "polymorphic_load": "inline",
+        "eager_defaults": True,
     }
 
     __table_args__ = (
@@ -222,6 +229,16 @@ class User(Actor, HumanReadablePKMixin, AuditableMixin):
     )
     accounts: Mapped[list[AccountUser]] = relationship(back_populates="user", lazy="noload")
 
+    __table_args__ = (
+        # Users are looked up by email case insensitively
+        Index("ix_users_lower_email", sa.func.lower(email)),
+        Index(
+            "ix_users_pwd_reset_token",
+            pwd_reset_token,
+            postgresql_where=pwd_reset_token.is_not(None),
+        ),
+    )
+
     @property
     def account_user(self) -> AccountUser | None:
         try:
@@ -234,6 +251,7 @@ class User(Actor, HumanReadablePKMixin, AuditableMixin):
         "polymorphic_identity": ActorType.USER.value,
         "inherit_condition": id == Actor.id,
         "polymorphic_load": "inline",
+        "eager_defaults": True,
     }
 
 
@@ -259,6 +277,15 @@ class AccountUser(Base, AuditableMixin, HumanReadablePKMixin):
         server_default=AccountUserStatus.INVITED.value,
     )
 
+    __table_args__ = (
+        Index("ix_accounts_users_account_id_and_user_id", account_id, user_id),
+        Index(
+            "ix_accounts_users_invitation_token",
+            invitation_token,
+            postgresql_where=invitation_token.is_not(None),
+        ),
+    )
+
 
 class Organization(Base, AuditableMixin, HumanReadablePKMixin):
     __tablename__ = "organizations"
@@ -290,12 +317,19 @@ class Organization(Base, AuditableMixin, HumanReadablePKMixin):
     )
 
 
-class DatasourceExpense(Base, HumanReadablePKMixin, TimestampMixin):
+class DatasourceExpense(Base, HumanReadablePKMixin, MonthlyPartitionMixin, TimestampMixin):
     __tablename__ = "datasource_expenses"
 
     PK_PREFIX = "FDSX"
     PK_NUM_LENGTH = 12
 
+    # The partition key columns must be part of the primary key of a partitioned table,
+    # so a unique index on the id alone cannot be created and the database doesn't enforce
+    # the uniqueness of the ids. It relies on the allocation of HumanReadablePKMixin, which
+    # checks the candidates against the existing rows, only two concurrent transactions
+    # drawing the same random id could collide. The lookups by id (e.g. ModelHandler.get)
+    # assume there is a single row.
+    id: Mapped[str] = mapped_column(primary_key=True)
     datasource_id: Mapped[str] = mapped_column(String(255), index=True)
     linked_datasource_id: Mapped[str] = mapped_column(String(255))
     linked_datasource_type: Mapped[DatasourceType] = mapped_column(
@@ -306,9 +340,12 @@ class DatasourceExpense(Base, HumanReadablePKMixin, TimestampMixin):
 
     organization: Mapped[Organization] = relationship(lazy="noload", foreign_keys=[organization_id])
 
-    year: Mapped[int] = mapped_column(Integer(), nullable=False)
-    month: Mapped[int] = mapped_column(Integer(), nullable=False)
+    year: Mapped[int] = mapped_column(Integer(), primary_key=True)
+    month: Mapped[int] = mapped_column(Integer(), primary_key=True)
     day: Mapped[int] = mapped_column(Integer(), nullable=False)
+    date: Mapped[datetime.date] = mapped_column(
+        sa.Date(), sa.Computed("make_date(year, month, day)", persisted=True)
+    )
     expenses: Mapped[Decimal] = mapped_column(
         sa.Numeric(18, 4),
         nullable=False,
@@ -319,6 +356,8 @@ class DatasourceExpense(Base, HumanReadablePKMixin, TimestampMixin):
 
     __table_args__ = (
         Index("ix_datasource_expenses_year_and_month", year, month),
+        Index("ix_datasource_expenses_organization_id_and_date", organization_id, date),
+        Index("ix_datasource_expenses_datasource_id_and_date", datasource_id, date),
         UniqueConstraint(
             datasource_id,
             linked_datasource_type,
@@ -328,6 +367,7 @@ class DatasourceExpense(Base, HumanReadablePKMixin, TimestampMixin):
             day,
             name="uq_datasource_expenses_per_day",
         ),
+        {"postgresql_partition_by": MonthlyPartitionMixin.PARTITION_BY},
     )
 
 
@@ -364,6 +404,8 @@ class Entitlement(Base, HumanReadablePKMixin, AuditableMixin):
 
     redeem_at: Mapped[datetime.datetime | None] = mapped_column(sa.DateTime(timezone=True))
 
+    __table_args__ = (Index("ix_entitlements_owner_id_and_status", owner_id, status),)
+
 
 class AdditionalAdminRequest(Base, HumanReadablePKMixin, AuditableMixin):
     __tablename__ = "additionaladminrequests"
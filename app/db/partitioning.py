@@ -0,0 +1,196 @@
+import datetime
+import re
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import DDL, event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Mapper
+
+type Executor = AsyncSession | AsyncConnection
+
+
+class MonthlyPartitionMixin:
+    """
+    Mixin class for models whose table is range partitioned by calendar month.
+
+    Models using it must declare integer `year` and `month` columns, include them in the
+    primary key (and in any unique constraint) and pass `PARTITION_BY` as the
+    `postgresql_partition_by` table argument. A DEFAULT partition is created together with
+    the table so rows are never rejected, while monthly partitions are managed with
+    `create_monthly_partitions` and `drop_monthly_partitions_before`.
+    """
+
+    PARTITION_BY = "RANGE (year, month)"
+
+    @classmethod
+    def partition_name(cls, year: int, month: int) -> str:
+        return f"{cls.__tablename__}_y{year:04d}m{month:02d}"  # type: ignore[attr-defined]
+
+    @classmethod
+    def default_partition_name(cls) -> str:
+        return f"{cls.__tablename__}_default"  # type: ignore[attr-defined]
+
+    @classmethod
+    def build_partition_regex(cls) -> str:
+        return rf"^{cls.__tablename__}_y(\d{{4}})m(\d{{2}})$"  # type: ignore[attr-defined]
+
+
+@event.listens_for(MonthlyPartitionMixin, "instrument_class", propagate=True)
+def on_instrument_class(mapper: Mapper, model_cls: type[MonthlyPartitionMixin]) -> None:
+    event.listen(
+        mapper.local_table,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS {model_cls.default_partition_name()} "
+            f"PARTITION OF {model_cls.__tablename__} DEFAULT"  # type: ignore[attr-defined]
+        ),
+    )
+
+
+def iter_months(start: datetime.date, count: int) -> list[tuple[int, int]]:
+    first_day = start.replace(day=1)
+    months = [first_day + relativedelta(months=i) for i in range(count)]
+    return [(month.year, month.month) for month in months]
+
+
+async def list_monthly_partitions(
+    executor: Executor, model_cls: type[MonthlyPartitionMixin]
+) -> list[tuple[int, int]]:
+    """
+    Returns the (year, month) pairs of the monthly partitions attached to the model table,
+    sorted in chronological order. The DEFAULT partition is not included.
+    """
+    result = await executor.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :table_name"
+        ),
+        {"table_name": model_cls.__tablename__},  # type: ignore[attr-defined]
+    )
+    partition_regex = re.compile(model_cls.build_partition_regex())
+    partitions = []
+    for (relname,) in result:
+        if match := partition_regex.match(relname):
+            partitions.append((int(match.group(1)), int(match.group(2))))
+
+    return sorted(partitions)
+
+
+async def create_monthly_partitions(
+    executor: Executor,
+    model_cls: type[MonthlyPartitionMixin],
+    start: datetime.date,
+    months: int,
+) -> list[str]:
+    """
+    Makes sure that a partition exists for each of the `months` calendar months starting
+    from the one of `start`, creating the missing ones.
+
+    Rows of a month that were stored in the DEFAULT partition before its monthly partition
+    existed are moved into the new partition.
+
+    Returns the names of the partitions that have been created.
+    """
+    table_name = model_cls.__tablename__  # type: ignore[attr-defined]
+    default_partition = model_cls.default_partition_name()
+    existing = set(await list_monthly_partitions(executor, model_cls))
+    created = []
+    # generated columns cannot be inserted, they'll be computed again
+    columns = ", ".join(
+        column.name
+        for column in model_cls.__table__.columns  # type: ignore[attr-defined]
+        if column.computed is None
+    )
+
+    for year, month in iter_months(start, months):
+        if (year, month) in existing:
+            continue
+
+        next_month = datetime.date(year, month, 1) + relativedelta(months=1)
+        partition = model_cls.partition_name(year, month)
+        bounds = f"FROM ({year}, {month}) TO ({next_month.year}, {next_month.month})"
+        month_filter = {"year": year, "month": month}
+
+        has_default_rows = await executor.scalar(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {default_partition} "  # nosec: B608
+                "WHERE year = :year AND month = :month)"
+            ),
+            month_filter,
+        )
+
+        if not has_default_rows:
+            await executor.execute(
+                text(f"CREATE TABLE {partition} PARTITION OF {table_name} FOR VALUES {bounds}")
+            )
+        else:
+            # The new partition bounds would overlap with rows already stored in the
+            # DEFAULT partition: detach it, move the rows and attach it back.
+            await executor.execute(
+                text(f"ALTER TABLE {table_name} DETACH PARTITION {default_partition}")
+            )
+            await executor.execute(
+                text(f"CREATE TABLE {partition} PARTITION OF {table_name} FOR VALUES {bounds}")
+            )
+            await executor.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {default_partition} "  # nosec: B608
+                    f"WHERE year = :year AND month = :month RETURNING {columns}) "
+                    f"INSERT INTO {partition} ({columns}) SELECT {columns} FROM moved"
+                ),
+                month_filter,
+            )
+            await executor.execute(
+                text(f"ALTER TABLE {table_name} ATTACH PARTITION {default_partition} DEFAULT")
+            )
+
+        created.append(partition)
+
+    return created
+
+
+async def drop_monthly_partitions_before(
+    executor: Executor,
+    model_cls: type[MonthlyPartitionMixin],
+    year: int,
+    month: int,
+    detach_only: bool = False,
+) -> dict[str, int]:
+    """
+    Detaches (and drops, unless `detach_only` is set) all the monthly partitions of a month
+    strictly before the given one. Rows of those months left in the DEFAULT partition are
+    deleted.
+
+    Returns a dictionary with the number of rows of each removed partition, keyed by the
+    partition name (the DEFAULT partition included, if any row has been deleted from it).
+    """
+    table_name = model_cls.__tablename__  # type: ignore[attr-defined]
+    default_partition = model_cls.default_partition_name()
+    removed: dict[str, int] = {}
+
+    for partition_year, partition_month in await list_monthly_partitions(executor, model_cls):
+        if (partition_year, partition_month) >= (year, month):
+            break
+
+        partition = model_cls.partition_name(partition_year, partition_month)
+        removed[partition] = (
+            await executor.scalar(text(f"SELECT count(*) FROM {partition}"))  # nosec: B608
+            or 0
+        )
+        await executor.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {partition}"))
+        if not detach_only:
+            await executor.execute(text(f"DROP TABLE {partition}"))
+
+    result = await executor.execute(
+        text(
+            f"DELETE FROM {default_partition} "  # nosec: B608
+            "WHERE (year, month) < (:year, :month)"
+        ),
+        {"year": year, "month": month},
+    )
+    if result.rowcount:  # type: ignore[attr-defined]
+        removed[default_partition] = result.rowcount  # type: ignore[attr-defined]
+
+    return removed
@@ -0,0 +1,126 @@
+import time
+import weakref
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+meter = metrics.get_meter(__name__)
+
+checkout_duration_histogram = meter.create_histogram(
+    "db.client.connections.checkout.duration",
+    unit="s",
+    description="Time spent waiting to check out a connection from the pool",
+)
+
+_pools: weakref.WeakSet["InstrumentedAsyncAdaptedQueuePool"] = weakref.WeakSet()
+
+
+def _observe_pools(
+    get_value: Callable[["InstrumentedAsyncAdaptedQueuePool"], int],
+) -> Iterable[Observation]:
+    # The engines recreating their pool (e.g. after a disconnect) can have several of them
+    # alive with the same name until the old ones are garbage collected
+    values: Counter[str] = Counter()
+    for pool in list(_pools):
+        values[pool.name] += get_value(pool)
+
+    for name, value in values.items():
+        yield Observation(value, {"pool.name": name})
+
+
+def _observe_overflow(options: CallbackOptions) -> Iterable[Observation]:
+    return _observe_pools(lambda pool: max(pool.overflow(), 0))
+
+
+def _observe_checked_out(options: CallbackOptions) -> Iterable[Observation]:
+    return _observe_pools(lambda pool: pool.checkedout())
+
+
+def _observe_idle(options: CallbackOptions) -> Iterable[Observation]:
+    return _observe_pools(lambda pool: pool.checkedin())
+
+
+def _observe_max(options: CallbackOptions) -> Iterable[Observation]:
+    return _observe_pools(lambda pool: pool.size() + max(pool._max_overflow, 0))
+
+
+meter.create_observable_gauge(
+    "db.client.connections.overflow",
+    callbacks=[_observe_overflow],
+    unit="{connection}",
+    description="Number of connections opened beyond the size of the pool",
+)
+meter.create_observable_gauge(
+    "db.client.connections.checked_out",
+    callbacks=[_observe_checked_out],
+    unit="{connection}",
+    description="Number of connections currently checked out of the pool",
+)
+meter.create_observable_gauge(
+    "db.client.connections.idle",
+    callbacks=[_observe_idle],
+    unit="{connection}",
+    description="Number of connections opened and available in the pool",
+)
+meter.create_observable_gauge(
+    "db.client.connections.max",
+    callbacks=[_observe_max],
+    unit="{connection}",
+    description="Maximum number of connections the pool can open",
+)
+
+
+@dataclass
+class PoolStats:
+    name: str
+    size: int
+    max_overflow: int
+    timeout: float
+    # The connections opened and available in the pool
+    checked_in: int
+    checked_out: int
+    # The connections opened beyond the size of the pool
+    overflow: int
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool recording the time spent waiting for a connection, and whose overflow
+    and checked out connections are observed by OpenTelemetry gauges.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        _pools.add(self)
+
+    @property
+    def name(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            checkout_duration_histogram.record(
+                time.perf_counter() - start, {"pool.name": self.name}
+            )
+
+
+def get_pools_stats() -> list[PoolStats]:
+    return [
+        PoolStats(
+            name=pool.name,
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+        for pool in sorted(_pools, key=lambda pool: pool.name)
+    ]
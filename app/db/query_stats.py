@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import contextlib
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.default import DefaultExecutionContext
+
+_CURRENT_QUERY_STATS: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_QUERY_START_TIMES_KEY = "query_stats_start_times"
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    rows: int = 0
+    # The time spent executing the queries, in seconds
+    duration: float = 0.0
+
+
+@contextlib.contextmanager
+def track_query_stats() -> Iterator[QueryStats]:
+    """
+    Counts the queries executed in the current context (e.g. while handling a request),
+    the rows they returned or affected and the time they took.
+    """
+    stats = QueryStats()
+    token = _CURRENT_QUERY_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _CURRENT_QUERY_STATS.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def on_before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: DefaultExecutionContext | None,
+    executemany: bool,
+) -> None:
+    if _CURRENT_QUERY_STATS.get() is not None:
+        conn.info.setdefault(_QUERY_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def on_after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: DefaultExecutionContext | None,
+    executemany: bool,
+) -> None:
+    stats = _CURRENT_QUERY_STATS.get()
+    start_times = conn.info.get(_QUERY_START_TIMES_KEY)
+    if stats is None or not start_times:
+        return
+
+    stats.queries += 1
+    stats.duration += time.perf_counter() - start_times.pop()
+
+    rowcount = context.rowcount if context is not None else cursor.rowcount
+    # The rowcount isn't known for the server side cursors, which fetch their rows later
+    if rowcount >= 0:
+        stats.rows += rowcount
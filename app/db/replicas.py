@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# The replay lag of the replica, 0 when it has replayed everything it received (the time of
+# the last replayed transaction alone would grow while the primary is idle), or when the
+# server isn't a replica
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaRouter:
+    """
+    Routes the read-only queries to the replica, if one is configured and it's not lagging
+    too much behind the primary.
+
+    The lag of the replica is checked at most every `check_interval` seconds, the primary
+    being used until the next check when it exceeds `max_lag` or when the replica can't be
+    reached within `check_timeout` seconds. The requests don't wait for a check in progress,
+    they use the result of the previous one.
+    """
+
+    def __init__(self) -> None:
+        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            class_=AsyncSession, expire_on_commit=False
+        )
+        self.engine: AsyncEngine | None = None
+        self.max_lag = 30.0
+        self.check_interval = 10.0
+        self.check_timeout = 2.0
+        self._available = False
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def configure(
+        self,
+        engine: AsyncEngine | None,
+        max_lag: float = 30.0,
+        check_interval: float = 10.0,
+        check_timeout: float = 2.0,
+    ) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._available = False
+        self._checked_at = None
+        self.session_factory.configure(bind=engine)
+
+    async def get_lag(self) -> float:
+        assert self.engine is not None
+
+        async with self.engine.connect() as conn:
+            return float((await conn.execute(REPLICA_LAG_QUERY)).scalar_one())
+
+    async def is_available(self) -> bool:
+        if self.engine is None:
+            return False
+
+        if self._checked_at is not None and (
+            time.monotonic() - self._checked_at < self.check_interval
+        ):
+            return self._available
+
+        if self._lock.locked():
+            # Another request is checking the replica
+            return self._available
+
+        async with self._lock:
+            # Another request may have checked the replica while this one was waiting
+            if self._checked_at is None or (
+                time.monotonic() - self._checked_at >= self.check_interval
+            ):
+                self._available = await self._check()
+                self._checked_at = time.monotonic()
+
+        return self._available
+
+    async def _check(self) -> bool:
+        try:
+            lag = await asyncio.wait_for(self.get_lag(), self.check_timeout)
+        except Exception:
+            logger.exception("Could not check the replica, using the primary instead")
+            return False
+
+        if lag > self.max_lag:
+            logger.warning(
+                f"The replica is lagging {lag:.1f}s behind the primary (more than "
+                f"{self.max_lag}s), using the primary instead"
+            )
+            return False
+
+        return True
+
+
+replica_router = ReplicaRouter()
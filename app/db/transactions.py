@@ -0,0 +1,100 @@
+import time
+from typing import Any
+
+from opentelemetry import metrics
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+_LAST_ACTIVITY_KEY = "transaction_last_activity"
+_IDLE_DURATION_KEY = "transaction_idle_duration"
+
+meter = metrics.get_meter(__name__)
+
+transaction_idle_duration_histogram = meter.create_histogram(
+    "db.client.transaction.idle.duration",
+    unit="s",
+    description=(
+        "Time spent by the transactions waiting between their statements, holding "
+        "a connection idle in transaction"
+    ),
+)
+
+
+async def commit_early(session: AsyncSession) -> None:
+    """
+    Commits the current transaction of the session, returning its connection to the pool
+    before the request has been handled, e.g. before waiting on an upstream API. The next
+    query acquires a connection and begins a new transaction again.
+
+    The loaded objects are not expired on commit, so they can still be used afterwards.
+    """
+    if session.in_transaction():
+        await session.commit()
+
+
+def _add_idle_duration(conn: Connection) -> None:
+    # The time since the previous statement ended (or the transaction began)
+    last_activity = conn.info.pop(_LAST_ACTIVITY_KEY, None)
+    if last_activity is not None:
+        conn.info[_IDLE_DURATION_KEY] += time.perf_counter() - last_activity
+
+
+def _record_idle_duration(conn: Connection, outcome: str) -> None:
+    if _IDLE_DURATION_KEY not in conn.info:
+        return
+
+    _add_idle_duration(conn)
+    transaction_idle_duration_histogram.record(
+        conn.info.pop(_IDLE_DURATION_KEY), {"db.transaction.outcome": outcome}
+    )
+
+
+def _on_begin(conn: Connection) -> None:
+    conn.info[_IDLE_DURATION_KEY] = 0.0
+    conn.info[_LAST_ACTIVITY_KEY] = time.perf_counter()
+
+
+def _on_before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    if _IDLE_DURATION_KEY in conn.info:
+        _add_idle_duration(conn)
+
+
+def _on_after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    if _IDLE_DURATION_KEY in conn.info:
+        conn.info[_LAST_ACTIVITY_KEY] = time.perf_counter()
+
+
+def _on_commit(conn: Connection) -> None:
+    _record_idle_duration(conn, "commit")
+
+
+def _on_rollback(conn: Connection) -> None:
+    _record_idle_duration(conn, "rollback")
+
+
+def track_transactions_idle_duration(engine: AsyncEngine) -> None:
+    """
+    Records the time the transactions of the engine spend idle, between their statements
+    and before being committed or rolled back, while holding a connection of the pool.
+    """
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "begin", _on_begin)
+    event.listen(sync_engine, "before_cursor_execute", _on_before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _on_after_cursor_execute)
+    event.listen(sync_engine, "commit", _on_commit)
+    event.listen(sync_engine, "rollback", _on_rollback)
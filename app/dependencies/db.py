@@ -6,17 +6,45 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import handlers
 from app.db.base import session_factory
+from app.db.replicas import replica_router
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession]:
+    """
+    Session of the request, committed once the request has been handled. The connection
+    is only acquired from the pool by the first query and the transaction can be ended
+    earlier with `commit_early`, e.g. before waiting on an upstream API.
+    """
     async with session_factory() as session:
-        async with session.begin():
+        try:
             yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+        await session.commit()
 
 
 DBSession = Annotated[AsyncSession, Depends(get_db_session)]
 
 
+async def get_read_only_db_session(db_session: DBSession) -> AsyncGenerator[AsyncSession]:
+    """
+    Session of the read-only endpoints, served by the replica when it's available. The
+    session of the request (only connecting to the primary when used) is reused otherwise.
+    """
+    if not await replica_router.is_available():
+        yield db_session
+        return
+
+    async with replica_router.session_factory() as session:
+        async with session.begin():
+            yield session
+
+
+ReadOnlyDBSession = Annotated[AsyncSession, Depends(get_read_only_db_session)]
+
+
 class HandlerFactory:
     def __init__(self, handler_cls: type[handlers.ModelHandler]):
         self.handler_class = handler_cls
@@ -25,6 +53,11 @@ class HandlerFactory:
         return self.handler_class(session)
 
 
+class ReadOnlyHandlerFactory(HandlerFactory):
+    def __call__(self, session: ReadOnlyDBSession) -> handlers.ModelHandler:  # type: ignore[override]
+        return self.handler_class(session)
+
+
 EntitlementRepository = Annotated[
     handlers.EntitlementHandler, Depends(HandlerFactory(handlers.EntitlementHandler))
 ]
@@ -48,3 +81,26 @@ AdditionalAdminRequestRepository = Annotated[
     handlers.AdditionalAdminRequestHandler,
     Depends(HandlerFactory(handlers.AdditionalAdminRequestHandler)),
 ]
+
+
+# The repositories of the read-only endpoints (e.g. the list ones), whose queries can be
+# served by the replica
+ReadOnlyEntitlementRepository = Annotated[
+    handlers.EntitlementHandler, Depends(ReadOnlyHandlerFactory(handlers.EntitlementHandler))
+]
+ReadOnlyOrganizationRepository = Annotated[
+    handlers.OrganizationHandler, Depends(ReadOnlyHandlerFactory(handlers.OrganizationHandler))
+]
+ReadOnlyAccountRepository = Annotated[
+    handlers.AccountHandler, Depends(ReadOnlyHandlerFactory(handlers.AccountHandler))
+]
+ReadOnlyUserRepository = Annotated[
+    handlers.UserHandler, Depends(ReadOnlyHandlerFactory(handlers.UserHandler))
+]
+ReadOnlySystemRepository = Annotated[
+    handlers.SystemHandler, Depends(ReadOnlyHandlerFactory(handlers.SystemHandler))
+]
+ReadOnlyDatasourceExpenseRepository = Annotated[
+    handlers.DatasourceExpenseHandler,
+    Depends(ReadOnlyHandlerFactory(handlers.DatasourceExpenseHandler)),
+]
@@ -9,10 +9,12 @@ from fastapi.routing import APIRoute, APIRouter
 from app.conf import get_settings
 from app.db.base import configure_db_engine, verify_db_connection
 from app.dependencies.auth import authentication_required, check_operations_account
+from app.middleware import QueryStatsMiddleware
 from app.openapi import generate_openapi_spec
 from app.routers import (
     accounts,
     auth,
+    debug,
     employees,
     entitlements,
     expenses,
@@ -135,9 +137,17 @@ def setup_app():
     )
 
     app.include_router(auth.router, prefix="/auth", tags=["Auth"])
+    app.include_router(
+        debug.router,
+        prefix="/debug",
+        dependencies=[Depends(check_operations_account)],
+        include_in_schema=False,
+    )
 
     settings = get_settings()
 
+    app.add_middleware(QueryStatsMiddleware, queries_budget=settings.request_db_queries_budget)
+
     app.openapi = partial(generate_openapi_spec, app, settings)
 
     setup_fastapi_instrumentor(
@@ -0,0 +1,82 @@
+import logging
+
+from opentelemetry import metrics
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import QueryStats, track_query_stats
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+
+db_queries_histogram = meter.create_histogram(
+    "http.server.db.queries",
+    unit="{query}",
+    description="Number of database queries executed to handle a request",
+)
+db_rows_histogram = meter.create_histogram(
+    "http.server.db.rows",
+    unit="{row}",
+    description="Number of rows returned or affected by the queries executed to handle a request",
+)
+db_duration_histogram = meter.create_histogram(
+    "http.server.db.duration",
+    unit="s",
+    description="Time spent executing the database queries to handle a request",
+)
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks the database queries executed to handle each request: their count, rows and
+    duration are reported in the `Server-Timing` header of the response and recorded in
+    OpenTelemetry histograms for each route.
+
+    A warning is logged for the requests executing more queries than the given budget,
+    which is usually the sign of an N+1 problem.
+    """
+
+    def __init__(self, app: ASGIApp, queries_budget: int | None = None) -> None:
+        self.app = app
+        self.queries_budget = queries_budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_query_stats() as stats:
+
+            async def send_with_server_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", format_server_timing(stats))
+
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_server_timing)
+            finally:
+                self.record(scope, stats)
+
+    def record(self, scope: Scope, stats: QueryStats) -> None:
+        # The route is set in the scope by FastAPI once the request has been routed
+        route = scope.get("route")
+        attributes = {
+            "http.request.method": scope["method"],
+            "http.route": getattr(route, "path_format", "unknown"),
+        }
+        db_queries_histogram.record(stats.queries, attributes)
+        db_rows_histogram.record(stats.rows, attributes)
+        db_duration_histogram.record(stats.duration, attributes)
+
+        if self.queries_budget is not None and stats.queries > self.queries_budget:
+            logger.warning(
+                f"{attributes['http.request.method']} {attributes['http.route']} executed "
+                f"{stats.queries} database queries, exceeding the budget of {self.queries_budget}"
+            )
+
+
+def format_server_timing(stats: QueryStats) -> str:
+    return f'db;dur={stats.duration * 1000:.1f};desc="{stats.queries} queries, {stats.rows} rows"'
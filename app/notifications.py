@@ -10,6 +10,7 @@ from adaptive_cards.containers import Column, ColumnSet, Container
 from adaptive_cards.elements import TextBlock
 
 from app.conf import get_settings
+from app.telemetry import cli_command_outer_phase
 
 logger = logging.getLogger(__name__)
 
@@ -144,12 +145,13 @@ async def send_notification(
         ],
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            settings.msteams_notifications_webhook_url,
-            json=message,
-            headers={"Content-Type": "application/json"},
-        )
+    with cli_command_outer_phase("notify"):
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                settings.msteams_notifications_webhook_url,
+                json=message,
+                headers={"Content-Type": "application/json"},
+            )
         if response.status_code != 202:
             logger.error(
                 f"Failed to send notification to MSTeams: {response.status_code} - {response.text}"
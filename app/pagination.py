@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 
-from fastapi import Query
+from fastapi import Query, Response
 from fastapi_pagination import create_page, resolve_params
 from fastapi_pagination.bases import AbstractPage, AbstractParams, RawParams
 from fastapi_pagination.limit_offset import LimitOffsetPage as _LimitOffsetPage
@@ -34,6 +34,26 @@ class LimitOffsetPage[S: BaseSchema](_LimitOffsetPage[S]):
     __params_type__ = LimitOffsetParams  # type: ignore
 
 
+class PageResponse(Response):
+    """
+    Response of the paginated list endpoints.
+
+    The page is built from already validated schemas, so instead of letting FastAPI
+    validate it again against the `response_model` of the route and encode it with
+    Python's json module, it's encoded directly by pydantic. As for the responses of
+    the other endpoints (see `setup_custom_serialization` in `app.main`), the fields
+    with a `None` value are excluded.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, page: AbstractPage, status_code: int = 200) -> None:
+        super().__init__(content=page, status_code=status_code)
+
+    def render(self, content: AbstractPage) -> bytes:
+        return content.__pydantic_serializer__.to_json(content, by_alias=True, exclude_none=True)
+
+
 async def paginate[M: Base, S: BaseSchema](
     handler: ModelHandler[M],
     schema_cls: type[S],
@@ -42,12 +62,12 @@ async def paginate[M: Base, S: BaseSchema](
     where_clauses: Sequence[ColumnExpressionArgument] | None = None,
     page_options: list[ORMOption] | None = None,
     unique: bool = False,
-) -> AbstractPage[S]:
+) -> PageResponse:
     """
     This function queries a database model (M) using a ModelHandler.
     It applies optional filtering (extra_conditions) and query options (options).
     It then serializes the results into a schema (S) and returns
-    a paginated response in the form of AbstractPage[S].
+    a paginated response with a page of the form of AbstractPage[S].
     """
     params: LimitOffsetParams = resolve_params()
     total = await handler.count(base_query=base_query, where_clauses=where_clauses)
@@ -68,8 +88,9 @@ async def paginate[M: Base, S: BaseSchema](
             unique=unique,
         )
 
-    return create_page(
+    page = create_page(
         [convert_model_to_schema(schema_cls, item) for item in items],
         params=params,
         total=total,
     )
+    return PageResponse(page)
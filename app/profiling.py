@@ -0,0 +1,98 @@
+import asyncio
+import sys
+import threading
+from collections import Counter
+from types import FrameType, TracebackType
+from typing import Self
+
+
+def _format_frame(frame: FrameType) -> str:
+    code = frame.f_code
+    # The frames are separated by semicolons in the collapsed stacks
+    return f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stacks of the threads of the process from a background
+    thread, with a negligible overhead on the profiled code.
+
+    The samples are returned in the collapsed stacks format (one `frame;frame;frame count`
+    line per stack) read by the flamegraph tools, e.g. flamegraph.pl or speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_ids: set[int] | None = None) -> None:
+        self.interval = interval
+        # All the threads are sampled by default, apart from the profiler one
+        self.thread_ids = thread_ids
+        self.samples: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("The profiler is already running")
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def sample(self) -> None:
+        profiler_thread_id = threading.get_ident()
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == profiler_thread_id or (
+                self.thread_ids is not None and thread_id not in self.thread_ids
+            ):
+                continue
+
+            stack = []
+            current_frame: FrameType | None = frame
+            while current_frame is not None:
+                stack.append(_format_frame(current_frame))
+                current_frame = current_frame.f_back
+
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def collapsed_stacks(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+async def profile_worker(duration: float, interval: float = 0.005) -> str:
+    """
+    Samples the worker for the given duration (while it keeps handling the other requests),
+    returning the collapsed stacks.
+    """
+    profiler = SamplingProfiler(interval=interval)
+    with profiler:
+        await asyncio.sleep(duration)
+
+    return profiler.collapsed_stacks()
@@ -16,6 +16,7 @@ from app.dependencies.auth import (
 from app.dependencies.db import (
     AccountRepository,
     AccountUserRepository,
+    ReadOnlyAccountRepository,
     UserRepository,
 )
 from app.dependencies.path import AccountId, UserId
@@ -200,7 +201,7 @@ async def get_account_by_id(
     dependencies=[Depends(check_operations_account)],
 )
 async def get_accounts(
-    account_repo: AccountRepository,
+    account_repo: ReadOnlyAccountRepository,
     base_query: Select = Depends(RQLQuery(AccountRules())),
 ):
     return await paginate(account_repo, AccountRead, base_query=base_query)
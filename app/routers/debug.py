@@ -0,0 +1,73 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.db.pool import PoolStats, get_pools_stats
+from app.db.transactions import commit_early
+from app.dependencies.core import AppSettings
+from app.dependencies.db import DBSession
+from app.profiling import profile_worker
+
+
+def check_debug_endpoints_enabled(settings: AppSettings) -> None:
+    if not settings.debug_endpoints_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+router = APIRouter(dependencies=[Depends(check_debug_endpoints_enabled)])
+
+# Profiling the worker is only useful one at a time, the samples of concurrent profiles
+# would also include each other
+_profile_lock = asyncio.Lock()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    settings: AppSettings,
+    db_session: DBSession,
+    duration: Annotated[float, Query(gt=0, description="Duration of the profile, in seconds")] = 10,
+    interval_ms: Annotated[
+        float, Query(ge=1, le=1000, description="Interval between the samples, in milliseconds")
+    ] = 5,
+):
+    """
+    Samples the stacks of the worker handling the request for the given duration and returns
+    them in the collapsed stacks format, which can be turned into a flamegraph with
+    flamegraph.pl or loaded in speedscope.
+    """
+    if duration > settings.debug_profile_max_duration_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"The duration of the profile cannot exceed "
+                f"{settings.debug_profile_max_duration_seconds} seconds."
+            ),
+        )
+
+    if _profile_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The worker is already being profiled.",
+        )
+
+    # The session has only been used to authenticate the request, its connection is not held
+    # while profiling
+    await commit_early(db_session)
+    async with _profile_lock:
+        collapsed_stacks = await profile_worker(duration, interval=interval_ms / 1000)
+
+    return PlainTextResponse(
+        collapsed_stacks,
+        headers={"Content-Disposition": 'attachment; filename="profile.folded"'},
+    )
+
+
+@router.get("/pool", response_model=list[PoolStats])
+async def pool_stats():
+    """
+    Returns the state of the database connection pools of the worker handling the request,
+    to size them from the actual usage.
+    """
+    return get_pools_stats()
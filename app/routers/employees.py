@@ -4,8 +4,10 @@ from typing import Annotated
 from fastapi import APIRouter, Body, Depends, HTTPException, status
 
 from app.api_clients.optscale import UserDoesNotExist
+from app.db.transactions import commit_early
 from app.dependencies.api_clients import APIModifierClient, OptscaleAuthClient, OptscaleClient
 from app.dependencies.auth import check_operations_account
+from app.dependencies.db import DBSession
 from app.schemas.employees import EmployeeCreate, EmployeeRead
 from app.utils import wrap_http_error_in_502
 
@@ -31,7 +33,10 @@ async def create_employee(
     ],
     api_modifier_client: APIModifierClient,
     optscale_client: OptscaleClient,
+    db_session: DBSession,
 ):
+    # The session has only been used to authenticate the request
+    await commit_early(db_session)
     with wrap_http_error_in_502("Error creating employee in FinOps for Cloud"):
         create_employee_response = await api_modifier_client.create_user(
             email=data.email,
@@ -49,7 +54,9 @@ async def create_employee(
 async def get_employee_by_email(
     email: str,
     optscale_auth_client: OptscaleAuthClient,
+    db_session: DBSession,
 ):
+    await commit_early(db_session)
     with wrap_http_error_in_502("Error checking employee existence in FinOps for Cloud"):
         try:
             response = await optscale_auth_client.get_existing_user_info(email)
@@ -5,12 +5,15 @@ from sqlalchemy import ColumnExpressionArgument, Select
 
 from app.db.handlers import NotFoundError
 from app.db.models import Account, Entitlement
+from app.db.transactions import commit_early
 from app.dependencies.api_clients import OptscaleClient
 from app.dependencies.auth import CurrentAuthContext, check_operations_account
 from app.dependencies.db import (
     AccountRepository,
+    DBSession,
     EntitlementRepository,
     OrganizationRepository,
+    ReadOnlyEntitlementRepository,
 )
 from app.dependencies.path import EntitlementId
 from app.enums import AccountStatus, AccountType, EntitlementStatus, OrganizationStatus
@@ -65,7 +68,7 @@ router = APIRouter()
 
 @router.get("", response_model=LimitOffsetPage[EntitlementRead])
 async def get_entitlements(
-    entitlement_repo: EntitlementRepository,
+    entitlement_repo: ReadOnlyEntitlementRepository,
     extra_conditions: CommonConditions,
     base_query: Select = Depends(RQLQuery(EntitlementRules())),
 ):
@@ -171,6 +174,7 @@ async def redeem_entitlement(
     redeem_info: EntitlementRedeemInput,
     organization_repo: OrganizationRepository,
     entitlement_repo: EntitlementRepository,
+    db_session: DBSession,
     auth_context: CurrentAuthContext,
     optscale_client: OptscaleClient,
 ):
@@ -203,6 +207,7 @@ async def redeem_entitlement(
 
     optscale_datasource = None
 
+    await commit_early(db_session)
     with wrap_http_error_in_502():
         with wrap_http_not_found_in_400(
             f"Cannot redeem Entitlement {entitlement.id}: "
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy import Select
 
-from app.dependencies.db import DatasourceExpenseRepository
+from app.dependencies.db import ReadOnlyDatasourceExpenseRepository
 from app.pagination import LimitOffsetPage, paginate
 from app.rql import DatasourceExpenseRules, RQLQuery
 from app.schemas.expenses import DatasourceExpenseRead
@@ -11,7 +11,7 @@ router = APIRouter()
 
 @router.get("", response_model=LimitOffsetPage[DatasourceExpenseRead])
 async def list_datasource_expenses(
-    datasource_expense_repo: DatasourceExpenseRepository,
+    datasource_expense_repo: ReadOnlyDatasourceExpenseRepository,
     base_query: Select = Depends(RQLQuery(DatasourceExpenseRules())),
 ):
     return await paginate(datasource_expense_repo, DatasourceExpenseRead, base_query=base_query)
@@ -10,9 +10,15 @@ from sqlalchemy import Select
 from app.api_clients.optscale import UserDoesNotExist
 from app.db.handlers import ConstraintViolationError, NotFoundError
 from app.db.models import AdditionalAdminRequest, Organization
+from app.db.transactions import commit_early
 from app.dependencies.api_clients import APIModifierClient, OptscaleAuthClient, OptscaleClient
 from app.dependencies.auth import check_operations_account
-from app.dependencies.db import AdditionalAdminRequestRepository, OrganizationRepository
+from app.dependencies.db import (
+    AdditionalAdminRequestRepository,
+    DBSession,
+    OrganizationRepository,
+    ReadOnlyOrganizationRepository,
+)
 from app.dependencies.path import OrganizationId
 from app.enums import DatasourceType, OrganizationStatus
 from app.openapi import examples
@@ -54,7 +60,7 @@ logger = logging.getLogger(__name__)
     },
 )
 async def get_organizations(
-    organization_repo: OrganizationRepository,
+    organization_repo: ReadOnlyOrganizationRepository,
     base_query: Select = Depends(RQLQuery(OrganizationRules())),
 ):
     return await paginate(organization_repo, OrganizationRead, base_query=base_query)
@@ -166,10 +172,12 @@ async def get_organization_by_id(
 @router.get("/{organization_id}/datasources", response_model=list[DatasourceRead])
 async def get_datasources_by_organization_id(
     organization: Annotated[Organization, Depends(fetch_organization_or_404)],
+    db_session: DBSession,
     optscale_client: OptscaleClient,
 ):
     validate_linked_organization_id(organization)
 
+    await commit_early(db_session)
     with wrap_http_error_in_502(f"Error fetching datasources for organization {organization.name}"):
         response = await optscale_client.fetch_datasources_for_organization(
             organization_id=organization.linked_organization_id  # type: ignore
@@ -196,10 +204,12 @@ async def get_datasources_by_organization_id(
 async def get_datasource_by_id(
     organization: Annotated[Organization, Depends(fetch_organization_or_404)],
     datasource_id: UUID,
+    db_session: DBSession,
     optscale_client: OptscaleClient,
 ):
     validate_linked_organization_id(organization)
 
+    await commit_early(db_session)
     with wrap_http_error_in_502(f"Error fetching cloud account with ID {datasource_id}"):
         response = await optscale_client.fetch_datasource_by_id(datasource_id)
 
@@ -243,9 +253,11 @@ async def force_reimport_datasource(
 @router.get("/{organization_id}/employees", response_model=list[EmployeeRead])
 async def get_employees_by_organization_id(
     organization: Annotated[Organization, Depends(fetch_organization_or_404)],
+    db_session: DBSession,
     optscale_client: OptscaleClient,
 ):
     validate_linked_organization_id(organization)
+    await commit_early(db_session)
     with wrap_http_error_in_502(f"Error fetching employees for organization {organization.name}"):
         response = await optscale_client.fetch_users_for_organization(
             organization_id=organization.linked_organization_id  # type: ignore
@@ -402,6 +414,7 @@ async def add_additional_admin(
     optscale_auth_client: OptscaleAuthClient,
     api_modifier_client: APIModifierClient,
     additional_admin_repo: AdditionalAdminRequestRepository,
+    db_session: DBSession,
     data: AdditionalAdminRequestCreate,
 ):
     """
@@ -416,6 +429,8 @@ async def add_additional_admin(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot add administrator: organization {db_organization.name} is deleted.",
         )
+    # Nothing has been written yet, the connection is not held while waiting on Optscale
+    await commit_early(db_session)
     # fetch user by email
     with wrap_http_error_in_502("Error checking or creating user in FinOps for Cloud"):
         try:
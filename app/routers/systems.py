@@ -6,7 +6,7 @@ from sqlalchemy import ColumnExpressionArgument, Select
 from app.db.handlers import ConstraintViolationError, NotFoundError
 from app.db.models import System
 from app.dependencies.auth import CurrentAuthContext
-from app.dependencies.db import AccountRepository, SystemRepository
+from app.dependencies.db import AccountRepository, ReadOnlySystemRepository, SystemRepository
 from app.dependencies.path import SystemId
 from app.enums import AccountType, SystemStatus
 from app.openapi import examples
@@ -71,7 +71,7 @@ router = APIRouter()
     },
 )
 async def get_systems(
-    system_repo: SystemRepository,
+    system_repo: ReadOnlySystemRepository,
     extra_conditions: CommonConditions,
     base_query: Select = Depends(RQLQuery(SystemRules())),
 ):
@@ -27,6 +27,7 @@ from app.dependencies.db import (
     AccountRepository,
     AccountUserRepository,
     DBSession,
+    ReadOnlyUserRepository,
     UserRepository,
 )
 from app.dependencies.path import AccountId, UserId
@@ -99,7 +100,7 @@ router = APIRouter()
     },
 )
 async def get_users(
-    user_repo: UserRepository,
+    user_repo: ReadOnlyUserRepository,
     auth_context: CurrentAuthContext,
     base_query: Select = Depends(RQLQuery(UserRules())),
 ):
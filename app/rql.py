@@ -1,9 +1,20 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
 from urllib.parse import parse_qs, quote, unquote
 
 from fastapi import Request
+from opentelemetry import metrics
 from requela import FieldRule, ModelRQLRules, RelationshipRule, RequelaError
+from requela.parser import parse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.sql.selectable import Select
 
+from app.conf import Settings, get_settings
 from app.db.models import (
     Account,
     AccountUser,
@@ -14,6 +25,8 @@ from app.db.models import (
     System,
     User,
 )
+from app.dependencies.core import AppSettings
+from app.dependencies.db import ReadOnlyDBSession
 from app.utils import wrap_exc_in_http_response
 
 
@@ -109,16 +122,231 @@ class DatasourceExpenseRules(ModelRQLRules, AuditableMixin):
     day = FieldRule()
     month = FieldRule()
     year = FieldRule()
+    date = FieldRule()
     expenses = FieldRule()
     total_expenses = FieldRule()
     organization = RelationshipRule(rules=OrganizationRules())
 
 
+meter = metrics.get_meter(__name__)
+
+rql_query_cache_requests_counter = meter.create_counter(
+    "rql.query_cache.requests",
+    description="Lookups of the queries built from RQL expressions in the cache",
+)
+
+
+class RQLComplexityError(RequelaError):
+    pass
+
+
+@dataclass
+class RQLComplexity:
+    # The number of logical, comparison and any operations
+    nodes: int = 0
+    # The maximum number of relationships traversed to reach a field
+    relationship_depth: int = 0
+    # The maximum number of values of an in/out operation
+    in_values: int = 0
+
+    def check(self, settings: Settings) -> None:
+        if self.nodes > settings.rql_max_nodes:
+            raise RQLComplexityError(
+                f"The RQL expression has too many operations ({self.nodes}), "
+                f"the maximum allowed is {settings.rql_max_nodes}."
+            )
+        if self.relationship_depth > settings.rql_max_relationship_depth:
+            raise RQLComplexityError(
+                f"The RQL expression traverses too many relationships "
+                f"({self.relationship_depth}), the maximum allowed is "
+                f"{settings.rql_max_relationship_depth}."
+            )
+        if self.in_values > settings.rql_max_in_values:
+            raise RQLComplexityError(
+                f"The RQL expression has too many values in a list ({self.in_values}), "
+                f"the maximum allowed is {settings.rql_max_in_values}."
+            )
+
+
+def _resolve_relationships(rules: ModelRQLRules, path: str) -> tuple[int, ModelRQLRules]:
+    """
+    Returns the number of relationships traversed by the given field path, e.g. 2 for
+    `user_accounts.accounts.name` on `UserRules`, and the rules of the last one.
+    """
+    depth = 0
+    while path:
+        for relation_name, relation in rules._relations.items():
+            alias = relation.alias or relation_name
+            if path == alias or path.startswith(f"{alias}."):
+                depth += 1
+                rules = relation.rules
+                path = path[len(alias) + 1 :]
+                break
+        else:
+            break
+
+    return depth, rules
+
+
+def get_rql_complexity(rules: ModelRQLRules, expression: str) -> RQLComplexity:
+    try:
+        tree = parse(expression)
+    except ValueError as e:
+        raise RequelaError(str(e)) from e
+
+    complexity = RQLComplexity()
+
+    def visit(node: Any, rules: ModelRQLRules, depth: int) -> None:
+        if node is None or isinstance(node, str):
+            # A token of the parse tree (e.g. a field name or a value) or a missing optional one
+            return
+
+        if node.data in ("logical_expression", "comparison", "any_expression"):
+            complexity.nodes += 1
+
+        if node.data == "property":
+            relationship_depth, _ = _resolve_relationships(rules, str(node.children[0]))
+            complexity.relationship_depth = max(
+                complexity.relationship_depth, depth + relationship_depth
+            )
+        elif node.data == "tuple":
+            complexity.in_values = max(complexity.in_values, len(node.children))
+        elif node.data == "any_expression":
+            # The fields of the condition are relative to the relationship
+            relationship, condition = node.children
+            visit(relationship, rules, depth)
+            relationship_depth, relationship_rules = _resolve_relationships(
+                rules, str(relationship.children[0])
+            )
+            visit(condition, relationship_rules, depth + relationship_depth)
+            return
+
+        for child in node.children:
+            visit(child, rules, depth)
+
+    visit(tree, rules, 0)
+    return complexity
+
+
+def check_rql_complexity(rules: ModelRQLRules, expression: str, settings: Settings) -> None:
+    """
+    Rejects the RQL expressions that would generate queries too expensive to run, e.g.
+    deeply nested relationships generating correlated subqueries.
+    """
+    get_rql_complexity(rules, expression).check(settings)
+
+
+class RQLQueryCache:
+    """
+    LRU cache of the queries built from the RQL expressions, the portal sending the same
+    few filters over and over.
+
+    The cached queries are shared between the requests, which is fine as the SQLAlchemy
+    statements are immutable: adding conditions or options to them returns a copy. The
+    complexity of the expressions is cached along with them, so it's only computed once.
+    """
+
+    def __init__(self, max_size: int = 512) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._queries: OrderedDict[
+            tuple[type[ModelRQLRules], str], tuple[Select, RQLComplexity]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def build_query(
+        self, rules: ModelRQLRules, expression: str, settings: Settings | None = None
+    ) -> Select:
+        """
+        Returns the query built from the RQL expression, after checking its complexity
+        against the limits of the given settings, if any.
+        """
+        if self.max_size <= 0:
+            if settings is not None:
+                check_rql_complexity(rules, expression, settings)
+            return rules.build_query(expression)
+
+        key = (type(rules), expression)
+        with self._lock:
+            cached = self._queries.get(key)
+            if cached is not None:
+                self._queries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        rql_query_cache_requests_counter.add(
+            1, {"hit": cached is not None, "rules": key[0].__name__}
+        )
+        if cached is not None:
+            query, complexity = cached
+            if settings is not None:
+                complexity.check(settings)
+            return query
+
+        # Invalid and too complex expressions raise an error and are not cached
+        complexity = get_rql_complexity(rules, expression)
+        if settings is not None:
+            complexity.check(settings)
+        query = rules.build_query(expression)
+
+        with self._lock:
+            self._queries[key] = (query, complexity)
+            if len(self._queries) > self.max_size:
+                self._queries.popitem(last=False)
+
+        return query
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+rql_query_cache = RQLQueryCache(max_size=get_settings().rql_query_cache_size)
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+async def check_rql_query_cost(session: AsyncSession, query: Select, max_cost: float) -> None:
+    """
+    Rejects the queries whose total cost, as estimated by the PostgreSQL planner, exceeds
+    the given maximum.
+    """
+    [plan] = (await session.execute(Explain(query))).scalar_one()
+    cost = plan["Plan"]["Total Cost"]
+
+    if cost > max_cost:
+        raise RQLComplexityError(
+            f"The RQL expression results in a query too expensive to run (estimated cost "
+            f"{cost}), the maximum allowed is {max_cost}."
+        )
+
+
 class RQLQuery:
     def __init__(self, rules: ModelRQLRules):
         self.rules = rules
 
-    def __call__(self, request: Request) -> Select | None:
+    async def __call__(
+        self, request: Request, session: ReadOnlyDBSession, settings: AppSettings
+    ) -> Select | None:
         qs = quote(
             request.scope["query_string"].decode(), safe="/&()=_.-~:,"
         )  # make sure we can decode datetime
@@ -128,5 +356,11 @@ class RQLQuery:
         if not rql_expression:
             return None
 
+        expression = unquote(rql_expression)
         with wrap_exc_in_http_response(RequelaError):
-            return self.rules.build_query(unquote(rql_expression))
+            query = rql_query_cache.build_query(self.rules, expression, settings)
+
+            if settings.rql_max_query_cost is not None:
+                await check_rql_query_cost(session, query, settings.rql_max_query_cost)
+
+        return query
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+import functools
 import types
 from typing import Annotated, Any
 
@@ -12,6 +13,7 @@ from pydantic import (
     field_validator,
 )
 
+from app.db.actor_references import get_related_actor
 from app.db.models import Base
 from app.enums import ActorType
 
@@ -40,50 +42,99 @@ def convert_model_to_schema[M: Base, S: BaseModel](
         S: An instance of `schema_cls` with the converted data.
 
     """
-    schema_data = extract_fields_from_model(schema_cls, db_model, list(override_attributes.keys()))
-    if "events" not in schema_cls.model_fields:
-        # IF "events" is not in dictionary containing all the schema’s fields, then no additional
-        # processing is needed. Just returns an instance of schema_cls with the
-        # fields extracted from the db_model and any user provided attributes to override.
-        return schema_cls(**schema_data, **override_attributes)
-
-    # NOTE: This is a hack, ideally this behaviour should be handled by the models,
-    #       but to do it properly we need to spend more time in learning how pydantic
-    #       works and possibly do quite a lot of refactoring of our schemas
-
-    events_schema_cls = schema_cls.model_fields["events"].annotation
-    # IF "events" exists, we're going to create an instance of AuditEventsSchema
-    # extract field values from db_model that match schema_cls, not considering the
-    # override_attributes fields,if any.
-    events = extract_events(db_model=db_model, events_schema_cls=events_schema_cls)  # type: ignore
-    return schema_cls(**schema_data, events=events, **override_attributes)
-
-
-def extract_events[M: Base, S: BaseModel](db_model: M, events_schema_cls: type[S]) -> BaseModel:
-    """
-    Extracts events of type AuditFieldSchema from an SQLAlchemy model instance
+    return get_model_serializer(type(db_model), schema_cls).to_schema(
+        db_model, **override_attributes
+    )
 
-    Args:
-        db_model (M): The SQLAlchemy model instance.
-        events_schema_cls (type[S]): The target schema containing `events` to extract.
 
-    Returns:
-        BaseModel: An instance of `AuditEventsSchema` with extracted event data.
+class ModelSerializer[M: Base, S: BaseModel]:
     """
-    schema_values: dict[str, AuditFieldSchema | None] = {}
-    for field_name, field_info in events_schema_cls.model_fields.items():
-        event_field_schema_cls = resolve_field_type(field_info.annotation)
+    Serializes the instances of an SQLAlchemy model (`model_cls`) into a Pydantic schema
+    (`schema_cls`).
 
-        if not issubclass(event_field_schema_cls, AuditFieldSchema):  # type: ignore
-            raise TypeError(f"Unsupported schema type: {event_field_schema_cls}")
+    Which attributes of the model are read, and how the audit events are extracted from
+    it, is worked out once when the serializer is built, so that serializing a row only
+    has to read the attributes and validate the data with a single call to pydantic.
 
-        at_value = getattr(db_model, f"{field_name}_at", None)
-        by_value = getattr(db_model, f"{field_name}_by", None)
+    Use `get_model_serializer` to get the (cached) serializer of a model and schema.
+    """
 
-        schema_values[field_name] = (
-            event_field_schema_cls(at=at_value, by=by_value) if at_value else None  # type: ignore
+    def __init__(self, model_cls: type[M], schema_cls: type[S]) -> None:
+        self.model_cls = model_cls
+        self.schema_cls = schema_cls
+        self.field_names = tuple(
+            field_name
+            for field_name in schema_cls.model_fields
+            if field_name != "events" and hasattr(model_cls, field_name)
+        )
+        # (event name, model attribute with the date, model relationship with the actor)
+        self.events: tuple[tuple[str, str, str], ...] | None = None
+
+        if "events" in schema_cls.model_fields:
+            # NOTE: This is a hack, ideally this behaviour should be handled by the models,
+            #       but to do it properly we need to spend more time in learning how pydantic
+            #       works and possibly do quite a lot of refactoring of our schemas
+            events_schema_cls: type[BaseModel] = schema_cls.model_fields["events"].annotation  # type: ignore
+            events = []
+
+            for field_name, field_info in events_schema_cls.model_fields.items():
+                event_field_schema_cls = resolve_field_type(field_info.annotation)
+
+                if not issubclass(event_field_schema_cls, AuditFieldSchema):  # type: ignore
+                    raise TypeError(f"Unsupported schema type: {event_field_schema_cls}")
+
+                events.append((field_name, f"{field_name}_at", f"{field_name}_by"))
+
+            self.events = tuple(events)
+
+    def extract(self, db_model: M, **override_attributes: Any) -> dict[str, Any]:
+        """
+        Extracts the data of the schema from the given model instance, without validating it.
+        """
+        data = {
+            field_name: getattr(db_model, field_name)
+            for field_name in self.field_names
+            if field_name not in override_attributes
+        }
+
+        if self.events is not None:
+            events: dict[str, dict[str, Any] | None] = {}
+
+            for event_name, at_attr, by_attr in self.events:
+                at_value = getattr(db_model, at_attr, None)
+                events[event_name] = (
+                    {"at": at_value, "by": get_related_actor(db_model, by_attr)}
+                    if at_value
+                    else None
+                )
+
+            data["events"] = events
+
+        data.update(override_attributes)
+        return data
+
+    def to_schema(self, db_model: M, **override_attributes: Any) -> S:
+        return self.schema_cls.model_validate(self.extract(db_model, **override_attributes))
+
+    def to_dict(
+        self, db_model: M, *, exclude_none: bool = False, **override_attributes: Any
+    ) -> dict[str, Any]:
+        """
+        Returns the validated schema data of the given model instance as a dict of JSON
+        compatible values, ready to be encoded in a response.
+        """
+        return self.schema_cls.__pydantic_serializer__.to_python(
+            self.to_schema(db_model, **override_attributes),
+            mode="json",
+            exclude_none=exclude_none,
         )
-    return events_schema_cls(**schema_values)
+
+
+@functools.cache
+def get_model_serializer[M: Base, S: BaseModel](
+    model_cls: type[M], schema_cls: type[S]
+) -> ModelSerializer[M, S]:
+    return ModelSerializer(model_cls, schema_cls)
 
 
 def resolve_field_type(field_info: Any) -> BaseModel:
@@ -126,25 +177,6 @@ def convert_schema_to_model[M: Base, S: BaseModel](schema: S, model_cls: type[M]
     return model_cls(**dbmodel_fields)
 
 
-def extract_fields_from_model[M: Base, S: BaseModel](
-    schema_cls: type[S], db_model: M, excluded_fields: list[str]
-) -> dict[str, Any]:
-    """
-    This function iterates through the fields defined in the Pydantic schema (`schema_cls`),
-    retrieves the corresponding values from the database model (`db_model`), and returns
-    a dictionary with the extracted field values.
-    Any fields listed in `excluded_fields` or not present in `db_model`are ignored.
-    This function ensures that only fields present in the Pydantic model are included
-    in the returned dictionary.
-
-    """
-    return {
-        field_name: getattr(db_model, field_name)
-        for field_name in schema_cls.model_fields.keys()
-        if field_name not in excluded_fields and hasattr(db_model, field_name)
-    }
-
-
 class BaseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True, extra="forbid")
 
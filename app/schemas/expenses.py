@@ -1,3 +1,4 @@
+import datetime
 from decimal import Decimal
 
 from app.enums import DatasourceType
@@ -14,5 +15,6 @@ class DatasourceExpenseRead(IdSchema, CommonEventsSchema):
     year: int
     day: int
     month: int
+    date: datetime.date
     expenses: Decimal
     total_expenses: Decimal
@@ -1,32 +1,204 @@
+from __future__ import annotations
+
+import contextlib
+import json
 import logging
-from collections.abc import Callable, Coroutine
+import pathlib
+import sys
+import time
+from collections.abc import Callable, Coroutine, Iterator, Sequence
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
 from functools import wraps
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from azure.monitor.opentelemetry.exporter import AzureMonitorTraceExporter
-from fastapi import FastAPI
-from opentelemetry import trace
+from opentelemetry import metrics, trace
 from opentelemetry.context import Context
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import (
+    ConsoleMetricExporter,
+    MetricExporter,
+    PeriodicExportingMetricReader,
+)
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanContext, SpanKind, StatusCode, TraceFlags
+from opentelemetry.trace.span import TraceState
+from opentelemetry.util.types import Attributes
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.conf import OpenTelemetryExporter, Settings
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
 logger = logging.getLogger(__name__)
 
 SpanFilter = Callable[[ReadableSpan], bool]
 
+meter = metrics.get_meter(__name__)
+
+cli_command_duration_histogram = meter.create_histogram(
+    "cli.command.duration",
+    unit="s",
+    description="Duration of the CLI commands",
+)
+cli_job_items_counter = meter.create_counter(
+    "cli.job.items",
+    unit="{item}",
+    description="Number of items (e.g. organizations, rows) processed by the CLI commands",
+)
+cli_job_throughput_histogram = meter.create_histogram(
+    "cli.job.throughput",
+    unit="{item}/s",
+    description="Number of items processed per second by the CLI commands",
+)
+
+cli_command_phase_duration_histogram = meter.create_histogram(
+    "cli.command.phase.duration",
+    unit="s",
+    description="Duration of the phases (e.g. fetch, store, notify) of the CLI commands",
+)
+
+
+@dataclass
+class CommandPhaseStats:
+    # The number of times the phase has been run, e.g. once per organization
+    calls: int = 0
+    # The total time spent in the phase, in seconds
+    duration: float = 0.0
+
+
+@dataclass
+class CommandRunReport:
+    """
+    Summary of a CLI command run, written as JSON at the end of the command for the
+    scheduler running it.
+    """
+
+    command: str
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    finished_at: datetime | None = None
+    duration: float = 0.0
+    status: str = "running"
+    error: str | None = None
+    phases: dict[str, CommandPhaseStats] = field(default_factory=dict)
+    items: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+_current_run_report: ContextVar[CommandRunReport | None] = ContextVar(
+    "cli_run_report", default=None
+)
+_current_command_phase: ContextVar[str | None] = ContextVar("cli_command_phase", default=None)
+# Where the run reports are written, "-" for stdout, set from the CLI options
+_run_report_path: str | None = None
+
+
+def set_run_report_path(path: str | None) -> None:
+    global _run_report_path
+    _run_report_path = path
+
+
+def get_current_run_report() -> CommandRunReport | None:
+    return _current_run_report.get()
+
+
+def write_run_report(report: CommandRunReport, path: str) -> None:
+    content = json.dumps(report.to_dict(), indent=2)
+    if path == "-":
+        sys.stdout.write(f"{content}\n")
+    else:
+        pathlib.Path(path).write_text(content)
+
+
+@contextlib.contextmanager
+def cli_command_phase(name: str, **attributes: str) -> Iterator[trace.Span]:
+    """
+    Runs a phase of the current CLI command (e.g. "fetch", "store" or "notify") in its own
+    span, recording its duration in the run report and the phases duration histogram.
+    """
+    report = get_current_run_report()
+    start_time = time.perf_counter()
+    token = _current_command_phase.set(name)
+    try:
+        with trace.get_tracer(__name__).start_as_current_span(
+            name, attributes={"cli.command.phase": name, **attributes}
+        ) as span:
+            yield span
+    finally:
+        _current_command_phase.reset(token)
+        if report is not None:
+            duration = time.perf_counter() - start_time
+            phase = report.phases.setdefault(name, CommandPhaseStats())
+            phase.calls += 1
+            phase.duration += duration
+            cli_command_phase_duration_histogram.record(
+                duration, {"cli.command": report.command, "cli.command.phase": name, **attributes}
+            )
+
+
+@contextlib.contextmanager
+def cli_command_outer_phase(name: str, **attributes: str) -> Iterator[None]:
+    """
+    Same as `cli_command_phase` for the code also run outside of the CLI commands (e.g.
+    sending notifications), the phase is only recorded while a CLI command is running and
+    outside of any other phase, which already accounts for its duration.
+    """
+    if get_current_run_report() is None or _current_command_phase.get() is not None:
+        yield
+        return
+
+    with cli_command_phase(name, **attributes):
+        yield
+
+
+def record_cli_job_items(item: str, count: int, **attributes: str) -> dict[str, str]:
+    """
+    Records that `count` items of the given kind (e.g. "organizations", "rows") have been
+    processed by the current CLI command.
+    """
+    report = get_current_run_report()
+    metric_attributes = {
+        "cli.command": report.command if report is not None else "unknown",
+        "cli.job.item": item,
+        **attributes,
+    }
+    cli_job_items_counter.add(count, metric_attributes)
+    if report is not None:
+        report.items[item] = report.items.get(item, 0) + count
+
+    return metric_attributes
+
+
+def record_cli_job_throughput(item: str, count: int, duration: float, **attributes: str) -> None:
+    """
+    Same as `record_cli_job_items`, also recording the throughput of the items processed in
+    `duration` seconds.
+    """
+    metric_attributes = record_cli_job_items(item, count, **attributes)
+    if duration > 0:
+        cli_job_throughput_histogram.record(count / duration, metric_attributes)
+
 
-def slow_sqlalchemy_queries(*, min_duration_ms: int) -> SpanFilter:  # pragma: no cover
+def slow_sqlalchemy_queries(*, min_duration_ms: int) -> SpanFilter:
     def filter(span: ReadableSpan) -> bool:
-        if span.instrumentation_info.name != "opentelemetry.instrumentation.sqlalchemy":
+        scope = span.instrumentation_scope
+        if scope is None or scope.name != "opentelemetry.instrumentation.sqlalchemy":
             # Apply this filter only for SQLAlchemy spans
             return True
 
@@ -45,7 +217,7 @@ def slow_sqlalchemy_queries(*, min_duration_ms: int) -> SpanFilter:  # pragma: n
     return filter
 
 
-class FilteredSpanProcessor(SpanProcessor):  # pragma: no cover
+class FilteredSpanProcessor(SpanProcessor):
     def __init__(self, delegate_processor: SpanProcessor, filter_func: SpanFilter) -> None:
         self.delegate_processor = delegate_processor
         self.filter_func = filter_func
@@ -60,13 +232,164 @@ class FilteredSpanProcessor(SpanProcessor):  # pragma: no cover
 
         self.delegate_processor.on_end(span)
 
-    def shutdown(self) -> None:
+    def shutdown(self) -> None:  # pragma: no cover
         self.delegate_processor.shutdown()
 
-    def force_flush(self, timeout_millis: int = 30_000) -> bool:
+    def force_flush(self, timeout_millis: int = 30_000) -> bool:  # pragma: no cover
         return self.delegate_processor.force_flush(timeout_millis)
 
 
+class RouteRatioSampler(Sampler):
+    """
+    Samples the given ratio of the traces, with overrides for the spans starting them by
+    name (e.g. `GET /expenses` for the FastAPI requests), the spans continuing a trace
+    following the decision made for it.
+
+    When `record_unsampled` is set, the spans of the traces not sampled are still recorded
+    so that `ErrorSpanProcessor` can export the ones ending with an error.
+    """
+
+    def __init__(
+        self,
+        ratio: float,
+        ratio_overrides: dict[str, float] | None = None,
+        record_unsampled: bool = False,
+    ) -> None:
+        self.default_sampler = TraceIdRatioBased(ratio)
+        self.samplers = {
+            name: TraceIdRatioBased(override) for name, override in (ratio_overrides or {}).items()
+        }
+        self.record_unsampled = record_unsampled
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: TraceState | None = None,
+    ) -> SamplingResult:
+        parent_span = trace.get_current_span(parent_context)
+        parent_span_context = parent_span.get_span_context()
+
+        if parent_span_context.is_valid:
+            if parent_span_context.trace_flags.sampled:
+                decision = Decision.RECORD_AND_SAMPLE
+            elif self.record_unsampled and (
+                parent_span_context.is_remote or parent_span.is_recording()
+            ):
+                decision = Decision.RECORD_ONLY
+            else:
+                decision = Decision.DROP
+
+            return SamplingResult(decision, attributes, parent_span_context.trace_state)
+
+        sampler = self.samplers.get(name, self.default_sampler)
+        result = sampler.should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+        if result.decision == Decision.DROP and self.record_unsampled:
+            return SamplingResult(Decision.RECORD_ONLY, attributes, trace_state)
+
+        return result
+
+    def get_description(self) -> str:
+        return f"RouteRatioSampler{{{self.default_sampler.rate}, overrides={len(self.samplers)}}}"
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    context = span.context
+    return ReadableSpan(
+        name=span.name,
+        context=SpanContext(
+            context.trace_id,
+            context.span_id,
+            context.is_remote,
+            TraceFlags(context.trace_flags | TraceFlags.SAMPLED),
+            context.trace_state,
+        ),
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+
+
+class ErrorSpanProcessor(SpanProcessor):
+    """
+    Forwards the sampled spans to the delegate processor, along with the spans of the traces
+    not sampled ending with an error.
+    """
+
+    def __init__(self, delegate_processor: SpanProcessor) -> None:
+        self.delegate_processor = delegate_processor
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        self.delegate_processor.on_start(span, parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context.trace_flags.sampled:
+            self.delegate_processor.on_end(span)
+        elif span.status.status_code == StatusCode.ERROR:
+            self.delegate_processor.on_end(_as_sampled(span))
+
+    def shutdown(self) -> None:  # pragma: no cover
+        self.delegate_processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30_000) -> bool:  # pragma: no cover
+        return self.delegate_processor.force_flush(timeout_millis)
+
+
+# The exporters and the instrumentors are only imported once they are configured, importing
+# all of them would slow down the start of the CLI commands and of the API workers
+
+
+def get_span_exporter(settings: Settings) -> SpanExporter:
+    if settings.opentelemetry_exporter == OpenTelemetryExporter.AZURE_APP_INSIGHTS:
+        from azure.monitor.opentelemetry.exporter import AzureMonitorTraceExporter
+
+        return AzureMonitorTraceExporter(connection_string=settings.opentelemetry_connection_string)
+    if settings.opentelemetry_exporter == OpenTelemetryExporter.JAEGER:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.opentelemetry_connection_string)  # type: ignore[arg-type]
+    if settings.opentelemetry_exporter == OpenTelemetryExporter.CONSOLE:
+        return ConsoleSpanExporter()
+
+    raise ValueError(f"Unsupported OpenTelemetry exporter: {settings.opentelemetry_exporter}")
+
+
+def get_metric_exporter(settings: Settings) -> MetricExporter:
+    if settings.opentelemetry_exporter == OpenTelemetryExporter.AZURE_APP_INSIGHTS:
+        from azure.monitor.opentelemetry.exporter import AzureMonitorMetricExporter
+
+        return AzureMonitorMetricExporter(
+            connection_string=settings.opentelemetry_metrics_connection_string
+            or settings.opentelemetry_connection_string
+        )
+    if settings.opentelemetry_exporter == OpenTelemetryExporter.JAEGER:
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+
+        # Jaeger only collects traces, the metrics are sent to the OTLP metrics endpoint
+        # of the same collector unless another one is configured
+        endpoint = settings.opentelemetry_metrics_connection_string
+        if endpoint is None and settings.opentelemetry_connection_string is not None:
+            endpoint = settings.opentelemetry_connection_string.replace("/v1/traces", "/v1/metrics")
+        return OTLPMetricExporter(endpoint=endpoint)
+    if settings.opentelemetry_exporter == OpenTelemetryExporter.CONSOLE:
+        return ConsoleMetricExporter()
+
+    raise ValueError(f"Unsupported OpenTelemetry exporter: {settings.opentelemetry_exporter}")
+
+
 def setup_telemetry(settings: Settings) -> None:  # pragma: no cover
     if settings.opentelemetry_exporter is None:
         return
@@ -74,22 +397,21 @@ def setup_telemetry(settings: Settings) -> None:  # pragma: no cover
     resource = Resource(
         attributes={"service.name": "ffc-operations-api"},
     )
-    trace_provider = TracerProvider(resource=resource)
-
-    exporter: SpanExporter
-
-    if settings.opentelemetry_exporter == OpenTelemetryExporter.AZURE_APP_INSIGHTS:
-        exporter = AzureMonitorTraceExporter(
-            connection_string=settings.opentelemetry_connection_string
-        )
-    elif settings.opentelemetry_exporter == OpenTelemetryExporter.JAEGER:
-        exporter = OTLPSpanExporter(endpoint=settings.opentelemetry_connection_string)  # type: ignore[arg-type]
-    elif settings.opentelemetry_exporter == OpenTelemetryExporter.CONSOLE:
-        exporter = ConsoleSpanExporter()
-    else:
-        raise ValueError(f"Unsupported OpenTelemetry exporter: {settings.opentelemetry_exporter}")
+    trace_provider = TracerProvider(
+        resource=resource,
+        sampler=RouteRatioSampler(
+            settings.opentelemetry_sampling_ratio,
+            settings.opentelemetry_sampling_ratio_overrides,
+            record_unsampled=settings.opentelemetry_always_sample_errors,
+        ),
+    )
 
-    span_processor: SpanProcessor = BatchSpanProcessor(exporter)
+    span_processor: SpanProcessor = BatchSpanProcessor(
+        get_span_exporter(settings),
+        max_queue_size=settings.opentelemetry_batch_max_queue_size,
+        max_export_batch_size=settings.opentelemetry_batch_max_export_batch_size,
+        schedule_delay_millis=settings.opentelemetry_batch_schedule_delay_ms,
+    )
 
     if settings.opentelemetry_sqlalchemy_min_query_duration_ms is not None:
         span_processor = FilteredSpanProcessor(
@@ -98,10 +420,22 @@ def setup_telemetry(settings: Settings) -> None:  # pragma: no cover
                 min_duration_ms=settings.opentelemetry_sqlalchemy_min_query_duration_ms
             ),
         )
+    if settings.opentelemetry_always_sample_errors:
+        span_processor = ErrorSpanProcessor(span_processor)
     trace_provider.add_span_processor(span_processor)
 
     trace.set_tracer_provider(trace_provider)
 
+    metric_reader = PeriodicExportingMetricReader(
+        get_metric_exporter(settings),
+        export_interval_millis=settings.opentelemetry_metrics_export_interval_ms,
+    )
+    # The meter provider flushes the metrics at exit, e.g. at the end of the CLI commands
+    metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.logging import LoggingInstrumentor
+
     HTTPXClientInstrumentor().instrument()
     LoggingInstrumentor().instrument(set_logging_format=True)
 
@@ -113,6 +447,8 @@ def setup_fastapi_instrumentor(settings: Settings, app: FastAPI) -> None:  # pra
     if settings.opentelemetry_exporter is None:
         return
 
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
     FastAPIInstrumentor.instrument_app(app)
 
 
@@ -122,6 +458,8 @@ def setup_sqlalchemy_instrumentor(
     if settings.opentelemetry_exporter is None:
         return
 
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
     SQLAlchemyInstrumentor().instrument(engine=dbengine.sync_engine, enable_commenter=True)
 
 
@@ -133,14 +471,31 @@ def capture_telemetry_cli_command[**P, R](
         async def _wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             tracer = trace.get_tracer(tracer_name)
 
-            with tracer.start_as_current_span(
-                span_name,
-                kind=trace.SpanKind.CLIENT,
-                attributes={
-                    "az.namespace": "CLI Command",
-                },
-            ):
-                return await func(*args, **kwargs)
+            report = CommandRunReport(command=span_name)
+            token = _current_run_report.set(report)
+            start_time = time.perf_counter()
+            try:
+                with tracer.start_as_current_span(
+                    span_name,
+                    kind=trace.SpanKind.CLIENT,
+                    attributes={
+                        "az.namespace": "CLI Command",
+                    },
+                ):
+                    result = await func(*args, **kwargs)
+                report.status = "success"
+                return result
+            except BaseException as e:
+                report.status = "error"
+                report.error = str(e) or repr(e)
+                raise
+            finally:
+                _current_run_report.reset(token)
+                report.duration = time.perf_counter() - start_time
+                report.finished_at = datetime.now(UTC)
+                cli_command_duration_histogram.record(report.duration, {"cli.command": span_name})
+                if _run_report_path is not None:
+                    write_run_report(report, _run_report_path)
 
         return _wrapper
 
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.conf import get_settings
 from app.db.models import Base
+from app.db.partitioning import MonthlyPartitionMixin
 
 app_settings = get_settings()
 config = context.config
@@ -25,6 +26,23 @@ target_metadata.naming_convention = {
     "pk": "pk_%(table_name)s",
 }
 
+partition_table_prefixes = tuple(
+    f"{mapper.local_table.name}_"
+    for mapper in Base.registry.mappers
+    if issubclass(mapper.class_, MonthlyPartitionMixin)
+)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Skips the partitions of the partitioned tables: they are created and dropped at runtime.
+    """
+    if not reflected or compare_to is not None:
+        return True
+
+    table = object if type_ == "table" else getattr(object, "table", None)
+    return table is None or not table.name.startswith(partition_table_prefixes)
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -42,6 +60,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=str(app_settings.postgres_async_url),
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -51,7 +70,9 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_object=include_object
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,31 @@
+"""Add date to DatasourceExpense
+
+Revision ID: 4c1e7a9d2f60
+Revises: b9b8253729db
+Create Date: 2026-10-18 11:02:17.284519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy_utils
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e7a9d2f60'
+down_revision: Union[str, None] = 'b9b8253729db'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('datasource_expenses', sa.Column('date', sa.Date(), sa.Computed('make_date(year, month, day)', persisted=True), nullable=False))
+    op.create_index('ix_datasource_expenses_organization_id_and_date', 'datasource_expenses', ['organization_id', 'date'], unique=False)
+    op.create_index('ix_datasource_expenses_datasource_id_and_date', 'datasource_expenses', ['datasource_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_datasource_expenses_datasource_id_and_date', table_name='datasource_expenses')
+    op.drop_index('ix_datasource_expenses_organization_id_and_date', table_name='datasource_expenses')
+    op.drop_column('datasource_expenses', 'date')
@@ -0,0 +1,131 @@
+"""Partition datasource_expenses by month
+
+Revision ID: b9b8253729db
+Revises: 51d41f5610bd
+Create Date: 2026-10-18 10:12:41.503127
+
+"""
+import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy_utils
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9b8253729db'
+down_revision: Union[str, None] = '51d41f5610bd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = (
+    'id, datasource_id, linked_datasource_id, linked_datasource_type, datasource_name, '
+    'organization_id, year, month, day, expenses, total_expenses, created_at, updated_at, '
+    'deleted_at'
+)
+# Number of months after the current one to create partitions for
+PARTITIONS_AHEAD_MONTHS = 2
+
+
+def _next_month(year: int, month: int) -> tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _drop_constraints_and_indexes(table_name: str) -> None:
+    op.drop_constraint('uq_datasource_expenses_per_day', table_name, type_='unique')
+    op.drop_constraint(
+        'fk_datasource_expenses_organization_id_organizations', table_name, type_='foreignkey'
+    )
+    op.drop_constraint('pk_datasource_expenses', table_name, type_='primary')
+    op.drop_index('ix_datasource_expenses_year_and_month', table_name=table_name)
+    op.drop_index('ix_datasource_expenses_datasource_id', table_name=table_name)
+
+
+def _create_table(table_name: str, primary_key: list[str], **kwargs) -> None:
+    op.create_table(table_name,
+    sa.Column('datasource_id', sa.String(length=255), nullable=False),
+    sa.Column('linked_datasource_id', sa.String(length=255), nullable=False),
+    sa.Column('linked_datasource_type', postgresql.ENUM('aws_cnr', 'azure_cnr', 'azure_tenant', 'gcp_cnr', 'unknown', name='datasourcetype', create_type=False), nullable=False),
+    sa.Column('datasource_name', sa.String(length=255), nullable=False),
+    sa.Column('organization_id', sa.String(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Integer(), nullable=False),
+    sa.Column('expenses', sa.Numeric(precision=18, scale=4), server_default='0.0000', nullable=False),
+    sa.Column('total_expenses', sa.Numeric(precision=18, scale=4), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], name='fk_datasource_expenses_organization_id_organizations'),
+    sa.PrimaryKeyConstraint(*primary_key, name='pk_datasource_expenses'),
+    sa.UniqueConstraint('datasource_id', 'linked_datasource_type', 'organization_id', 'year', 'month', 'day', name='uq_datasource_expenses_per_day'),
+    **kwargs,
+    )
+    op.create_index('ix_datasource_expenses_datasource_id', 'datasource_expenses', ['datasource_id'], unique=False)
+    op.create_index('ix_datasource_expenses_year_and_month', 'datasource_expenses', ['year', 'month'], unique=False)
+
+
+def upgrade() -> None:
+    # A regular table cannot be turned into a partitioned one: rename it, create the
+    # partitioned table in its place and move all the rows
+    op.rename_table('datasource_expenses', 'datasource_expenses_unpartitioned')
+    _drop_constraints_and_indexes('datasource_expenses_unpartitioned')
+    op.drop_index('ix_datasource_expenses_id', table_name='datasource_expenses_unpartitioned')
+
+    # The partition key must be part of the primary key, and of any unique index: the
+    # uniqueness of the id alone is no longer enforced by the database. The ids are
+    # allocated by HumanReadablePKMixin, which checks the candidates against the existing
+    # rows of all the partitions (using the primary key index, led by the id), so only two
+    # concurrent transactions drawing the same random 12 digits id could collide.
+    _create_table(
+        'datasource_expenses',
+        ['id', 'year', 'month'],
+        postgresql_partition_by='RANGE (year, month)',
+    )
+    op.execute('CREATE TABLE datasource_expenses_default PARTITION OF datasource_expenses DEFAULT')
+
+    conn = op.get_bind()
+    months = {
+        (year, month)
+        for year, month in conn.execute(
+            sa.text('SELECT DISTINCT year, month FROM datasource_expenses_unpartitioned')
+        )
+    }
+    today = datetime.date.today()
+    current = (today.year, today.month)
+    for _ in range(PARTITIONS_AHEAD_MONTHS + 1):
+        months.add(current)
+        current = _next_month(*current)
+
+    for year, month in sorted(months):
+        next_year, next_month = _next_month(year, month)
+        op.execute(
+            f'CREATE TABLE datasource_expenses_y{year:04d}m{month:02d} '
+            'PARTITION OF datasource_expenses '
+            f'FOR VALUES FROM ({year}, {month}) TO ({next_year}, {next_month})'
+        )
+
+    op.execute(
+        f'INSERT INTO datasource_expenses ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM datasource_expenses_unpartitioned'
+    )
+    op.drop_table('datasource_expenses_unpartitioned')
+
+
+def downgrade() -> None:
+    # Dropping the partitioned table also drops all its partitions
+    op.rename_table('datasource_expenses', 'datasource_expenses_partitioned')
+    _drop_constraints_and_indexes('datasource_expenses_partitioned')
+
+    _create_table('datasource_expenses', ['id'])
+    op.create_index('ix_datasource_expenses_id', 'datasource_expenses', ['id'], unique=True)
+
+    op.execute(
+        f'INSERT INTO datasource_expenses ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM datasource_expenses_partitioned'
+    )
+    op.drop_table('datasource_expenses_partitioned')
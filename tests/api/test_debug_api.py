@@ -0,0 +1,87 @@
+import pytest
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+
+from app.conf import Settings
+from app.routers import debug
+
+
+@pytest.fixture
+def debug_endpoints_enabled(monkeypatch: pytest.MonkeyPatch, test_settings: Settings) -> None:
+    monkeypatch.setattr(test_settings, "debug_endpoints_enabled", True)
+
+
+@pytest.mark.usefixtures("debug_endpoints_enabled")
+async def test_profile(operations_client: AsyncClient):
+    response = await operations_client.get("/debug/profile", params={"duration": 0.1})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.headers["content-disposition"] == 'attachment; filename="profile.folded"'
+
+    lines = response.text.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack
+        assert int(count) > 0
+
+    # The event loop of the worker is sampled while the request waits for the end of the profile
+    assert "BaseEventLoop._run_once" in response.text
+
+
+@pytest.mark.usefixtures("debug_endpoints_enabled")
+async def test_profile_releases_the_db_connection(
+    operations_client: AsyncClient, mocker: MockerFixture
+):
+    spied_commit_early = mocker.spy(debug, "commit_early")
+    in_transaction_while_profiling = []
+
+    def profile_worker(duration: float, interval: float) -> str:
+        [session] = spied_commit_early.call_args.args
+        in_transaction_while_profiling.append(session.in_transaction())
+        return ""
+
+    mocker.patch("app.routers.debug.profile_worker", side_effect=profile_worker)
+
+    response = await operations_client.get("/debug/profile", params={"duration": 0.1})
+
+    assert response.status_code == 200
+    assert in_transaction_while_profiling == [False]
+
+
+@pytest.mark.usefixtures("debug_endpoints_enabled")
+async def test_profile_duration_too_long(
+    operations_client: AsyncClient, monkeypatch: pytest.MonkeyPatch, test_settings: Settings
+):
+    monkeypatch.setattr(test_settings, "debug_profile_max_duration_seconds", 5)
+
+    response = await operations_client.get("/debug/profile", params={"duration": 10})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "The duration of the profile cannot exceed 5 seconds."
+
+
+async def test_profile_disabled(operations_client: AsyncClient):
+    response = await operations_client.get("/debug/profile", params={"duration": 0.1})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("debug_endpoints_enabled")
+async def test_profile_affiliate_account(affiliate_client: AsyncClient):
+    response = await affiliate_client.get("/debug/profile", params={"duration": 0.1})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.usefixtures("debug_endpoints_enabled")
+async def test_pool_stats(operations_client: AsyncClient, test_settings: Settings):
+    response = await operations_client.get("/debug/pool")
+
+    assert response.status_code == 200
+    [stats] = [stats for stats in response.json() if stats["checked_out"] > 0]
+    assert stats["name"] == "primary"
+    assert stats["size"] == test_settings.postgres_pool_size
+    assert stats["max_overflow"] == test_settings.postgres_max_overflow
+    assert stats["checked_out"] + stats["checked_in"] >= 1
@@ -2,11 +2,14 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
+from pytest_capsqlalchemy import SQLAlchemyCapturer
 from pytest_httpx import HTTPXMock
+from pytest_mock import MockerFixture
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.conf import Settings
+from app.db.handlers import EntitlementHandler
 from app.db.models import Account, Entitlement, System
 from app.enums import AccountStatus, DatasourceType, EntitlementStatus, OrganizationStatus
 from tests.types import JWTTokenFactory, ModelFactory
@@ -311,6 +314,26 @@ async def test_get_all_entitlements_single_page_with_created_at_filter(
     assert data["items"][0]["id"] == entitlement_gcp.id
 
 
+async def test_get_all_entitlements_too_complex_filter(
+    entitlement_gcp: Entitlement,
+    api_client: AsyncClient,
+    gcp_jwt_token: str,
+    test_settings: Settings,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(test_settings, "rql_max_in_values", 2)
+
+    response = await api_client.get(
+        "/entitlements?in(status,(new,active,terminated))",
+        headers={"Authorization": f"Bearer {gcp_jwt_token}"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "The RQL expression has too many values in a list (3), the maximum allowed is 2."
+    )
+
+
 async def test_get_all_entitlements_single_page_with_updated_at_filter(
     entitlement_gcp: Entitlement,
     api_client: AsyncClient,
@@ -1046,3 +1069,34 @@ async def test_delete_deleted_entitlement_by_affiliate(
 
     response = await affiliate_client.delete(f"/entitlements/{entitlement.id}")
     assert response.status_code == 404
+
+
+async def test_create_entitlement_without_refresh_saves_queries(
+    mocker: MockerFixture,
+    api_client: AsyncClient,
+    gcp_jwt_token: str,
+    capsqlalchemy: SQLAlchemyCapturer,
+):
+    responses = {}
+    num_queries = {}
+
+    for refresh_on_save in (True, False):
+        mocker.patch.object(EntitlementHandler, "refresh_on_save", refresh_on_save)
+        with capsqlalchemy:
+            response = await api_client.post(
+                "/entitlements",
+                headers={"Authorization": f"Bearer {gcp_jwt_token}"},
+                json={
+                    "name": "AWS",
+                    "affiliate_external_id": f"EXTERNAL_ID_{refresh_on_save}",
+                    "datasource_id": "ds-id",
+                },
+            )
+            num_queries[refresh_on_save] = len(capsqlalchemy.captured_expressions)
+
+        assert response.status_code == 201
+        responses[refresh_on_save] = response.json()
+
+    assert num_queries[False] < num_queries[True]
+    assert responses[False].keys() == responses[True].keys()
+    assert responses[False]["events"]["created"]["by"] == responses[True]["events"]["created"]["by"]
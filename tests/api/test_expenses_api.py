@@ -430,3 +430,42 @@ async def test_get_all_expenses_with_expenses_filter(
     ret = response.json()
     assert ret["total"] == 1
     assert ret["items"][0]["id"] == str(expense.id)
+
+
+@pytest.mark.parametrize(
+    ("rql_filter", "expected_days"),
+    [
+        ("eq(date,2025-04-20)", [20]),
+        ("and(gte(date,2025-04-10),lt(date,2025-05-01))", [20, 10]),
+        ("gt(date,2025-04-25)", [2]),
+    ],
+)
+async def test_get_all_expenses_with_date_filter(
+    datasource_expense_factory: ModelFactory[DatasourceExpense],
+    api_client: AsyncClient,
+    ffc_jwt_token: str,
+    faker: Faker,
+    get_organization,
+    rql_filter: str,
+    expected_days: list[int],
+):
+    for month, day in ((4, 10), (4, 20), (5, 2)):
+        await datasource_expense_factory(
+            organization=get_organization,
+            datasource_id="11111111",
+            year=2025,
+            month=month,
+            day=day,
+            updated_at=datetime(2025, month, day, 10, 0, 0, tzinfo=UTC),
+        )
+
+    response = await api_client.get(
+        f"/expenses?{rql_filter}", headers={"Authorization": f"Bearer {ffc_jwt_token}"}
+    )
+
+    assert response.status_code == 200
+    ret = response.json()
+    assert ret["total"] == len(expected_days)
+    assert [item["day"] for item in ret["items"]] == expected_days
+    for item in ret["items"]:
+        assert item["date"] == f"2025-{item['month']:02d}-{item['day']:02d}"
@@ -5,9 +5,12 @@ from typing import Literal
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from pytest_capsqlalchemy import SQLAlchemyCapturer
+from pytest_mock import MockerFixture
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.handlers import SystemHandler
 from app.db.models import Account, System
 from app.enums import AccountType, SystemStatus
 from tests.conftest import ModelFactory
@@ -1177,3 +1180,30 @@ async def test_create_system_duplicate_external_id_with_deleted(
         assert response_data["external_id"] == "existing_external_id"
         assert created_system.external_id == "existing_external_id"
         assert "jwt_secret" in response_data
+
+
+async def test_update_system_without_refresh_saves_queries(
+    mocker: MockerFixture,
+    ffc_extension: System,
+    system_factory: ModelFactory[System],
+    system_jwt_token_factory: Callable[[System], str],
+    api_client: AsyncClient,
+    capsqlalchemy: SQLAlchemyCapturer,
+):
+    system = await system_factory(name="initial_name", status=SystemStatus.ACTIVE)
+    num_queries = {}
+
+    for refresh_on_save in (True, False):
+        mocker.patch.object(SystemHandler, "refresh_on_save", refresh_on_save)
+        with capsqlalchemy:
+            response = await api_client.put(
+                f"/systems/{system.id}",
+                headers={"Authorization": f"Bearer {system_jwt_token_factory(ffc_extension)}"},
+                json={"name": f"name_{refresh_on_save}"},
+            )
+            num_queries[refresh_on_save] = len(capsqlalchemy.captured_expressions)
+
+        assert response.status_code == 200
+        assert response.json()["name"] == f"name_{refresh_on_save}"
+
+    assert num_queries[False] < num_queries[True]
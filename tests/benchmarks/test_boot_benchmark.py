@@ -0,0 +1,46 @@
+from collections.abc import Callable
+
+import pytest
+
+from tests.benchmarks.utils import format_report, measure_in_new_interpreter
+
+# What app.telemetry imported before the exporters and instrumentors were loaded lazily
+EAGER_TELEMETRY_IMPORTS = [
+    "azure.monitor.opentelemetry.exporter",
+    "opentelemetry.exporter.otlp.proto.http.metric_exporter",
+    "opentelemetry.exporter.otlp.proto.http.trace_exporter",
+    "opentelemetry.instrumentation.fastapi",
+    "opentelemetry.instrumentation.httpx",
+    "opentelemetry.instrumentation.logging",
+    "opentelemetry.instrumentation.sqlalchemy",
+]
+
+# Import of the app and startup of its lifespan, as done by each worker, with the default
+# (Jaeger) exporter
+WORKER_BOOT = """
+import asyncio
+from app.main import app
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(boot())
+"""
+
+
+@pytest.mark.benchmark
+def test_worker_boot_time(benchmark_report: Callable[[str], None]):
+    eager_imports = "\n".join(f"import {module}" for module in EAGER_TELEMETRY_IMPORTS)
+    before = measure_in_new_interpreter(f"{eager_imports}\n{WORKER_BOOT}")
+    after = measure_in_new_interpreter(WORKER_BOOT)
+
+    benchmark_report(
+        format_report(
+            "API worker boot (eager -> lazy telemetry imports)",
+            {"import + lifespan": (before, after)},
+            unit="ms",
+        )
+    )
+
+    assert after < before
@@ -0,0 +1,38 @@
+from collections.abc import Callable
+
+import pytest
+
+from tests.benchmarks.utils import format_report, measure_in_new_interpreter
+
+COMMANDS = [
+    "calculate_accounts_stats",
+    "check_expired_invitations",
+    "cleanup_obsolete_datasource_expenses",
+    "create_operations_account",
+    "fetch_datasource_expenses",
+    "invite_user",
+    "openapi",
+    "redeem_entitlements",
+    "serve",
+    "shell",
+]
+
+
+@pytest.mark.benchmark
+def test_cli_import_time(benchmark_report: Callable[[str], None]):
+    all_commands = "; ".join(f"import app.commands.{command}" for command in COMMANDS)
+    # Importing all the commands is what the CLI did before running any of them
+    before = measure_in_new_interpreter(f"import app.cli; {all_commands}")
+    after = measure_in_new_interpreter(
+        "import app.cli; import app.commands.check_expired_invitations"
+    )
+
+    benchmark_report(
+        format_report(
+            "ffcops check-expired-invitations (eager -> lazy command imports)",
+            {"import time": (before, after)},
+            unit="ms",
+        )
+    )
+
+    assert after < before
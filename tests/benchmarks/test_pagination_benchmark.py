@@ -0,0 +1,65 @@
+from collections.abc import Callable
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.pagination import LimitOffsetPage, LimitOffsetParams, PageResponse
+from app.schemas.core import convert_model_to_schema
+from app.schemas.expenses import DatasourceExpenseRead
+from tests.benchmarks.test_serializers_benchmark import PAGE_SIZE, build_expenses_page
+from tests.benchmarks.utils import format_report, measure_per_call
+
+
+@pytest.mark.benchmark
+async def test_page_response_encoding_overhead(
+    fastapi_app: FastAPI, benchmark_report: Callable[[str], None]
+):
+    page = LimitOffsetPage[DatasourceExpenseRead].create(
+        [convert_model_to_schema(DatasourceExpenseRead, item) for item in build_expenses_page()],
+        params=LimitOffsetParams(limit=PAGE_SIZE, offset=0),
+        total=PAGE_SIZE,
+    )
+    [route] = [
+        route
+        for route in fastapi_app.routes
+        if isinstance(route, APIRoute)
+        and route.path_format == "/expenses"
+        and "GET" in route.methods
+    ]
+
+    def encode_with_response_model() -> bytes:
+        # What FastAPI does with the page returned by an endpoint (see `serialize_response`)
+        value, errors = route.response_field.validate(page, {}, loc=("response",))
+        assert not errors
+        content = route.response_field.serialize(
+            value, exclude_none=route.response_model_exclude_none
+        )
+        return JSONResponse(content).body
+
+    assert (
+        encode_with_response_model()
+        == JSONResponse(
+            await serialize_response(
+                field=route.response_field,
+                response_content=page,
+                exclude_none=route.response_model_exclude_none,
+            )
+        ).body
+    )
+    assert PageResponse(page).body == encode_with_response_model()
+
+    # The times are measured for a whole page, in milliseconds
+    before = measure_per_call(encode_with_response_model, number=5) / 1000
+    after = measure_per_call(lambda: PageResponse(page).body, number=5) / 1000
+
+    benchmark_report(
+        format_report(
+            f"LimitOffsetPage[DatasourceExpenseRead] of {PAGE_SIZE} rows",
+            {"encoding": (before, after)},
+            unit="ms",
+        )
+    )
+
+    assert after < before
@@ -0,0 +1,43 @@
+from collections.abc import Callable
+
+import pytest
+from requela import ModelRQLRules
+
+from app.rql import EntitlementRules, RQLQueryCache, UserRules
+from tests.benchmarks.utils import format_report, measure_per_call
+
+EXPRESSIONS: dict[type[ModelRQLRules], str] = {
+    EntitlementRules: (
+        "and(eq(owner.id,FACC-1234-5678),in(status,(new,active)),"
+        "or(ilike(name,*AWS*),ilike(name,*Azure*)),"
+        "gte(events.created.at,2025-01-01T00:00:00+00:00),"
+        "eq(events.redeemed.by.operations_external_id,AGR-1234))"
+    ),
+    UserRules: (
+        "and(ne(status,deleted),or(ilike(email,*@softwareone.com),ilike(name,*Peter*)),"
+        "eq(events.created.by.type,system),lt(events.updated.at,2025-06-01T00:00:00+00:00))"
+    ),
+}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("rules_cls", EXPRESSIONS.keys())
+def test_rql_parse_overhead(
+    rules_cls: type[ModelRQLRules], benchmark_report: Callable[[str], None]
+):
+    rules = rules_cls()
+    expression = EXPRESSIONS[rules_cls]
+    cache = RQLQueryCache()
+
+    before = measure_per_call(lambda: rules.build_query(expression))
+    after = measure_per_call(lambda: cache.build_query(rules, expression))
+
+    benchmark_report(
+        format_report(
+            f"{rules_cls.__name__} complex expression",
+            {"build query": (before, after)},
+        )
+    )
+
+    assert cache.hit_rate > 0.99
+    assert after * 10 < before
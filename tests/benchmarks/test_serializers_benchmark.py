@@ -0,0 +1,168 @@
+from collections.abc import Callable
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from app.db.models import Account, Base, DatasourceExpense, Entitlement, Organization, System
+from app.enums import (
+    AccountType,
+    ActorType,
+    DatasourceType,
+    EntitlementStatus,
+    OrganizationStatus,
+    SystemStatus,
+)
+from app.schemas.core import AuditFieldSchema, get_model_serializer, resolve_field_type
+from app.schemas.entitlements import EntitlementRead
+from app.schemas.expenses import DatasourceExpenseRead
+from tests.benchmarks.utils import format_report, measure_per_call
+
+PAGE_SIZE = 1000
+
+
+def convert_without_compiling(schema_cls: type[BaseModel], db_model: Base) -> BaseModel:
+    # How the models were converted before the serializers were compiled: walking the
+    # fields of the schemas for every row and building each nested schema separately
+    schema_data = {
+        field_name: getattr(db_model, field_name)
+        for field_name in schema_cls.model_fields.keys()
+        if hasattr(db_model, field_name)
+    }
+    if "events" not in schema_cls.model_fields:
+        return schema_cls(**schema_data)
+
+    events_schema_cls: Any = schema_cls.model_fields["events"].annotation
+    events = {}
+    for field_name, field_info in events_schema_cls.model_fields.items():
+        event_field_schema_cls: Any = resolve_field_type(field_info.annotation)
+        assert issubclass(event_field_schema_cls, AuditFieldSchema)
+
+        at_value = getattr(db_model, f"{field_name}_at", None)
+        by_value = getattr(db_model, f"{field_name}_by", None)
+        events[field_name] = event_field_schema_cls(at=at_value, by=by_value) if at_value else None
+
+    schema_data.pop("events", None)
+    return schema_cls(**schema_data, events=events_schema_cls(**events))
+
+
+def build_entitlements_page() -> list[Entitlement]:
+    owner = Account(id="FACC-1234-5678", name="Affiliate", type=AccountType.AFFILIATE)
+    actor = System(
+        id="FTKN-1234-5678",
+        name="Extension",
+        type=ActorType.SYSTEM,
+        status=SystemStatus.ACTIVE,
+    )
+    organization = Organization(
+        id="FORG-1234-5678-9012",
+        name="Organization",
+        operations_external_id="AGR-1234",
+        status=OrganizationStatus.ACTIVE,
+    )
+    now = datetime.now(UTC)
+
+    return [
+        Entitlement(
+            id=f"FENT-0000-0000-{i:04}",
+            name=f"Entitlement {i}",
+            affiliate_external_id=f"SUB-{i}",
+            datasource_id=f"datasource-{i}",
+            status=EntitlementStatus.ACTIVE,
+            owner=owner,
+            created_at=now,
+            updated_at=now,
+            created_by=actor,
+            updated_by=actor,
+            redeemed_at=now,
+            redeemed_by=organization,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def build_expenses_page() -> list[DatasourceExpense]:
+    organization = Organization(
+        id="FORG-1234-5678-9012", name="Organization", operations_external_id="AGR-1234"
+    )
+    now = datetime.now(UTC)
+
+    return [
+        DatasourceExpense(
+            id=f"FDSX-0000-0000-{i:04}",
+            datasource_id=f"datasource-{i}",
+            linked_datasource_id=f"linked-datasource-{i}",
+            linked_datasource_type=DatasourceType.AWS_CNR,
+            datasource_name=f"Datasource {i}",
+            organization=organization,
+            year=2025,
+            month=3,
+            day=1,
+            date=date(2025, 3, 1),
+            expenses=Decimal("12.3400"),
+            total_expenses=Decimal("123.4000"),
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    ("schema_cls", "build_page"),
+    [
+        (EntitlementRead, build_entitlements_page),
+        (DatasourceExpenseRead, build_expenses_page),
+    ],
+)
+def test_serialize_page_overhead(
+    schema_cls: type[BaseModel],
+    build_page: Any,
+    benchmark_report: Callable[[str], None],
+):
+    page = build_page()
+    serializer = get_model_serializer(type(page[0]), schema_cls)
+
+    assert [serializer.to_schema(item) for item in page] == [
+        convert_without_compiling(schema_cls, item) for item in page
+    ]
+
+    # The times are measured for a whole page, in milliseconds
+    before = {
+        "schemas": measure_per_call(
+            lambda: [convert_without_compiling(schema_cls, item) for item in page], number=3
+        )
+        / 1000,
+        "dicts": measure_per_call(
+            lambda: [
+                convert_without_compiling(schema_cls, item).model_dump(
+                    mode="json", exclude_none=True
+                )
+                for item in page
+            ],
+            number=3,
+        )
+        / 1000,
+    }
+    after = {
+        "schemas": measure_per_call(lambda: [serializer.to_schema(item) for item in page], number=3)
+        / 1000,
+        "dicts": measure_per_call(
+            lambda: [serializer.to_dict(item, exclude_none=True) for item in page], number=3
+        )
+        / 1000,
+    }
+
+    benchmark_report(
+        format_report(
+            f"{schema_cls.__name__} page of {PAGE_SIZE} rows",
+            {name: (before[name], after[name]) for name in after},
+            unit="ms",
+        )
+    )
+
+    assert after["schemas"] < before["schemas"]
+    assert after["dicts"] < before["dicts"]
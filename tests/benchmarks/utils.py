@@ -0,0 +1,45 @@
+import subprocess
+import sys
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+
+def measure_per_call(func: Callable[[], Any], number: int = 200, repeat: int = 3) -> float:
+    """
+    Returns the best time, in microseconds, taken by a single call of `func`.
+    """
+    func()  # warm up
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return best / number * 1_000_000
+
+
+def format_report(title: str, results: dict[str, tuple[float, float]], unit: str = "us") -> str:
+    """
+    Formats the measures (by default per-call times in microseconds) taken before and after
+    an optimization.
+    """
+    lines = [title]
+    for name, (before, after) in results.items():
+        lines.append(
+            f"  {name:<40} {before:>10.2f}{unit} -> {after:>8.2f}{unit}  ({before / after:>6.1f}x)"
+        )
+
+    return "\n".join(lines)
+
+
+def measure_in_new_interpreter(code: str) -> float:
+    """
+    Returns the time, in milliseconds, taken by running the given code in a new interpreter,
+    e.g. to measure imports as the modules imported by the tests are already cached.
+    """
+    script = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.splitlines()[-1])
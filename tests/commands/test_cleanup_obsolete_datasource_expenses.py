@@ -1,5 +1,5 @@
 import logging
-from datetime import UTC, datetime, timedelta
+from datetime import date
 
 import pytest
 import time_machine
@@ -12,6 +12,7 @@ from app.cli import app
 from app.commands import cleanup_obsolete_datasource_expenses
 from app.conf import Settings
 from app.db.models import DatasourceExpense, Organization
+from app.db.partitioning import create_monthly_partitions, list_monthly_partitions
 from tests.types import ModelFactory
 
 
@@ -26,9 +27,7 @@ async def test_command_no_datasource_expenses(
     num_ds_expenses_in_db = await db_session.scalar(select(func.count(DatasourceExpense.id)))
     assert num_ds_expenses_in_db == 0
 
-    assert caplog.messages == [
-        "Fetching obsolete datasource expenses from the database",
-        "Found 0 obsolete datasource expenses to delete",
+    assert caplog.messages[1:] == [
         "No obsolete datasource expenses to delete",
     ]
 
@@ -41,14 +40,14 @@ async def test_command_only_new_datasource_expenses(
     organization_factory: ModelFactory[Organization],
     datasource_expense_factory: ModelFactory[DatasourceExpense],
 ):
+    await create_monthly_partitions(db_session, DatasourceExpense, date(2024, 10, 1), 7)
+
     org1 = await organization_factory(operations_external_id="org1")
-    await datasource_expense_factory(organization=org1)
-    await datasource_expense_factory(
-        organization=org1, created_at=datetime.now(UTC) - timedelta(days=100)
-    )
+    await datasource_expense_factory(organization=org1, year=2025, month=3)
+    await datasource_expense_factory(organization=org1, year=2024, month=10)
 
     org2 = await organization_factory(operations_external_id="org2")
-    await datasource_expense_factory(organization=org2)
+    await datasource_expense_factory(organization=org2, year=2025, month=4)
 
     num_ds_expenses_in_db = await db_session.scalar(select(func.count(DatasourceExpense.id)))
     assert num_ds_expenses_in_db == 3
@@ -57,13 +56,13 @@ async def test_command_only_new_datasource_expenses(
         await cleanup_obsolete_datasource_expenses.main(test_settings)
 
     assert caplog.messages == [
-        "Fetching obsolete datasource expenses from the database",
-        "Found 0 obsolete datasource expenses to delete",
+        "Removing datasource expenses partitions older than 2024-10-01",
         "No obsolete datasource expenses to delete",
     ]
 
     num_ds_expenses_in_db = await db_session.scalar(select(func.count(DatasourceExpense.id)))
     assert num_ds_expenses_in_db == 3
+    assert len(await list_monthly_partitions(db_session, DatasourceExpense)) == 7
 
 
 @time_machine.travel("2025-04-01T10:00:00Z", tick=False)
@@ -78,37 +77,19 @@ async def test_command_delete_only_old_datasource_expenses(
     mocked_send_info = mocker.patch(
         "app.commands.cleanup_obsolete_datasource_expenses.send_info",
     )
+    await create_monthly_partitions(db_session, DatasourceExpense, date(2024, 8, 1), 9)
+
     org1 = await organization_factory(operations_external_id="org1")
-    await datasource_expense_factory(
-        organization=org1,
-        created_at=datetime.now(UTC) - timedelta(days=365),
-    )
-    await datasource_expense_factory(
-        organization=org1,
-        created_at=datetime.now(UTC) - timedelta(days=250),
-    )
-    await datasource_expense_factory(
-        organization=org1,
-        created_at=datetime.now(UTC) - timedelta(days=100),
-    )
-    await datasource_expense_factory(
-        organization=org1,
-        created_at=datetime.now(UTC) - timedelta(days=10),
-    )
+    await datasource_expense_factory(organization=org1, year=2024, month=8)
+    await datasource_expense_factory(organization=org1, year=2024, month=8, day=2)
+    await datasource_expense_factory(organization=org1, year=2024, month=10)
+    await datasource_expense_factory(organization=org1, year=2025, month=3)
 
     org2 = await organization_factory(operations_external_id="org2")
-    await datasource_expense_factory(
-        organization=org2,
-        created_at=datetime.now(UTC) - timedelta(days=1000),
-    )
-    await datasource_expense_factory(
-        organization=org2,
-        created_at=datetime.now(UTC) - timedelta(days=10),
-    )
-    await datasource_expense_factory(
-        organization=org2,
-        created_at=datetime.now(UTC),
-    )
+    # expenses of a month without partition are stored in the default one
+    await datasource_expense_factory(organization=org2, year=2022, month=1)
+    await datasource_expense_factory(organization=org2, year=2024, month=9)
+    await datasource_expense_factory(organization=org2, year=2025, month=4)
 
     num_ds_expenses_in_db = await db_session.scalar(select(func.count(DatasourceExpense.id)))
     assert num_ds_expenses_in_db == 7
@@ -117,18 +98,54 @@ async def test_command_delete_only_old_datasource_expenses(
         await cleanup_obsolete_datasource_expenses.main(test_settings)
 
     assert caplog.messages == [
-        "Fetching obsolete datasource expenses from the database",
-        "Found 3 obsolete datasource expenses to delete",
-        "Deleting 3 obsolete datasource expenses from the database",
-        "3 obsolete (older than 2024-10-01T10:00:00+00:00) datasource expenses have been deleted.",
+        "Removing datasource expenses partitions older than 2024-10-01",
+        "Deleted datasource_expenses_y2024m08 containing 2 datasource expenses",
+        "Deleted datasource_expenses_y2024m09 containing 1 datasource expenses",
+        "Deleted datasource_expenses_default containing 1 datasource expenses",
+        "4 obsolete (older than 2024-10-01) datasource expenses have been deleted.",
     ]
     mocked_send_info.assert_awaited_once_with(
         "Cleanup Obsolete Datasource Expenses Success",
-        "3 obsolete (older than 2024-10-01T10:00:00+00:00) datasource expenses have been deleted.",
+        "4 obsolete (older than 2024-10-01) datasource expenses have been deleted.",
     )
 
     num_ds_expenses_in_db = await db_session.scalar(select(func.count(DatasourceExpense.id)))
-    assert num_ds_expenses_in_db == 4
+    assert num_ds_expenses_in_db == 3
+
+    partitions = await list_monthly_partitions(db_session, DatasourceExpense)
+    assert partitions[0] == (2024, 10)
+    assert not await db_session.scalar(select(func.to_regclass("datasource_expenses_y2024m08")))
+
+
+@time_machine.travel("2025-04-01T10:00:00Z", tick=False)
+async def test_command_detach_only_old_datasource_expenses(
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+    db_session: AsyncSession,
+    test_settings: Settings,
+    organization_factory: ModelFactory[Organization],
+    datasource_expense_factory: ModelFactory[DatasourceExpense],
+):
+    mocker.patch("app.commands.cleanup_obsolete_datasource_expenses.send_info")
+    await create_monthly_partitions(db_session, DatasourceExpense, date(2024, 9, 1), 2)
+
+    organization = await organization_factory(operations_external_id="org1")
+    await datasource_expense_factory(organization=organization, year=2024, month=9)
+    await datasource_expense_factory(organization=organization, year=2024, month=10)
+
+    with caplog.at_level(logging.INFO):
+        await cleanup_obsolete_datasource_expenses.main(test_settings, detach_only=True)
+
+    assert caplog.messages[-1] == (
+        "1 obsolete (older than 2024-10-01) datasource expenses have been detached."
+    )
+
+    num_ds_expenses_in_db = await db_session.scalar(select(func.count(DatasourceExpense.id)))
+    assert num_ds_expenses_in_db == 1
+    assert await list_monthly_partitions(db_session, DatasourceExpense) == [(2024, 10)]
+
+    # the detached partition is kept as a standalone table
+    assert await db_session.scalar(select(func.to_regclass("datasource_expenses_y2024m09")))
 
 
 def test_command(mocker: MockerFixture, test_settings: Settings):
@@ -143,4 +160,4 @@ def test_command(mocker: MockerFixture, test_settings: Settings):
     assert result.exit_code == 0
     mock_run.assert_called_once_with(mock_check_coro)
 
-    mock_check.assert_called_once_with(test_settings)
+    mock_check.assert_called_once_with(test_settings, False)
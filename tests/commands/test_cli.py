@@ -0,0 +1,79 @@
+import subprocess
+import sys
+
+import pytest
+from pytest_mock import MockerFixture
+from typer.testing import CliRunner
+
+from app.cli import app
+
+COMMANDS = [
+    "calculate-accounts-stats",
+    "check-expired-invitations",
+    "cleanup-obsolete-datasource-expenses",
+    "create-operations-account",
+    "fetch-datasource-expenses",
+    "invite-user",
+    "openapi",
+    "redeem-entitlements",
+    "serve",
+    "shell",
+]
+
+
+def test_commands_are_listed():
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["--help"])
+
+    assert result.exit_code == 0
+    for command in COMMANDS:
+        assert command in result.output
+
+
+def test_unknown_command():
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["unknown"])
+
+    assert result.exit_code == 2
+    assert "No such command 'unknown'" in result.output
+
+
+def test_commands_are_imported_lazily():
+    code = (
+        "import sys\n"
+        "import app.cli\n"
+        "print(','.join(name for name in sys.modules if name.startswith('app.commands.')))\n"
+        "print('app.main' in sys.modules, 'IPython' in sys.modules, 'pyfiglet' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+
+    assert output.splitlines() == ["", "False False False"]
+
+
+@pytest.mark.parametrize(
+    ("args", "isatty", "shown"),
+    [
+        ([], True, True),
+        (["--no-banner"], True, False),
+        (["--run-report", "-"], True, False),
+        ([], False, False),
+    ],
+)
+def test_banner(mocker: MockerFixture, args: list[str], isatty: bool, shown: bool):
+    mocked_show_banner = mocker.patch("app.cli.show_banner")
+    mocked_sys = mocker.patch("app.cli.sys")
+    mocked_sys.stdout.isatty.return_value = isatty
+    mocker.patch(
+        "app.commands.check_expired_invitations.check_expired_invitations", mocker.MagicMock()
+    )
+    mocker.patch("app.commands.check_expired_invitations.asyncio.run")
+    runner = CliRunner()
+
+    result = runner.invoke(app, [*args, "check-expired-invitations"])
+
+    assert result.exit_code == 0
+    assert mocked_show_banner.called is shown
@@ -6,6 +6,7 @@ from decimal import Decimal
 import pytest
 import time_machine
 from fastapi import status
+from pytest_capsqlalchemy import SQLAlchemyCapturer
 from pytest_httpx import HTTPXMock
 from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -904,6 +905,71 @@ async def test_multiple_datasources_are_handled_correctly(
     }
 
 
+async def test_store_datasource_expenses_in_bulk(
+    mocker: MockerFixture,
+    db_session: AsyncSession,
+    organization_factory: ModelFactory[Organization],
+    datasource_expense_factory: ModelFactory[DatasourceExpense],
+    capsqlalchemy: SQLAlchemyCapturer,
+):
+    mocker.patch("app.commands.fetch_datasource_expenses.send_info")
+    organization = await organization_factory()
+    await datasource_expense_factory(
+        organization=organization,
+        datasource_id="datasource-0",
+        linked_datasource_type=DatasourceType.AWS_CNR,
+        year=2025,
+        month=3,
+        day=20,
+        total_expenses=1,
+    )
+    await datasource_expense_factory(
+        organization=organization,
+        datasource_id="datasource-1",
+        linked_datasource_type=DatasourceType.UNKNOWN,
+        year=2025,
+        month=3,
+        day=20,
+        total_expenses=1,
+    )
+    datasources = [
+        {
+            "id": f"linked-datasource-{i}",
+            "account_id": f"datasource-{i}",
+            "name": f"Datasource {i}",
+            "type": DatasourceType.AWS_CNR.value,
+            "details": {"cost": 100 + i},
+        }
+        for i in range(5)
+    ]
+
+    with capsqlalchemy:
+        await fetch_datasource_expenses.store_datasource_expenses(
+            DatasourceExpenseHandler(db_session),
+            {organization.id: datasources},
+            year=2025,
+            month=3,
+            day=20,
+        )
+
+        # The existing rows are fetched and updated, the ids of the missing ones allocated
+        # and the rows created, whatever the number of datasources
+        capsqlalchemy.assert_query_count(4)
+
+    db_session.expunge_all()
+    datasource_expenses = await DatasourceExpenseHandler(db_session).query_db(
+        where_clauses=[DatasourceExpense.organization_id == organization.id]
+    )
+    assert sorted(
+        (
+            datasource_expense.datasource_id,
+            datasource_expense.linked_datasource_type,
+            datasource_expense.total_expenses,
+        )
+        for datasource_expense in datasource_expenses
+    ) == [(f"datasource-{i}", DatasourceType.AWS_CNR, Decimal(100 + i)) for i in range(5)]
+
+
 def test_cli_command(mocker: MockerFixture):
     mock_command_coro = mocker.MagicMock()
     mock_command = mocker.MagicMock(return_value=mock_command_coro)
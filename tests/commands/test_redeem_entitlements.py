@@ -1,3 +1,6 @@
+import pathlib
+import time
+from collections.abc import Coroutine
 from datetime import UTC, datetime
 
 import pytest
@@ -71,6 +74,8 @@ async def test_redeeem_entitlements(
     mocked_send_info = mocker.patch(
         "app.commands.redeem_entitlements.send_info",
     )
+    mocker.patch("app.telemetry._run_report_path", "report.json")
+    mocked_write_run_report = mocker.patch("app.telemetry.write_run_report")
 
     await redeem_entitlements(test_settings)
 
@@ -114,6 +119,12 @@ async def test_redeeem_entitlements(
     )
     assert len(mocked_send_info.await_args.kwargs["details"].rows) == 3
 
+    report = mocked_write_run_report.call_args.args[0]
+    assert report.command == "Redeem Entitlements"
+    assert report.status == "success"
+    assert report.phases.keys() == {"fetch", "store"}
+    assert report.items == {"organizations": 1, "entitlements": 3}
+
 
 async def test_redeeem_entitlements_error_fetching_datasources(
     mocker: MockerFixture,
@@ -207,3 +218,30 @@ def test_redeem_entitlements_command(
     mock_redeem_entitlements.assert_called_once_with(
         test_settings,
     )
+
+
+def test_redeem_entitlements_command_run_report(mocker: MockerFixture):
+    mocker.patch("app.commands.redeem_entitlements.redeem_entitlements", mocker.MagicMock())
+    mocker.patch("app.commands.redeem_entitlements.asyncio.run")
+    mocked_set_run_report_path = mocker.patch("app.cli.set_run_report_path")
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["--run-report", "-", "redeem-entitlements"])
+
+    assert result.exit_code == 0
+    mocked_set_run_report_path.assert_called_once_with("-")
+
+
+def test_redeem_entitlements_command_profile(mocker: MockerFixture, tmp_path: pathlib.Path):
+    def run_command(coro: Coroutine) -> None:
+        coro.close()
+        time.sleep(0.1)
+
+    mocker.patch("app.commands.redeem_entitlements.asyncio.run", side_effect=run_command)
+    output_path = tmp_path / "profile.folded"
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["--profile", str(output_path), "redeem-entitlements"])
+
+    assert result.exit_code == 0
+    assert "run_command" in output_path.read_text()
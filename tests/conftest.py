@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.conf import Settings, get_settings
+from app.db.actor_references import actor_references_cache
 from app.db.base import configure_db_engine, session_factory
 from app.db.models import (
     Account,
@@ -48,6 +49,39 @@ pytest_plugins = [
 ]
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-query-plans",
+        action="store_true",
+        default=False,
+        help="Record the baselines of the query plans tests instead of checking them.",
+    )
+    parser.addoption(
+        "--benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the benchmarks (the tests marked with `benchmark`) and report their measures.",
+    )
+
+
+BENCHMARK_REPORTS = pytest.StashKey[list[str]]()
+
+
+@pytest.fixture
+def benchmark_report(request: pytest.FixtureRequest) -> Callable[[str], None]:
+    """
+    Collects the reports of the benchmarks, they're printed at the end of the test session.
+    """
+    return request.config.stash.setdefault(BENCHMARK_REPORTS, []).append
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    reports = config.stash.get(BENCHMARK_REPORTS, [])
+    if reports:
+        terminalreporter.write_sep("=", "benchmarks")
+        terminalreporter.write_line("\n\n".join(reports))
+
+
 @pytest.fixture(scope="session", autouse=True)
 def skip_logging_setup() -> Generator:
     from unittest.mock import patch
@@ -56,7 +90,19 @@ def skip_logging_setup() -> Generator:
         yield
 
 
-def pytest_collection_modifyitems(items):
+@pytest.fixture(autouse=True)
+def clear_actor_references_cache() -> Generator:
+    # The actors are rolled back after each test, while the cache would outlive them
+    yield
+    actor_references_cache.clear()
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if not config.getoption("--benchmarks"):
+        skip_benchmark_marker = pytest.mark.skip(reason="the benchmarks run with --benchmarks")
+        for benchmark in (item for item in items if item.get_closest_marker("benchmark")):
+            benchmark.add_marker(skip_benchmark_marker)
+
     pytest_asyncio_tests = (item for item in items if is_async_test(item))
     session_scope_marker = pytest.mark.asyncio(loop_scope="session")
     for async_test in pytest_asyncio_tests:
@@ -0,0 +1,171 @@
+from pytest_capsqlalchemy import SQLAlchemyCapturer
+from pytest_capsqlalchemy.expression import SQLExpressionType
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.actor_references import (
+    ActorReferenceCache,
+    ActorReferenceData,
+    actor_references_cache,
+    get_actor_relationships,
+    get_related_actor,
+    get_request_actor_references,
+)
+from app.db.handlers import AccountHandler, EntitlementHandler, SystemHandler
+from app.db.models import Account, Entitlement, System, User
+from app.enums import ActorType
+from tests.types import ModelFactory
+
+
+def get_actor_selects(capsqlalchemy: SQLAlchemyCapturer) -> list[str]:
+    return [
+        str(expression.executable)
+        for expression in capsqlalchemy.captured_expressions
+        if expression.type == SQLExpressionType.SELECT
+        and "FROM actors" in str(expression.executable)
+    ]
+
+
+def test_actor_reference_cache_expires_entries(mocker: MockerFixture):
+    monotonic = mocker.patch("app.db.actor_references.time.monotonic", return_value=100)
+    cache = ActorReferenceCache(ttl_seconds=10)
+    reference = ActorReferenceData(id="FUSR-1234-5678", name="Peter", type=ActorType.USER)
+    cache.set_many([reference])
+
+    monotonic.return_value = 109
+    assert cache.get_many(["FUSR-1234-5678", "FUSR-0000-0000"]) == {"FUSR-1234-5678": reference}
+
+    monotonic.return_value = 110
+    assert cache.get_many(["FUSR-1234-5678"]) == {}
+
+
+def test_actor_reference_cache_evicts_oldest_entries():
+    cache = ActorReferenceCache(max_size=2)
+    references = [
+        ActorReferenceData(id=f"FUSR-0000-000{i}", name=f"User {i}", type=ActorType.USER)
+        for i in range(3)
+    ]
+    cache.set_many(references)
+
+    assert cache.get_many(reference.id for reference in references) == {
+        reference.id: reference for reference in references[1:]
+    }
+
+
+def test_actor_reference_cache_disabled():
+    cache = ActorReferenceCache(ttl_seconds=0)
+    cache.set_many([ActorReferenceData(id="FUSR-1234-5678", name="Peter", type=ActorType.USER)])
+
+    assert cache.get_many(["FUSR-1234-5678"]) == {}
+
+
+def test_get_actor_relationships():
+    assert get_actor_relationships(Entitlement) == {
+        "created_by": "created_by_id",
+        "updated_by": "updated_by_id",
+        "deleted_by": "deleted_by_id",
+        "terminated_by": "terminated_by_id",
+    }
+    assert get_actor_relationships(User) == {
+        "created_by": "created_by_id",
+        "updated_by": "updated_by_id",
+        "deleted_by": "deleted_by_id",
+    }
+
+
+async def test_list_loads_actor_references_with_one_query(
+    db_session: AsyncSession,
+    capsqlalchemy: SQLAlchemyCapturer,
+    entitlement_factory: ModelFactory[Entitlement],
+    ffc_extension: System,
+    gcp_extension: System,
+):
+    await entitlement_factory(created_by=ffc_extension, updated_by=gcp_extension)
+    await entitlement_factory(created_by=gcp_extension, updated_by=ffc_extension)
+    db_session.expunge_all()
+
+    with capsqlalchemy:
+        entitlements = await EntitlementHandler(db_session).query_db()
+
+        # a single query for the references of all the actors
+        assert len(get_actor_selects(capsqlalchemy)) == 1
+
+    assert {
+        (
+            get_related_actor(entitlement, "created_by"),
+            get_related_actor(entitlement, "updated_by"),
+            get_related_actor(entitlement, "deleted_by"),
+        )
+        for entitlement in entitlements
+    } == {
+        (
+            ActorReferenceData(id=ffc_extension.id, name=ffc_extension.name, type=ActorType.SYSTEM),
+            ActorReferenceData(id=gcp_extension.id, name=gcp_extension.name, type=ActorType.SYSTEM),
+            None,
+        ),
+        (
+            ActorReferenceData(id=gcp_extension.id, name=gcp_extension.name, type=ActorType.SYSTEM),
+            ActorReferenceData(id=ffc_extension.id, name=ffc_extension.name, type=ActorType.SYSTEM),
+            None,
+        ),
+    }
+
+
+async def test_load_actor_references_uses_caches(
+    db_session: AsyncSession,
+    capsqlalchemy: SQLAlchemyCapturer,
+    entitlement_factory: ModelFactory[Entitlement],
+    ffc_extension: System,
+):
+    await entitlement_factory(created_by=ffc_extension, updated_by=ffc_extension)
+    db_session.expunge_all()
+    handler = EntitlementHandler(db_session)
+
+    await handler.query_db()
+    assert set(get_request_actor_references(db_session)) == {ffc_extension.id}
+    assert set(actor_references_cache.get_many([ffc_extension.id])) == {ffc_extension.id}
+
+    # cached for the request
+    with capsqlalchemy:
+        await handler.query_db()
+
+        assert get_actor_selects(capsqlalchemy) == []
+
+    # cached for the process
+    get_request_actor_references(db_session).clear()
+    with capsqlalchemy:
+        await handler.query_db()
+
+        assert get_actor_selects(capsqlalchemy) == []
+
+
+async def test_get_related_actor_returns_loaded_relationship(
+    db_session: AsyncSession,
+    entitlement_factory: ModelFactory[Entitlement],
+    ffc_extension: System,
+):
+    entitlement = await entitlement_factory(created_by=ffc_extension)
+    db_session.expunge_all()
+
+    entitlement = await EntitlementHandler(db_session).get(entitlement.id)
+
+    assert get_related_actor(entitlement, "created_by") is entitlement.created_by
+    assert isinstance(entitlement.created_by, System)
+
+
+async def test_actor_update_invalidates_reference(
+    db_session: AsyncSession,
+    account_factory: ModelFactory[Account],
+    ffc_extension: System,
+):
+    await account_factory(created_by=ffc_extension)
+    db_session.expunge_all()
+
+    await AccountHandler(db_session).query_db()
+    assert ffc_extension.id in get_request_actor_references(db_session)
+
+    system = await SystemHandler(db_session).get(ffc_extension.id)
+    await SystemHandler(db_session).update(system, {"name": "Renamed"})
+
+    assert ffc_extension.id not in get_request_actor_references(db_session)
+    assert actor_references_cache.get_many([ffc_extension.id]) == {}
@@ -1,7 +1,10 @@
 import pytest
+import sqlalchemy
+from pytest_capsqlalchemy import SQLAlchemyCapturer
+from pytest_capsqlalchemy.expression import SQLExpressionType
 from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.auth.context import AuthenticationContext
 from app.db.handlers import (
@@ -28,6 +31,11 @@ class ModelForTestsHandler(ModelHandler[ModelForTests]):
     pass
 
 
+class ModelForTestsWithParentHandler(ModelHandler[ModelForTests]):
+    default_options = (joinedload(ModelForTests.parent),)
+    list_options = (selectinload(ModelForTests.parent),)
+
+
 class ParentModelForTestsHandler(ModelHandler[ParentModelForTests]):
     pass
 
@@ -165,6 +173,74 @@ async def test_get_default_options_with_joinedload(db_session: AsyncSession):
     assert fetched_obj.parent.description == "Parent Description"
 
 
+async def test_get_reuses_cached_statement(db_session: AsyncSession):
+    parent_obj = ParentModelForTests(description="Parent Description")
+    test_obj = ModelForTests(name="With Related", parent=parent_obj)
+    db_session.add(test_obj)
+    await db_session.commit()
+    db_session.expunge_all()
+
+    handler = ModelForTestsWithParentHandler(db_session)
+    other_handler = ModelForTestsWithParentHandler(db_session)
+
+    fetched_obj = await handler.get(test_obj.id)
+    assert fetched_obj.parent.description == "Parent Description"
+
+    assert handler._get_statement() is other_handler._get_statement()
+    assert handler._select_statement() is other_handler._select_statement()
+    assert handler._get_statement() is not ModelForTestsHandler(db_session)._get_statement()
+
+
+def test_statements_not_cached_with_instance_default_options(db_session: AsyncSession):
+    handler = ModelForTestsWithParentHandler(db_session)
+    handler.default_options = []
+
+    assert handler._get_statement() is not handler._get_statement()
+    assert (
+        handler._get_statement() is not ModelForTestsWithParentHandler(db_session)._get_statement()
+    )
+
+
+def test_statements_not_cached_when_disabled(db_session: AsyncSession, mocker: MockerFixture):
+    mocker.patch.object(ModelForTestsWithParentHandler, "cache_statements", False)
+    handler = ModelForTestsWithParentHandler(db_session)
+
+    assert handler._select_statement() is not handler._select_statement()
+
+
+async def test_query_db_uses_list_options(
+    db_session: AsyncSession, capsqlalchemy: SQLAlchemyCapturer
+):
+    parent_obj = ParentModelForTests(description="Parent Description")
+    db_session.add_all(
+        [ModelForTests(name=f"Object {i}", parent=parent_obj) for i in range(3)],
+    )
+    await db_session.commit()
+    db_session.expunge_all()
+    handler = ModelForTestsWithParentHandler(db_session)
+
+    with capsqlalchemy:
+        results = await handler.query_db(order_by=[ModelForTests.name])
+
+        # the parents are loaded with a separate query
+        selects = [
+            expression
+            for expression in capsqlalchemy.captured_expressions
+            if expression.type == SQLExpressionType.SELECT
+        ]
+        assert len(selects) == 2
+
+    assert [obj.parent.description for obj in results] == ["Parent Description"] * 3
+
+    with capsqlalchemy:
+        first_obj = await handler.first(where_clauses=[ModelForTests.name == "Object 0"])
+
+        # the parent is joined
+        assert capsqlalchemy.captured_expressions[-1].type == SQLExpressionType.SELECT
+        assert "JOIN" in str(capsqlalchemy.captured_expressions[-1].executable)
+    assert first_obj is results[0]
+
+
 async def test_count_with_extra_conditions(db_session: AsyncSession):
     handler = ModelForTestsHandler(db_session)
 
@@ -342,3 +418,104 @@ async def test_deleted_by_user_id(
     assert result.status == AccountUserStatus.DELETED
     assert result.deleted_at is not None
     assert result.deleted_by_id == user_actor.id
+
+
+async def test_bulk_create(db_session: AsyncSession):
+    handler = ModelForTestsHandler(db_session)
+
+    created = await handler.bulk_create([{"name": "Bulk 1"}, {"name": "Bulk 2"}])
+
+    assert [obj.name for obj in created] == ["Bulk 1", "Bulk 2"]
+    assert all(obj.id.startswith(ModelForTests.PK_PREFIX) for obj in created)
+    assert all(obj.status == "active" for obj in created)
+    assert await handler.count() == 2
+
+
+async def test_bulk_create_empty(db_session: AsyncSession):
+    handler = ModelForTestsHandler(db_session)
+
+    assert await handler.bulk_create([]) == []
+
+
+async def test_bulk_create_constraint_violation(db_session: AsyncSession):
+    handler = ModelForTestsHandler(db_session)
+
+    with pytest.raises(ConstraintViolationError):
+        await handler.bulk_create([{"name": "Duplicate"}, {"name": "Duplicate"}])
+
+
+async def test_bulk_create_sets_audit_fields(
+    mocker: MockerFixture, db_session: AsyncSession, user_factory: ModelFactory[User]
+):
+    actor = await user_factory()
+    mock_auth_context = mocker.MagicMock(spec=AuthenticationContext)
+    mock_auth_context.get_actor.return_value = actor
+    mock_context_var = mocker.MagicMock()
+    mock_context_var.get.return_value = mock_auth_context
+    mocker.patch("app.db.handlers.auth_context", mock_context_var)
+
+    handler = DeletableAuditModelForTestsHandler(db_session)
+    created = await handler.bulk_create([{"name": "Audit 1"}, {"name": "Audit 2"}])
+
+    assert all(obj.created_by_id == actor.id for obj in created)
+    assert all(obj.updated_by_id == actor.id for obj in created)
+
+
+async def test_bulk_update(db_session: AsyncSession):
+    handler = ModelForTestsHandler(db_session)
+    obj1, obj2 = await handler.bulk_create([{"name": "Bulk 1"}, {"name": "Bulk 2"}])
+
+    await handler.bulk_update(
+        [
+            {"id": obj1.id, "status": "disabled"},
+            {"id": obj2.id, "status": "deleted"},
+        ]
+    )
+
+    db_session.expunge_all()
+    assert (await handler.get(obj1.id)).status == "disabled"
+    assert (await handler.get(obj2.id)).status == "deleted"
+
+
+async def test_bulk_upsert(db_session: AsyncSession):
+    handler = ModelForTestsHandler(db_session)
+    existing = await handler.create(ModelForTests(name="Existing"))
+
+    upserted = await handler.bulk_upsert(
+        [
+            {"name": "Existing", "status": "disabled"},
+            {"name": "New", "status": "active"},
+        ],
+        index_elements=["name"],
+    )
+
+    assert upserted[0].id == existing.id
+    assert upserted[0].status == "disabled"
+    assert upserted[1].name == "New"
+    assert upserted[1].id != existing.id
+    assert await handler.count() == 2
+
+
+async def test_create_without_refresh(
+    db_session: AsyncSession,
+    capsqlalchemy: SQLAlchemyCapturer,
+):
+    handler = DeletableModelForTestsHandler(db_session)
+
+    with capsqlalchemy:
+        obj = await handler.create(DeletableModelForTests(name="No Refresh"), refresh=False)
+
+        # no SELECT after the INSERT
+        assert capsqlalchemy.captured_expressions[-1].type == SQLExpressionType.INSERT
+    # the server default is returned by the INSERT
+    assert obj.status == DeletableModelStatus.ACTIVE
+
+
+async def test_update_without_refresh(db_session: AsyncSession):
+    handler = ModelForTestsHandler(db_session)
+    obj = await handler.create(ModelForTests(name="Before"))
+
+    updated = await handler.update(obj, {"name": "After"}, refresh=False)
+
+    assert updated.name == "After"
+    assert not sqlalchemy.inspect(updated).expired_attributes
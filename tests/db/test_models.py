@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 
 import pytest
 from pytest_mock import MockerFixture
-from sqlalchemy import select
+from sqlalchemy import event, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -86,6 +86,109 @@ async def test_id_mixin(mocker: MockerFixture, db_session: AsyncSession):
         await db_session.commit()
 
 
+async def test_id_mixin_allocates_pks_in_batch(db_session: AsyncSession):
+    statements: list[str] = []
+
+    def on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT organizations.id"):
+            statements.append(statement)
+
+    engine = db_session.bind.sync_engine  # type: ignore[union-attr]
+    event.listen(engine, "before_cursor_execute", on_before_cursor_execute)
+    try:
+        orgs = [
+            Organization(
+                name=f"Test Org {i}",
+                currency="EUR",
+                billing_currency="EUR",
+                operations_external_id=f"test-org-{i}",
+            )
+            for i in range(10)
+        ]
+        db_session.add_all(orgs)
+        await db_session.flush()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_before_cursor_execute)
+
+    assert len(statements) == 1
+    assert len({org.id for org in orgs}) == 10
+    assert all(org.id.startswith("FORG-") for org in orgs)
+
+
+async def test_id_mixin_retries_only_colliding_pks(mocker: MockerFixture, db_session: AsyncSession):
+    org = Organization(
+        name="Test Org",
+        currency="EUR",
+        billing_currency="EUR",
+        operations_external_id="test-org",
+    )
+    db_session.add(org)
+    await db_session.flush()
+
+    mocker.patch.object(
+        HumanReadablePKMixin,
+        "generate_human_readable_pk",
+        side_effect=[org.id, "FORG-1111-1111-1111", "FORG-2222-2222-2222"],
+    )
+
+    pks = await db_session.run_sync(
+        lambda session: Organization.allocate_human_readable_pks(session.connection(), 2)
+    )
+
+    assert sorted(pks) == ["FORG-1111-1111-1111", "FORG-2222-2222-2222"]
+
+
+def build_organization_rows(count: int) -> list[dict[str, str]]:
+    return [
+        {
+            "name": f"Test Org {i}",
+            "currency": "EUR",
+            "billing_currency": "EUR",
+            "operations_external_id": f"test-org-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+async def test_id_mixin_bulk_insert(db_session: AsyncSession):
+    rows = build_organization_rows(3)
+
+    await db_session.execute(insert(Organization), rows)
+
+    ids = (await db_session.scalars(select(Organization.id))).all()
+    assert len(ids) == 3
+    assert all(id.startswith("FORG-") for id in ids)
+    # The parameters of the caller are left untouched
+    assert all("id" not in row for row in rows)
+
+
+async def test_id_mixin_single_row_insert(db_session: AsyncSession):
+    [row] = build_organization_rows(1)
+
+    await db_session.execute(insert(Organization), row)
+
+    org_id = (await db_session.scalars(select(Organization.id))).one()
+    assert org_id.startswith("FORG-")
+    assert "id" not in row
+
+
+async def test_id_mixin_core_bulk_insert(db_session: AsyncSession):
+    rows = build_organization_rows(3)
+    rows[0]["id"] = "FORG-1111-1111-1111"
+    conn = await db_session.connection()
+
+    rows_with_pks = await conn.run_sync(
+        lambda sync_conn: Organization.with_human_readable_pks(sync_conn, rows)
+    )
+    await conn.execute(insert(Organization.__table__), rows_with_pks)
+
+    ids = (await db_session.scalars(select(Organization.id))).all()
+    assert len(ids) == 3
+    assert "FORG-1111-1111-1111" in ids
+    assert all(id.startswith("FORG-") for id in ids)
+    assert all("id" not in row for row in rows[1:])
+
+
 async def test_auditable_mixin(db_session: AsyncSession, ffc_extension: System):
     org = Organization(
         name="Test Org",
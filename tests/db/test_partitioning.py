@@ -0,0 +1,88 @@
+from datetime import date
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DatasourceExpense, Organization
+from app.db.partitioning import (
+    create_monthly_partitions,
+    drop_monthly_partitions_before,
+    iter_months,
+    list_monthly_partitions,
+)
+from tests.types import ModelFactory
+
+
+def test_iter_months():
+    assert iter_months(date(2024, 11, 15), 4) == [(2024, 11), (2024, 12), (2025, 1), (2025, 2)]
+
+
+def test_partition_names():
+    assert DatasourceExpense.partition_name(2025, 3) == "datasource_expenses_y2025m03"
+    assert DatasourceExpense.default_partition_name() == "datasource_expenses_default"
+
+
+async def test_create_monthly_partitions(db_session: AsyncSession):
+    assert await list_monthly_partitions(db_session, DatasourceExpense) == []
+
+    created = await create_monthly_partitions(db_session, DatasourceExpense, date(2024, 12, 31), 3)
+
+    assert created == [
+        "datasource_expenses_y2024m12",
+        "datasource_expenses_y2025m01",
+        "datasource_expenses_y2025m02",
+    ]
+    assert await list_monthly_partitions(db_session, DatasourceExpense) == [
+        (2024, 12),
+        (2025, 1),
+        (2025, 2),
+    ]
+
+    created = await create_monthly_partitions(db_session, DatasourceExpense, date(2025, 2, 1), 2)
+    assert created == ["datasource_expenses_y2025m03"]
+
+
+async def test_create_monthly_partitions_moves_rows_from_default_partition(
+    db_session: AsyncSession,
+    organization_factory: ModelFactory[Organization],
+    datasource_expense_factory: ModelFactory[DatasourceExpense],
+):
+    organization = await organization_factory()
+    expense_march = await datasource_expense_factory(organization=organization, year=2025, month=3)
+    expense_april = await datasource_expense_factory(organization=organization, year=2025, month=4)
+
+    await create_monthly_partitions(db_session, DatasourceExpense, date(2025, 3, 1), 1)
+
+    result = await db_session.execute(
+        text("SELECT tableoid::regclass::text, id FROM datasource_expenses ORDER BY month")
+    )
+    assert result.all() == [
+        ("datasource_expenses_y2025m03", expense_march.id),
+        ("datasource_expenses_default", expense_april.id),
+    ]
+
+    db_session.expunge_all()
+    fetched = await db_session.scalar(
+        select(DatasourceExpense).where(DatasourceExpense.id == expense_march.id)
+    )
+    assert fetched is not None
+    assert fetched.month == 3
+
+
+async def test_drop_monthly_partitions_before_keeps_recent_months(
+    db_session: AsyncSession,
+    organization_factory: ModelFactory[Organization],
+    datasource_expense_factory: ModelFactory[DatasourceExpense],
+):
+    await create_monthly_partitions(db_session, DatasourceExpense, date(2024, 11, 1), 3)
+    organization = await organization_factory()
+    await datasource_expense_factory(organization=organization, year=2024, month=11)
+    await datasource_expense_factory(organization=organization, year=2025, month=1)
+
+    removed = await drop_monthly_partitions_before(db_session, DatasourceExpense, 2025, 1)
+
+    assert removed == {
+        "datasource_expenses_y2024m11": 1,
+        "datasource_expenses_y2024m12": 0,
+    }
+    assert await list_monthly_partitions(db_session, DatasourceExpense) == [(2025, 1)]
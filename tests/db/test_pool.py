@@ -0,0 +1,124 @@
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from app.conf import Settings
+from app.db.base import configure_db_engine, create_db_engine, session_factory
+from app.db.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    PoolStats,
+    _observe_checked_out,
+    get_pools_stats,
+)
+
+
+async def test_checkout_duration_is_recorded(mocker: MockerFixture, db_engine: AsyncEngine):
+    mocked_histogram = mocker.patch("app.db.pool.checkout_duration_histogram")
+
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert isinstance(db_engine.pool, InstrumentedAsyncAdaptedQueuePool)
+    mocked_histogram.record.assert_called_once()
+    duration, attributes = mocked_histogram.record.call_args.args
+    assert duration >= 0
+    assert attributes == {"pool.name": db_engine.pool.name}
+
+
+async def test_checked_out_connections_are_observed(mocker: MockerFixture, db_engine: AsyncEngine):
+    def get_checked_out() -> int:
+        [observation] = [
+            observation
+            for observation in _observe_checked_out(mocker.MagicMock())
+            if observation.attributes == {"pool.name": db_engine.pool.name}
+        ]
+        return int(observation.value)
+
+    checked_out = get_checked_out()
+
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert get_checked_out() == checked_out + 1
+
+    assert get_checked_out() == checked_out
+
+
+async def test_pool_is_configured_from_settings(test_settings: Settings, db_engine: AsyncEngine):
+    settings = test_settings.model_copy(
+        update={
+            "postgres_pool_size": 2,
+            "postgres_max_overflow": 1,
+            "postgres_pool_timeout": 5,
+            "postgres_statement_cache_size": 0,
+        }
+    )
+    engine = configure_db_engine(settings)
+    # Bind the sessions to the engine of the tests again
+    session_factory.configure(bind=db_engine)
+
+    try:
+        async with engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            asyncpg_connection = raw_connection.driver_connection
+            assert asyncpg_connection._stmt_cache.get_max_size() == 0
+
+            [stats] = [stats for stats in get_pools_stats() if stats.size == 2]
+            assert stats == PoolStats(
+                name="primary",
+                size=2,
+                max_overflow=1,
+                timeout=5,
+                checked_in=0,
+                checked_out=1,
+                overflow=0,
+            )
+    finally:
+        await engine.dispose()
+
+
+SELECT_VALUE = text("SELECT CAST(:value AS integer)")
+
+
+async def deallocate_prepared_statements(conn: AsyncConnection) -> None:
+    # Stand-in for an external pooler in transaction mode, serving the next transaction of
+    # the connection with another server connection, not having its prepared statements
+    raw_connection = await conn.get_raw_connection()
+    await raw_connection.driver_connection.execute("DEALLOCATE ALL")
+
+
+async def test_external_pooler_mode(test_settings: Settings):
+    settings = test_settings.model_copy(update={"postgres_external_pooler": True})
+    engine = create_db_engine(settings, str(settings.postgres_async_url), "primary")
+
+    try:
+        assert isinstance(engine.pool, NullPool)
+
+        async with engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            assert raw_connection.driver_connection._stmt_cache.get_max_size() == 0
+
+            for value in range(3):
+                result = await conn.execute(SELECT_VALUE, {"value": value})
+                assert result.scalar_one() == value
+                await conn.commit()
+                await deallocate_prepared_statements(conn)
+    finally:
+        await engine.dispose()
+
+
+async def test_statement_cache_breaks_behind_an_external_pooler(test_settings: Settings):
+    engine = create_db_engine(test_settings, str(test_settings.postgres_async_url), "primary")
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(SELECT_VALUE, {"value": 0})
+            await conn.commit()
+            await deallocate_prepared_statements(conn)
+
+            with pytest.raises(DBAPIError, match="prepared statement .* does not exist"):
+                await conn.execute(SELECT_VALUE, {"value": 1})
+    finally:
+        await engine.dispose()
@@ -0,0 +1,35 @@
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import System
+from app.db.query_stats import track_query_stats
+
+
+async def test_track_query_stats(db_session: AsyncSession, ffc_extension: System):
+    await db_session.execute(text("SELECT 1"))
+
+    with track_query_stats() as stats:
+        await db_session.execute(select(System.id))
+        await db_session.execute(text("SELECT generate_series(1, 3)"))
+
+    assert stats.queries == 2
+    assert stats.rows == 4
+    assert stats.duration > 0
+
+    await db_session.execute(text("SELECT 1"))
+    assert stats.queries == 2
+
+
+async def test_track_query_stats_nested(db_session: AsyncSession):
+    await db_session.execute(text("SELECT 1"))
+
+    with track_query_stats() as outer_stats:
+        await db_session.execute(text("SELECT 1"))
+
+        with track_query_stats() as inner_stats:
+            await db_session.execute(text("SELECT 1"))
+
+        await db_session.execute(text("SELECT 1"))
+
+    assert inner_stats.queries == 1
+    assert outer_stats.queries == 2
@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.conf import Settings
+from app.db.base import configure_db_engine, read_only_session, session_factory
+from app.db.replicas import ReplicaRouter, replica_router
+from app.dependencies.db import get_read_only_db_session
+
+
+@pytest.fixture
+def router(db_engine: AsyncEngine) -> ReplicaRouter:
+    # The database of the tests isn't a replica, which is reported as no lag
+    router = ReplicaRouter()
+    router.configure(db_engine, max_lag=5, check_interval=60)
+    return router
+
+
+@pytest.fixture
+def replica_configured(mocker: MockerFixture, router: ReplicaRouter) -> ReplicaRouter:
+    mocker.patch("app.db.base.replica_router", router)
+    mocker.patch("app.dependencies.db.replica_router", router)
+    return router
+
+
+async def hang() -> float:
+    # The replica doesn't answer
+    await asyncio.Event().wait()
+    return 0.0
+
+
+async def test_replica_not_configured():
+    router = ReplicaRouter()
+
+    assert not await router.is_available()
+
+
+async def test_replica_available(router: ReplicaRouter):
+    assert await router.get_lag() == 0
+    assert await router.is_available()
+
+
+async def test_replica_lagging(
+    mocker: MockerFixture, router: ReplicaRouter, caplog: pytest.LogCaptureFixture
+):
+    mocker.patch.object(router, "get_lag", return_value=6.0)
+
+    assert not await router.is_available()
+    assert "The replica is lagging 6.0s behind the primary" in caplog.text
+
+
+async def test_replica_unreachable(mocker: MockerFixture, router: ReplicaRouter):
+    mocker.patch.object(router, "get_lag", side_effect=OSError("Connection refused"))
+
+    assert not await router.is_available()
+
+
+async def test_replica_check_timeout(mocker: MockerFixture, router: ReplicaRouter):
+    mocker.patch.object(router, "get_lag", side_effect=hang)
+    router.check_timeout = 0.1
+
+    assert not await router.is_available()
+
+
+async def test_replica_check_in_progress_is_not_waited(
+    mocker: MockerFixture, router: ReplicaRouter
+):
+    checking = asyncio.Event()
+
+    async def get_lag() -> float:
+        checking.set()
+        return await hang()
+
+    mocker.patch.object(router, "get_lag", side_effect=get_lag)
+    check = asyncio.create_task(router.is_available())
+    await checking.wait()
+    try:
+        assert not await asyncio.wait_for(router.is_available(), timeout=0.1)
+    finally:
+        check.cancel()
+
+
+async def test_replica_checked_once_per_interval(mocker: MockerFixture, router: ReplicaRouter):
+    mocked_get_lag = mocker.patch.object(router, "get_lag", return_value=0.0)
+
+    assert await router.is_available()
+    mocked_get_lag.return_value = 10.0
+    assert await router.is_available()
+    mocked_get_lag.assert_awaited_once()
+
+    router.check_interval = 0
+    assert not await router.is_available()
+
+
+async def test_read_only_db_session_uses_replica(
+    db_session: AsyncSession, replica_configured: ReplicaRouter
+):
+    session_generator = get_read_only_db_session(db_session)
+    session = await anext(session_generator)
+    try:
+        assert session is not db_session
+        assert session.bind is replica_configured.engine
+        assert session.in_transaction()
+    finally:
+        await session_generator.aclose()
+
+
+async def test_read_only_db_session_falls_back_to_primary(
+    mocker: MockerFixture, db_session: AsyncSession, replica_configured: ReplicaRouter
+):
+    mocker.patch.object(replica_configured, "get_lag", return_value=60.0)
+
+    session_generator = get_read_only_db_session(db_session)
+    assert await anext(session_generator) is db_session
+    await session_generator.aclose()
+
+
+async def test_read_only_session_does_not_wait_for_unreachable_replica(
+    mocker: MockerFixture, db_session: AsyncSession, replica_configured: ReplicaRouter
+):
+    mocker.patch.object(replica_configured, "get_lag", side_effect=hang)
+    replica_configured.check_timeout = 0.1
+
+    start_time = time.perf_counter()
+    async with read_only_session() as session:
+        assert session.bind is db_session.bind
+
+    assert time.perf_counter() - start_time < 1
+
+
+async def test_read_only_session_falls_back_to_primary(db_session: AsyncSession):
+    async with read_only_session() as session:
+        assert session.bind is db_session.bind
+        assert (await session.execute(text("SELECT 1"))).scalar_one() == 1
+
+
+async def test_configure_replica_engine(
+    test_settings: Settings, db_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(test_settings, "postgres_replica_host", test_settings.postgres_host)
+    monkeypatch.setattr(test_settings, "postgres_replica_max_lag_seconds", 12)
+
+    primary_engine = configure_db_engine(test_settings)
+    try:
+        assert replica_router.engine is not None
+        assert replica_router.engine.url.host == test_settings.postgres_host
+        assert replica_router.engine.url.port == test_settings.postgres_port
+        assert replica_router.engine.pool.name == "replica"  # type: ignore[attr-defined]
+        assert replica_router.max_lag == 12
+        assert replica_router.check_timeout == 2
+        assert await replica_router.is_available()
+    finally:
+        await primary_engine.dispose()
+        if replica_router.engine is not None:
+            await replica_router.engine.dispose()
+        replica_router.configure(None)
+        # Bind the sessions to the engine of the tests again
+        session_factory.configure(bind=db_engine)
@@ -0,0 +1,64 @@
+import asyncio
+
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db.transactions import commit_early
+
+
+async def test_idle_duration_is_recorded_on_commit(mocker: MockerFixture, db_engine: AsyncEngine):
+    mocked_histogram = mocker.patch("app.db.transactions.transaction_idle_duration_histogram")
+
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        await asyncio.sleep(0.05)
+        await conn.execute(text("SELECT 1"))
+        await conn.commit()
+
+    mocked_histogram.record.assert_called_once()
+    duration, attributes = mocked_histogram.record.call_args.args
+    assert duration >= 0.05
+    assert attributes == {"db.transaction.outcome": "commit"}
+
+
+async def test_idle_duration_is_recorded_on_rollback(mocker: MockerFixture, db_engine: AsyncEngine):
+    mocked_histogram = mocker.patch("app.db.transactions.transaction_idle_duration_histogram")
+
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        await asyncio.sleep(0.05)
+        await conn.rollback()
+
+    mocked_histogram.record.assert_called_once()
+    duration, attributes = mocked_histogram.record.call_args.args
+    assert duration >= 0.05
+    assert attributes == {"db.transaction.outcome": "rollback"}
+
+
+async def test_idle_duration_excludes_the_queries(mocker: MockerFixture, db_engine: AsyncEngine):
+    mocked_histogram = mocker.patch("app.db.transactions.transaction_idle_duration_histogram")
+
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT pg_sleep(0.1)"))
+        await conn.commit()
+
+    duration, _ = mocked_histogram.record.call_args.args
+    assert duration < 0.1
+
+
+async def test_commit_early_ends_the_transaction(db_session: AsyncSession):
+    await db_session.execute(text("SELECT 1"))
+    assert db_session.in_transaction()
+
+    await commit_early(db_session)
+    assert not db_session.in_transaction()
+
+    await db_session.execute(text("SELECT 1"))
+    assert db_session.in_transaction()
+
+
+async def test_commit_early_without_transaction(db_session: AsyncSession):
+    await commit_early(db_session)
+
+    assert not db_session.in_transaction()
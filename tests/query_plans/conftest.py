@@ -0,0 +1,338 @@
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import jwt
+import pytest
+from pydantic import SecretStr
+from sqlalchemy import insert, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.auth.login import get_tokens_from_credentials
+from app.conf import Settings
+from app.db.base import session_factory
+from app.db.handlers import AccountUserHandler, UserHandler
+from app.db.models import (
+    Account,
+    AccountUser,
+    DatasourceExpense,
+    Entitlement,
+    Organization,
+    System,
+    User,
+)
+from app.enums import (
+    AccountStatus,
+    AccountType,
+    AccountUserStatus,
+    DatasourceType,
+    EntitlementStatus,
+    SystemStatus,
+    UserStatus,
+)
+from app.hasher import pbkdf2_sha256
+from app.routers.users import get_user_by_id, reset_user_password
+from app.schemas.auth import Login
+from app.schemas.users import UserResetPassword
+
+NUM_AFFILIATE_ACCOUNTS = 100
+NUM_USERS = 2000
+NUM_ORGANIZATIONS = 200
+NUM_ENTITLEMENTS = 2000
+NUM_DATASOURCES = 100
+NUM_DATASOURCE_EXPENSES = 10000
+
+# All the seeded users share the same password, it's hashed only once as it's slow
+USER_PASSWORD = "mySuperPass123$"
+
+
+@dataclass(frozen=True)
+class SeededData:
+    operations_account_id: str
+    operations_system_id: str
+    affiliate_account_id: str
+    affiliate_system_id: str
+    affiliate_user_id: str
+    organization_id: str
+    datasource_id: str
+
+
+type QueryRunner = Callable[[SeededData], Awaitable[Any]]
+
+
+def _pk(prefix: str, num: int) -> str:
+    return f"{prefix}-{num // 10000:04d}-{num % 10000:04d}"
+
+
+def _system_secret(system_id: str) -> str:
+    return f"{system_id}-jwt-secret"
+
+
+async def _seed(session: AsyncSession) -> SeededData:
+    """
+    Seeds a deterministic dataset, big enough for the planner to prefer index scans
+    wherever an index can be used.
+    """
+    operations_account_id = _pk(Account.PK_PREFIX, 0)
+    account_ids = [_pk(Account.PK_PREFIX, i) for i in range(1, NUM_AFFILIATE_ACCOUNTS + 1)]
+    system_ids = [_pk(System.PK_PREFIX, i) for i in range(NUM_AFFILIATE_ACCOUNTS + 1)]
+    operations_system_id = system_ids[0]
+    await session.execute(
+        insert(Account),
+        [
+            {
+                "id": operations_account_id,
+                "name": "Operations",
+                "external_id": "OPERATIONS",
+                "type": AccountType.OPERATIONS,
+            }
+        ]
+        + [
+            {
+                "id": account_id,
+                "name": f"Affiliate {i}",
+                "external_id": f"AFFILIATE-{i}",
+                "type": AccountType.AFFILIATE,
+                "status": AccountStatus.ACTIVE if i % 10 else AccountStatus.DISABLED,
+            }
+            for i, account_id in enumerate(account_ids)
+        ],
+    )
+
+    await session.execute(
+        insert(System),
+        [
+            {
+                "id": system_id,
+                "name": f"System {i}",
+                "external_id": f"SYSTEM-{i}",
+                "jwt_secret": _system_secret(system_id),
+                "owner_id": owner_id,
+                "status": SystemStatus.ACTIVE,
+            }
+            for i, (system_id, owner_id) in enumerate(
+                zip(system_ids, [operations_account_id, *account_ids], strict=True)
+            )
+        ],
+    )
+
+    # The accounts and the systems reference each other
+    await session.execute(
+        update(Account)
+        .where(Account.type == AccountType.AFFILIATE)
+        .values(created_by_id=operations_system_id, updated_by_id=operations_system_id)
+    )
+
+    user_ids = [_pk(User.PK_PREFIX, i) for i in range(NUM_USERS)]
+    password = pbkdf2_sha256.hash(USER_PASSWORD)
+    pwd_reset_token_expires_at = datetime.now(UTC) + timedelta(days=1)
+    # RETURNING is needed to bulk insert a joined inheritance model in multiple batches
+    await session.execute(
+        insert(User).returning(User.id),
+        [
+            {
+                "id": user_id,
+                "name": f"User {i}",
+                "email": f"User.{i}@example.com",
+                "status": UserStatus.ACTIVE if i % 20 else UserStatus.DELETED,
+                "last_used_account_id": account_ids[i % NUM_AFFILIATE_ACCOUNTS],
+                "created_by_id": operations_system_id,
+                "updated_by_id": system_ids[1 + i % NUM_AFFILIATE_ACCOUNTS],
+                "password": password,
+                "pwd_reset_token": f"pwd-reset-token-{i}" if i % 50 == 0 else None,
+                "pwd_reset_token_expires_at": pwd_reset_token_expires_at if i % 50 == 0 else None,
+            }
+            for i, user_id in enumerate(user_ids)
+        ],
+    )
+    await session.execute(
+        insert(AccountUser),
+        [
+            {
+                "id": _pk(AccountUser.PK_PREFIX, i),
+                "account_id": account_ids[i % NUM_AFFILIATE_ACCOUNTS],
+                "user_id": user_id,
+                "status": AccountUserStatus.ACTIVE if i % 50 else AccountUserStatus.INVITED,
+                "invitation_token": f"invitation-token-{i}" if i % 50 == 0 else None,
+            }
+            for i, user_id in enumerate(user_ids)
+        ],
+    )
+
+    organization_ids = [_pk(Organization.PK_PREFIX, i) for i in range(NUM_ORGANIZATIONS)]
+    await session.execute(
+        insert(Organization),
+        [
+            {
+                "id": organization_id,
+                "name": f"Organization {i}",
+                "currency": "EUR",
+                "billing_currency": "USD",
+                "operations_external_id": f"AGR-{i:04d}",
+                "linked_organization_id": f"linked-organization-{i}",
+            }
+            for i, organization_id in enumerate(organization_ids)
+        ],
+    )
+
+    statuses = list(EntitlementStatus)
+    await session.execute(
+        insert(Entitlement),
+        [
+            {
+                "id": _pk(Entitlement.PK_PREFIX, i),
+                "name": f"Entitlement {i}",
+                "affiliate_external_id": f"AFFILIATE-ENTITLEMENT-{i}",
+                "datasource_id": f"entitlement-datasource-{i}",
+                "owner_id": account_ids[i % NUM_AFFILIATE_ACCOUNTS],
+                "status": statuses[i % len(statuses)],
+                "created_by_id": system_ids[1 + i % NUM_AFFILIATE_ACCOUNTS],
+                "updated_by_id": user_ids[i],
+            }
+            for i in range(NUM_ENTITLEMENTS)
+        ],
+    )
+
+    # Every datasource has an expense per day from January 2025 to April 2025
+    await session.execute(
+        insert(DatasourceExpense),
+        [
+            {
+                "id": _pk(DatasourceExpense.PK_PREFIX, i),
+                "datasource_id": f"datasource-{i % NUM_DATASOURCES}",
+                "linked_datasource_id": f"linked-datasource-{i % NUM_DATASOURCES}",
+                "linked_datasource_type": DatasourceType.AWS_CNR,
+                "datasource_name": f"Datasource {i % NUM_DATASOURCES}",
+                "organization_id": organization_ids[i % NUM_DATASOURCES % NUM_ORGANIZATIONS],
+                "year": day.year,
+                "month": day.month,
+                "day": day.day,
+                "expenses": 10,
+                "total_expenses": 100,
+            }
+            for i in range(NUM_DATASOURCE_EXPENSES)
+            for day in [datetime(2025, 1, 1) + timedelta(days=i // NUM_DATASOURCES)]
+        ],
+    )
+
+    return SeededData(
+        operations_account_id=operations_account_id,
+        operations_system_id=operations_system_id,
+        affiliate_account_id=account_ids[1],
+        affiliate_system_id=system_ids[2],
+        affiliate_user_id=user_ids[1],
+        organization_id=organization_ids[1],
+        datasource_id="datasource-1",
+    )
+
+
+SEEDED_TABLES = (
+    "accounts, actors, systems, users, accounts_users, organizations, entitlements, "
+    "datasource_expenses"
+)
+
+
+@pytest.fixture(scope="module")
+async def seeded_connection(
+    db_engine: AsyncEngine,
+) -> AsyncGenerator[tuple[AsyncConnection, SeededData]]:
+    # Seed once per module within a transaction which is rolled back at the end, the
+    # statistics collected by ANALYZE are rolled back as well
+    async with db_engine.connect() as conn:
+        outer_transaction = await conn.begin()
+        session_factory.configure(bind=conn, join_transaction_mode="create_savepoint")
+
+        try:
+            # Start from new (empty) files, so the estimated costs don't depend on the
+            # dead rows left behind by the tests which ran before
+            await conn.execute(text(f"TRUNCATE {SEEDED_TABLES} CASCADE"))
+
+            async with session_factory() as session:
+                seeded_data = await _seed(session)
+                await session.commit()
+
+            await conn.execute(text(f"ANALYZE {SEEDED_TABLES}"))
+            yield conn, seeded_data
+        finally:
+            await outer_transaction.rollback()
+
+
+@pytest.fixture
+def seeded_data(seeded_connection: tuple[AsyncConnection, SeededData]) -> SeededData:
+    return seeded_connection[1]
+
+
+@pytest.fixture
+async def db_session(
+    seeded_connection: tuple[AsyncConnection, SeededData],
+) -> AsyncGenerator[AsyncSession]:
+    conn, _ = seeded_connection
+    savepoint = await conn.begin_nested()
+    session_factory.configure(bind=conn, join_transaction_mode="create_savepoint")
+
+    try:
+        async with session_factory() as session:
+            yield session
+    finally:
+        await savepoint.rollback()
+
+
+def _jwt_token(subject: str, secret: str, **claims: str) -> str:
+    now = datetime.now(UTC)
+
+    return jwt.encode(
+        {"sub": subject, "iat": now, "nbf": now, "exp": now + timedelta(minutes=5), **claims},
+        secret,
+        algorithm="HS256",
+    )
+
+
+@pytest.fixture
+def operations_system_token(seeded_data: SeededData) -> str:
+    system_id = seeded_data.operations_system_id
+    return _jwt_token(system_id, _system_secret(system_id))
+
+
+@pytest.fixture
+def affiliate_system_token(seeded_data: SeededData) -> str:
+    system_id = seeded_data.affiliate_system_id
+    return _jwt_token(system_id, _system_secret(system_id))
+
+
+@pytest.fixture
+def affiliate_user_token(seeded_data: SeededData, test_settings: Settings) -> str:
+    return _jwt_token(
+        seeded_data.affiliate_user_id,
+        test_settings.auth_access_jwt_secret,
+        account_id=seeded_data.affiliate_account_id,
+    )
+
+
+@pytest.fixture
+def auth_queries(db_session: AsyncSession, test_settings: Settings) -> dict[str, QueryRunner]:
+    # The 50th user has a password reset token and a pending invitation, the 51st one
+    # is active in an active account
+    invited_user_id = _pk(User.PK_PREFIX, 50)
+
+    return {
+        "auth.login": lambda data: get_tokens_from_credentials(
+            test_settings,
+            db_session,
+            Login(email="user.51@example.com", password=SecretStr(USER_PASSWORD)),
+        ),
+        "users.reset_password": lambda data: reset_user_password(
+            invited_user_id,
+            UserHandler(db_session),
+            UserResetPassword(
+                pwd_reset_token="pwd-reset-token-50", password=SecretStr(USER_PASSWORD)
+            ),
+        ),
+        "users.get.invitation_token": lambda data: get_user_by_id(
+            invited_user_id,
+            None,
+            AccountUserHandler(db_session),
+            UserHandler(db_session),
+            token="invitation-token-50",
+        ),
+    }
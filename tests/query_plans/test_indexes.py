@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.handlers import EntitlementHandler
+from tests.query_plans.conftest import QueryRunner, SeededData
+from tests.query_plans.utils import explain_executed_queries, get_used_indexes
+
+
+@pytest.fixture
+def hot_lookups(
+    db_session: AsyncSession, auth_queries: dict[str, QueryRunner]
+) -> dict[str, QueryRunner]:
+    return {
+        **auth_queries,
+        "entitlements.stats_by_account": lambda data: EntitlementHandler(
+            db_session
+        ).get_stats_by_account(data.affiliate_account_id),
+    }
+
+
+@pytest.mark.parametrize(
+    ("lookup_name", "expected_indexes"),
+    [
+        ("auth.login", {"ix_users_lower_email", "ix_accounts_users_account_id_and_user_id"}),
+        ("users.reset_password", {"ix_users_pwd_reset_token"}),
+        ("users.get.invitation_token", {"ix_accounts_users_invitation_token"}),
+        ("entitlements.stats_by_account", {"ix_entitlements_owner_id_and_status"}),
+    ],
+)
+async def test_hot_lookups_use_index(
+    db_session: AsyncSession,
+    seeded_data: SeededData,
+    hot_lookups: dict[str, QueryRunner],
+    lookup_name: str,
+    expected_indexes: set[str],
+):
+    run_queries = hot_lookups[lookup_name]
+    queries = await explain_executed_queries(db_session, lambda: run_queries(seeded_data))
+
+    used_indexes = set().union(*(get_used_indexes(query.plan) for query in queries))
+    assert expected_indexes <= used_indexes
@@ -0,0 +1,135 @@
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.handlers import EntitlementHandler, ModelHandler, UserHandler
+from tests.benchmarks.utils import format_report
+
+
+@dataclass
+class ListStats:
+    queries: int
+    cells: int
+    seconds: float
+
+
+async def measure_list(
+    api_client: AsyncClient, db_session: AsyncSession, url: str, token: str, times: int
+) -> ListStats:
+    """
+    Returns the number of queries run to list the objects (i.e. the ones following the
+    count query), the number of cells (rows x columns) they returned and the median
+    response time.
+    """
+    results: list[int] = []
+
+    def on_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT count("):
+            results.clear()
+        elif statement.startswith("SELECT"):
+            results.append(len(cursor.description) * cursor.rowcount)
+
+    engine = db_session.bind.sync_engine  # type: ignore[union-attr]
+    elapsed = []
+    for _ in range(times):
+        results.clear()
+        event.listen(engine, "after_cursor_execute", on_after_cursor_execute)
+        try:
+            start = time.perf_counter()
+            response = await api_client.get(url, headers={"Authorization": f"Bearer {token}"})
+            elapsed.append(time.perf_counter() - start)
+        finally:
+            event.remove(engine, "after_cursor_execute", on_after_cursor_execute)
+
+        assert response.status_code == 200, response.text
+
+    return ListStats(
+        queries=len(results),
+        cells=sum(results),
+        seconds=statistics.median(elapsed),
+    )
+
+
+async def measure_joined_and_selectin(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    handler_cls: type[ModelHandler],
+    url: str,
+    token: str,
+    times: int,
+) -> tuple[ListStats, ListStats]:
+    """
+    Returns the stats of the list loaded with the `list_options` of the handler (with
+    `selectinload`) and without them (with the `joinedload` of the relationships).
+    """
+    selectin = await measure_list(api_client, db_session, url, token, times)
+
+    monkeypatch.setattr(handler_cls, "list_options", None)
+    monkeypatch.setattr(ModelHandler, "_statements", {})
+    joined = await measure_list(api_client, db_session, url, token, times)
+
+    return joined, selectin
+
+
+LISTS = pytest.mark.parametrize(
+    ("handler_cls", "url"),
+    [
+        (EntitlementHandler, "/entitlements?limit=100"),
+        (UserHandler, "/users?limit=100"),
+    ],
+)
+
+
+@LISTS
+async def test_list_options_reduce_result_width(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    operations_system_token: str,
+    monkeypatch: pytest.MonkeyPatch,
+    handler_cls: type[ModelHandler],
+    url: str,
+):
+    joined, selectin = await measure_joined_and_selectin(
+        api_client, db_session, monkeypatch, handler_cls, url, operations_system_token, times=1
+    )
+
+    # the related objects are loaded with a query per relationship, instead of being
+    # repeated in every row
+    assert joined.queries == 1
+    assert selectin.queries > 1
+    assert selectin.cells < joined.cells * 0.6
+
+
+@pytest.mark.benchmark
+@LISTS
+async def test_list_options_response_time(
+    api_client: AsyncClient,
+    db_session: AsyncSession,
+    operations_system_token: str,
+    monkeypatch: pytest.MonkeyPatch,
+    benchmark_report: Callable[[str], None],
+    handler_cls: type[ModelHandler],
+    url: str,
+):
+    joined, selectin = await measure_joined_and_selectin(
+        api_client, db_session, monkeypatch, handler_cls, url, operations_system_token, times=10
+    )
+
+    benchmark_report(
+        format_report(
+            f"GET {url} (joinedload -> selectinload)",
+            {
+                "queries": (joined.queries, selectin.queries),
+                "cells": (joined.cells, selectin.cells),
+                "median response time (ms)": (joined.seconds * 1000, selectin.seconds * 1000),
+            },
+            unit="",
+        )
+    )
@@ -0,0 +1,178 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.commands.fetch_datasource_expenses import store_datasource_expenses
+from app.db.handlers import DatasourceExpenseHandler
+from app.enums import DatasourceType
+from tests.query_plans.conftest import QueryRunner, SeededData
+from tests.query_plans.utils import (
+    explain_executed_queries,
+    load_baselines,
+    save_baseline,
+    summarize_plan,
+)
+
+# How much the estimated cost of a query can grow before it's considered a regression
+COST_REGRESSION_THRESHOLD = 0.25
+
+
+@pytest.fixture
+def api_queries(
+    api_client: AsyncClient,
+    operations_system_token: str,
+    affiliate_system_token: str,
+    affiliate_user_token: str,
+) -> dict[str, QueryRunner]:
+    async def get(url: str, token: str) -> None:
+        response = await api_client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200, response.text
+
+    def as_operations(url: str) -> QueryRunner:
+        return lambda data: get(url.format(data=data), operations_system_token)
+
+    def as_affiliate(url: str) -> QueryRunner:
+        return lambda data: get(url.format(data=data), affiliate_system_token)
+
+    def as_affiliate_user(url: str) -> QueryRunner:
+        return lambda data: get(url.format(data=data), affiliate_user_token)
+
+    return {
+        "accounts.list": as_operations("/accounts"),
+        "accounts.list.rql": as_operations("/accounts?eq(type,affiliate)&eq(status,active)"),
+        "accounts.users.list": as_operations("/accounts/{data.affiliate_account_id}/users"),
+        "accounts.users.list.affiliate_user": as_affiliate_user(
+            "/accounts/{data.affiliate_account_id}/users"
+        ),
+        "users.list": as_operations("/users"),
+        "users.list.rql": as_operations("/users?eq(email,User.1@example.com)"),
+        "users.list.affiliate_user": as_affiliate_user("/users"),
+        "users.accounts.list": as_operations("/users/{data.affiliate_user_id}/accounts"),
+        "systems.list": as_operations("/systems"),
+        "systems.list.affiliate": as_affiliate("/systems"),
+        "systems.list.rql": as_operations("/systems?eq(owner.id,{data.affiliate_account_id})"),
+        "organizations.list": as_operations("/organizations"),
+        "organizations.list.rql": as_operations(
+            "/organizations?eq(operations_external_id,AGR-0001)"
+        ),
+        "entitlements.list": as_operations("/entitlements"),
+        "entitlements.list.affiliate": as_affiliate("/entitlements"),
+        "entitlements.list.rql": as_operations(
+            "/entitlements?eq(owner.id,{data.affiliate_account_id})&eq(status,active)"
+        ),
+        "expenses.list": as_operations("/expenses"),
+        "expenses.list.rql": as_operations(
+            "/expenses?eq(organization.id,{data.organization_id})&gte(date,2025-03-01)"
+        ),
+    }
+
+
+def _datasource_expenses(data: SeededData, **extra: Any) -> list[dict]:
+    return [
+        {
+            "id": f"linked-{datasource_id}",
+            "account_id": datasource_id,
+            "name": datasource_id,
+            "type": DatasourceType.AWS_CNR.value,
+            **extra,
+        }
+        for datasource_id in (data.datasource_id, "new-datasource")
+    ]
+
+
+@pytest.fixture
+def handler_queries(
+    mocker: MockerFixture, db_session: AsyncSession, auth_queries: dict[str, QueryRunner]
+) -> dict[str, QueryRunner]:
+    mocker.patch("app.commands.fetch_datasource_expenses.send_info")
+
+    def store_expenses(is_daily: bool) -> QueryRunner:
+        extra: dict[str, Any] = {"total": 1} if is_daily else {"details": {"cost": 1}}
+        return lambda data: store_datasource_expenses(
+            DatasourceExpenseHandler(db_session),
+            {data.organization_id: _datasource_expenses(data, **extra)},
+            2025,
+            3,
+            1,
+            is_daily=is_daily,
+        )
+
+    return {
+        **auth_queries,
+        "expenses.store.daily": store_expenses(is_daily=True),
+        "expenses.store.monthly": store_expenses(is_daily=False),
+    }
+
+
+QUERY_NAMES = [
+    "accounts.list",
+    "accounts.list.rql",
+    "accounts.users.list",
+    "accounts.users.list.affiliate_user",
+    "users.list",
+    "users.list.rql",
+    "users.list.affiliate_user",
+    "users.accounts.list",
+    "systems.list",
+    "systems.list.affiliate",
+    "systems.list.rql",
+    "organizations.list",
+    "organizations.list.rql",
+    "entitlements.list",
+    "entitlements.list.affiliate",
+    "entitlements.list.rql",
+    "expenses.list",
+    "expenses.list.rql",
+    "auth.login",
+    "users.reset_password",
+    "users.get.invitation_token",
+    "expenses.store.daily",
+    "expenses.store.monthly",
+]
+
+
+@pytest.mark.parametrize("query_name", QUERY_NAMES)
+async def test_query_plans(
+    request: pytest.FixtureRequest,
+    db_session: AsyncSession,
+    seeded_data: SeededData,
+    api_queries: dict[str, QueryRunner],
+    handler_queries: dict[str, QueryRunner],
+    query_name: str,
+):
+    run_queries = {**api_queries, **handler_queries}[query_name]
+    queries = await explain_executed_queries(db_session, lambda: run_queries(seeded_data))
+    # The order in which the relationships are eager loaded with `selectinload` can vary
+    summaries = [
+        summarize_plan(query.plan) for query in sorted(queries, key=lambda query: query.statement)
+    ]
+
+    if request.config.getoption("--update-query-plans"):
+        save_baseline(query_name, summaries)
+        return
+
+    baseline = load_baselines().get(query_name)
+    assert baseline is not None, (
+        f"No query plans recorded for {query_name}, run pytest with --update-query-plans"
+    )
+    assert len(summaries) == len(baseline), (
+        f"{query_name} executed {len(summaries)} queries instead of {len(baseline)}: "
+        f"{[summary.shape for summary in summaries]}"
+    )
+
+    for i, (summary, expected) in enumerate(zip(summaries, baseline, strict=True)):
+        new_seq_scans = set(summary.seq_scans) - set(expected.seq_scans)
+        assert not new_seq_scans, (
+            f"Query #{i} of {query_name} flipped to a sequential scan on "
+            f"{', '.join(sorted(new_seq_scans))}: {summary.shape} (was {expected.shape})"
+        )
+
+        max_cost = expected.total_cost * (1 + COST_REGRESSION_THRESHOLD)
+        assert summary.total_cost <= max_cost, (
+            f"The estimated cost of query #{i} of {query_name} regressed from "
+            f"{expected.total_cost} to {summary.total_cost}: {summary.shape} "
+            f"(was {expected.shape})"
+        )
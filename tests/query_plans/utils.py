@@ -0,0 +1,124 @@
+import hashlib
+import json
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    shape: str
+    fingerprint: str
+    total_cost: float
+    seq_scans: list[str]
+
+
+@dataclass(frozen=True)
+class ExplainedQuery:
+    statement: str
+    plan: dict[str, Any]
+
+
+async def explain_executed_queries(
+    db_session: AsyncSession, run_queries: Callable[[], Awaitable[Any]]
+) -> list[ExplainedQuery]:
+    """
+    Runs the given queries and returns the plans of the SELECT statements they executed,
+    in order of execution.
+    """
+    executed: list[tuple[str, Any]] = []
+
+    def on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            executed.append((statement, parameters))
+
+    engine = db_session.bind.sync_engine  # type: ignore[union-attr]
+    event.listen(engine, "before_cursor_execute", on_before_cursor_execute)
+    try:
+        await run_queries()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_before_cursor_execute)
+
+    conn = await db_session.connection()
+    queries = []
+    for statement, parameters in executed:
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        queries.append(ExplainedQuery(statement, result.scalar_one()[0]["Plan"]))
+
+    return queries
+
+
+def iter_plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for subplan in plan.get("Plans", []):
+        yield from iter_plan_nodes(subplan)
+
+
+def get_used_indexes(plan: dict[str, Any]) -> set[str]:
+    return {node["Index Name"] for node in iter_plan_nodes(plan) if "Index Name" in node}
+
+
+def get_plan_shape(plan: dict[str, Any]) -> str:
+    """
+    Returns a compact representation of the plan tree, made of the node types and the
+    relations/indexes they scan, e.g. `Limit(Sort(Seq Scan[accounts]))`.
+    """
+    shape = plan["Node Type"]
+    target = plan.get("Index Name") or plan.get("Relation Name")
+    if target:
+        shape += f"[{target}]"
+
+    subplans = plan.get("Plans", [])
+    if subplans:
+        shape += f"({','.join(get_plan_shape(subplan) for subplan in subplans)})"
+
+    return shape
+
+
+def summarize_plan(plan: dict[str, Any]) -> PlanSummary:
+    shape = get_plan_shape(plan)
+
+    return PlanSummary(
+        shape=shape,
+        fingerprint=hashlib.sha1(shape.encode(), usedforsecurity=False).hexdigest()[:12],
+        total_cost=round(plan["Total Cost"], 2),
+        seq_scans=sorted(
+            {
+                node["Relation Name"]
+                for node in iter_plan_nodes(plan)
+                if node["Node Type"] == "Seq Scan"
+            }
+        ),
+    )
+
+
+def load_baselines() -> dict[str, list[PlanSummary]]:
+    if not BASELINES_PATH.exists():
+        return {}
+
+    return {
+        name: [PlanSummary(**summary) for summary in summaries]
+        for name, summaries in json.loads(BASELINES_PATH.read_text()).items()
+    }
+
+
+def save_baseline(name: str, summaries: list[PlanSummary]) -> None:
+    baselines = load_baselines()
+    baselines[name] = summaries
+
+    BASELINES_PATH.write_text(
+        json.dumps(
+            {
+                name: [asdict(summary) for summary in summaries]
+                for name, summaries in sorted(baselines.items())
+            },
+            indent=2,
+        )
+        + "\n"
+    )
@@ -0,0 +1,43 @@
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.api_clients.base import get_endpoint_template
+from app.db.models import Organization
+from tests.fixtures.mock_api_clients import MockOptscaleClient
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/restore_password", "/restore_password"),
+        (
+            "/organizations/0a1b2c3d-0000-4000-8000-123456789abc/cloud_accounts",
+            "/organizations/{id}/cloud_accounts",
+        ),
+        ("/cloud_accounts/123456", "/cloud_accounts/{id}"),
+        ("/v2/organizations/FORG-1234-5678-9012", "/v2/organizations/{id}"),
+    ],
+)
+def test_get_endpoint_template(path: str, expected: str):
+    assert get_endpoint_template(path) == expected
+
+
+async def test_request_duration_is_recorded(
+    mocker: MockerFixture, mock_optscale_client: MockOptscaleClient
+):
+    mocked_histogram = mocker.patch("app.api_clients.base.request_duration_histogram")
+    organization = Organization(linked_organization_id=str(uuid.uuid4()))
+    mock_optscale_client.mock_fetch_datasources_for_organization(organization, [])
+
+    async with mock_optscale_client.real_client as client:
+        await client.fetch_datasources_for_organization(organization.linked_organization_id)
+
+    mocked_histogram.record.assert_called_once()
+    duration, attributes = mocked_histogram.record.call_args.args
+    assert duration > 0
+    assert attributes["api_client"] == "OptscaleClient"
+    assert attributes["http.request.method"] == "GET"
+    assert attributes["http.response.status_code"] == 200
+    assert attributes["url.template"].endswith("/organizations/{id}/cloud_accounts")
@@ -0,0 +1,77 @@
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import middleware
+from app.middleware import QueryStatsMiddleware
+
+
+@pytest.fixture
+def queries_app(db_session: AsyncSession) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, queries_budget=2)
+
+    @app.get("/queries/{count}")
+    async def run_queries(count: int):
+        for _ in range(count):
+            await db_session.execute(text("SELECT 1"))
+
+    return app
+
+
+async def test_query_stats_server_timing(api_client: AsyncClient, ffc_jwt_token: str):
+    response = await api_client.get(
+        "/entitlements", headers={"Authorization": f"Bearer {ffc_jwt_token}"}
+    )
+
+    assert response.status_code == 200
+    match = re.fullmatch(
+        r'db;dur=\d+\.\d;desc="(\d+) queries, \d+ rows"', response.headers["server-timing"]
+    )
+    assert match is not None
+    assert int(match.group(1)) >= 2
+
+
+async def test_query_stats_metrics(
+    queries_app: FastAPI, db_session: AsyncSession, mocker: MockerFixture
+):
+    await db_session.execute(text("SELECT 1"))
+    record_queries = mocker.patch.object(middleware.db_queries_histogram, "record")
+    record_rows = mocker.patch.object(middleware.db_rows_histogram, "record")
+
+    async with AsyncClient(
+        transport=ASGITransport(app=queries_app), base_url="http://test"
+    ) as client:
+        response = await client.get("/queries/2")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].endswith('desc="2 queries, 2 rows"')
+    attributes = {"http.request.method": "GET", "http.route": "/queries/{count}"}
+    record_queries.assert_called_once_with(2, attributes)
+    record_rows.assert_called_once_with(2, attributes)
+
+
+@pytest.mark.parametrize(("count", "warning"), [(2, False), (3, True)])
+async def test_query_stats_budget(
+    queries_app: FastAPI,
+    db_session: AsyncSession,
+    caplog: pytest.LogCaptureFixture,
+    count: int,
+    warning: bool,
+):
+    await db_session.execute(text("SELECT 1"))
+
+    with caplog.at_level(logging.WARNING, logger="app.middleware"):
+        async with AsyncClient(
+            transport=ASGITransport(app=queries_app), base_url="http://test"
+        ) as client:
+            await client.get(f"/queries/{count}")
+
+    expected = "GET /queries/{count} executed 3 database queries, exceeding the budget of 2"
+    assert (expected in caplog.text) is warning
@@ -0,0 +1,61 @@
+from datetime import UTC, datetime
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.db.models import Account, Entitlement, System
+from app.enums import EntitlementStatus
+from app.pagination import LimitOffsetPage, LimitOffsetParams, PageResponse
+from app.schemas.core import convert_model_to_schema
+from app.schemas.entitlements import EntitlementRead
+
+
+async def test_page_response_matches_the_response_model_serialization(
+    fastapi_app: FastAPI, gcp_extension: System, affiliate_account: Account
+):
+    entitlements = []
+    for i in range(3):
+        entitlement = Entitlement(
+            id=f"FENT-1234-5678-000{i}",
+            name=f"Entitlement {i}",
+            affiliate_external_id=f"SUB-{i}",
+            datasource_id=f"datasource-{i}",
+            status=EntitlementStatus.NEW,
+            owner=affiliate_account,
+            # The None values are excluded from the response
+            linked_datasource_id=None,
+        )
+        entitlement.created_at = datetime(2025, 3, 1, tzinfo=UTC)
+        entitlement.updated_at = datetime(2025, 3, 2, tzinfo=UTC)
+        entitlement.created_by = gcp_extension
+        entitlement.updated_by = None
+        entitlements.append(entitlement)
+
+    page = LimitOffsetPage[EntitlementRead].create(
+        [convert_model_to_schema(EntitlementRead, entitlement) for entitlement in entitlements],
+        params=LimitOffsetParams(limit=10, offset=0),
+        total=3,
+    )
+    [route] = [
+        route
+        for route in fastapi_app.routes
+        if isinstance(route, APIRoute)
+        and route.path_format == "/entitlements"
+        and "GET" in route.methods
+    ]
+
+    expected = JSONResponse(
+        await serialize_response(
+            field=route.response_field,
+            response_content=page,
+            exclude_none=route.response_model_exclude_none,
+        )
+    )
+    response = PageResponse(page)
+
+    assert route.response_model_exclude_none
+    assert response.body == expected.body
+    assert response.headers["content-type"] == "application/json"
+    assert b"linked_datasource_id" not in response.body
+    assert b'"updated":{"at":"2025-03-02T00:00:00Z"}' in response.body
@@ -0,0 +1,35 @@
+import threading
+import time
+
+from app.profiling import SamplingProfiler
+
+
+def busy_function(duration: float) -> None:
+    end_time = time.perf_counter() + duration
+    while time.perf_counter() < end_time:
+        pass
+
+
+def test_sampling_profiler():
+    with SamplingProfiler(interval=0.001, thread_ids={threading.get_ident()}) as profiler:
+        busy_function(0.1)
+
+    assert not profiler.running
+    assert profiler.samples
+    [(stack, count)] = [
+        (stack, count) for stack, count in profiler.samples.items() if "busy_function" in stack
+    ]
+    assert count > 10
+    assert stack.split(";")[-2].startswith("test_sampling_profiler ")
+    assert stack.split(";")[-1].startswith(f"busy_function ({__file__}:")
+    assert f"{stack} {count}\n" in profiler.collapsed_stacks()
+
+
+def test_sampling_profiler_other_threads_are_left_out():
+    thread = threading.Thread(target=busy_function, args=(0.1,))
+
+    with SamplingProfiler(interval=0.001, thread_ids={threading.get_ident()}) as profiler:
+        thread.start()
+        thread.join()
+
+    assert not any("busy_function" in stack for stack in profiler.samples)
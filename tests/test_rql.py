@@ -0,0 +1,246 @@
+from unittest.mock import call
+
+import pytest
+from fastapi import HTTPException, Request
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from requela import RequelaError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app import rql
+from app.conf import Settings
+from app.db.replicas import ReplicaRouter
+from app.rql import (
+    DatasourceExpenseRules,
+    EntitlementRules,
+    RQLComplexity,
+    RQLComplexityError,
+    RQLQuery,
+    RQLQueryCache,
+    UserRules,
+    check_rql_complexity,
+    check_rql_query_cost,
+    get_rql_complexity,
+    rql_query_cache,
+)
+
+
+def make_request(query_string: str) -> Request:
+    return Request({"type": "http", "query_string": query_string.encode()})
+
+
+def test_rql_query_cache_hits():
+    cache = RQLQueryCache()
+
+    query = cache.build_query(EntitlementRules(), "eq(status,active)")
+
+    assert cache.build_query(EntitlementRules(), "eq(status,active)") is query
+    assert cache.build_query(UserRules(), "eq(status,active)") is not query
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate == pytest.approx(1 / 3)
+
+
+def test_rql_query_cache_records_the_requests(mocker: MockerFixture):
+    mocked_create_counter = mocker.patch("app.rql.meter.create_counter")
+    mocked_counter = mocker.patch("app.rql.rql_query_cache_requests_counter")
+    cache = RQLQueryCache()
+
+    for _ in range(2):
+        cache.build_query(UserRules(), "eq(status,active)")
+
+    # The counter is shared by the caches
+    mocked_create_counter.assert_not_called()
+    assert mocked_counter.add.call_args_list == [
+        call(1, {"hit": False, "rules": "UserRules"}),
+        call(1, {"hit": True, "rules": "UserRules"}),
+    ]
+
+
+def test_rql_query_cache_evicts_least_recently_used():
+    cache = RQLQueryCache(max_size=2)
+    rules = UserRules()
+    active = cache.build_query(rules, "eq(status,active)")
+    draft = cache.build_query(rules, "eq(status,draft)")
+
+    assert cache.build_query(rules, "eq(status,active)") is active
+    cache.build_query(rules, "eq(status,deleted)")
+
+    assert cache.build_query(rules, "eq(status,active)") is active
+    assert cache.build_query(rules, "eq(status,draft)") is not draft
+
+
+def test_rql_query_cache_disabled():
+    cache = RQLQueryCache(max_size=0)
+    rules = UserRules()
+
+    assert cache.build_query(rules, "eq(status,active)") is not cache.build_query(
+        rules, "eq(status,active)"
+    )
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_rql_query_cache_does_not_cache_invalid_expressions():
+    cache = RQLQueryCache()
+
+    for _ in range(2):
+        with pytest.raises(RequelaError):
+            cache.build_query(UserRules(), "eq(unknown,1)")
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_rql_query_cache_checks_the_complexity(
+    mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch, test_settings: Settings
+):
+    spied_get_rql_complexity = mocker.spy(rql, "get_rql_complexity")
+    cache = RQLQueryCache()
+    rules = UserRules()
+    expression = "in(status,(active,draft))"
+
+    query = cache.build_query(rules, expression, test_settings)
+    assert cache.build_query(rules, expression, test_settings) is query
+    # The complexity is cached along with the query
+    spied_get_rql_complexity.assert_called_once()
+
+    monkeypatch.setattr(test_settings, "rql_max_in_values", 1)
+    with pytest.raises(RQLComplexityError, match="too many values in a list"):
+        cache.build_query(rules, expression, test_settings)
+
+
+def test_rql_query_cache_does_not_cache_too_complex_expressions(
+    monkeypatch: pytest.MonkeyPatch, test_settings: Settings
+):
+    monkeypatch.setattr(test_settings, "rql_max_in_values", 1)
+    cache = RQLQueryCache()
+
+    for _ in range(2):
+        with pytest.raises(RQLComplexityError):
+            cache.build_query(UserRules(), "in(status,(active,draft))", test_settings)
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+async def test_rql_query_uses_the_cache(db_session: AsyncSession, test_settings: Settings):
+    rql_query_cache.clear()
+    rql_query = RQLQuery(EntitlementRules())
+
+    query = await rql_query(
+        make_request("eq(status,active)&limit=10&offset=0"), db_session, test_settings
+    )
+
+    assert query is not None
+    assert (
+        await rql_query(
+            make_request("eq(status,active)&limit=20&offset=20"), db_session, test_settings
+        )
+        is query
+    )
+    assert await rql_query(make_request("limit=10"), db_session, test_settings) is None
+    assert rql_query_cache.hits == 1
+
+
+async def test_rql_query_invalid_expression(db_session: AsyncSession, test_settings: Settings):
+    with pytest.raises(HTTPException) as exc_info:
+        await RQLQuery(UserRules())(make_request("eq(unknown,1)"), db_session, test_settings)
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("rules", "expression", "expected"),
+    [
+        (UserRules(), "eq(status,active)", RQLComplexity(nodes=1)),
+        (
+            UserRules(),
+            "and(eq(user_accounts.accounts.name,Acme),in(status,(active,draft)))",
+            RQLComplexity(nodes=3, relationship_depth=2, in_values=2),
+        ),
+        (
+            UserRules(),
+            "any(user_accounts,or(eq(accounts.name,Acme),eq(accounts.status,active)))",
+            RQLComplexity(nodes=4, relationship_depth=2),
+        ),
+        (
+            EntitlementRules(),
+            "eq(events.created.at,2025-03-01)&eq(events.created.by.type,system)&order_by(name)",
+            RQLComplexity(nodes=2, relationship_depth=1),
+        ),
+        (
+            DatasourceExpenseRules(),
+            "out(organization.currency,(EUR,USD,GBP))&order_by(-organization.name)",
+            RQLComplexity(nodes=1, relationship_depth=1, in_values=3),
+        ),
+    ],
+)
+def test_get_rql_complexity(rules, expression: str, expected: RQLComplexity):
+    assert get_rql_complexity(rules, expression) == expected
+
+
+@pytest.mark.parametrize(
+    ("setting", "expression", "error"),
+    [
+        ("rql_max_nodes", "and(eq(status,active),eq(name,Peter))", "too many operations"),
+        (
+            "rql_max_relationship_depth",
+            "eq(user_accounts.accounts.name,Acme)",
+            "traverses too many relationships",
+        ),
+        ("rql_max_in_values", "in(status,(active,draft))", "too many values in a list"),
+    ],
+)
+def test_check_rql_complexity(
+    monkeypatch: pytest.MonkeyPatch,
+    test_settings: Settings,
+    setting: str,
+    expression: str,
+    error: str,
+):
+    check_rql_complexity(UserRules(), expression, test_settings)
+
+    monkeypatch.setattr(test_settings, setting, 1)
+    with pytest.raises(RQLComplexityError, match=error):
+        check_rql_complexity(UserRules(), expression, test_settings)
+
+
+async def test_check_rql_query_cost(db_session: AsyncSession):
+    query = EntitlementRules().build_query("eq(owner.name,Acme)")
+
+    await check_rql_query_cost(db_session, query, max_cost=1_000_000)
+
+    with pytest.raises(RQLComplexityError, match="too expensive"):
+        await check_rql_query_cost(db_session, query, max_cost=0.1)
+
+
+async def test_rql_query_rejects_complex_expressions(
+    monkeypatch: pytest.MonkeyPatch, db_session: AsyncSession, test_settings: Settings
+):
+    monkeypatch.setattr(test_settings, "rql_max_query_cost", 0.1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await RQLQuery(EntitlementRules())(
+            make_request("eq(owner.name,Acme)"), db_session, test_settings
+        )
+
+    assert exc_info.value.status_code == 400
+    assert "too expensive" in exc_info.value.detail
+
+
+async def test_rql_query_cost_checked_on_the_replica(
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    db_engine: AsyncEngine,
+    test_settings: Settings,
+    operations_client: AsyncClient,
+):
+    # The database of the tests isn't a replica, which is reported as no lag
+    router = ReplicaRouter()
+    router.configure(db_engine)
+    mocker.patch("app.dependencies.db.replica_router", router)
+    monkeypatch.setattr(test_settings, "rql_max_query_cost", 1_000_000)
+    spied_check_rql_query_cost = mocker.spy(rql, "check_rql_query_cost")
+
+    response = await operations_client.get("/entitlements?eq(status,active)")
+
+    assert response.status_code == 200
+    [session, _, _] = spied_check_rql_query_cost.call_args.args
+    assert session.bind is router.engine
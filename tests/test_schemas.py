@@ -2,11 +2,16 @@ import secrets
 from datetime import UTC, datetime
 
 import pytest
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from app.db.models import Account, Actor, Entitlement, Organization, System
 from app.enums import AccountType, ActorType, EntitlementStatus, OrganizationStatus, SystemStatus
-from app.schemas.core import ActorRead, convert_model_to_schema, convert_schema_to_model
+from app.schemas.core import (
+    ActorRead,
+    convert_model_to_schema,
+    convert_schema_to_model,
+    get_model_serializer,
+)
 from app.schemas.entitlements import EntitlementCreate, EntitlementRead, EntitlementUpdate
 from app.schemas.organizations import (
     OrganizationBase,
@@ -306,3 +311,55 @@ def test_organization_invalid_billing_currencies(currency):
     assert len(errors) == 1
     assert errors[0]["loc"] == ("billing_currency",)
     assert str(errors[0]["ctx"]["error"]) == f"Invalid iso4217 currency code: {currency}."
+
+
+def test_get_model_serializer_is_cached():
+    serializer = get_model_serializer(Organization, OrganizationRead)
+
+    assert get_model_serializer(Organization, OrganizationRead) is serializer
+    assert "events" not in serializer.field_names
+    assert serializer.events == (
+        ("created", "created_at", "created_by"),
+        ("updated", "updated_at", "updated_by"),
+        ("deleted", "deleted_at", "deleted_by"),
+    )
+
+
+def test_model_serializer_to_dict(ffc_extension: System):
+    organization = Organization(
+        id="FORG-1234-5678-9012",
+        name="Test Org",
+        currency="EUR",
+        billing_currency="EUR",
+        operations_external_id="ORG-123",
+        status=OrganizationStatus.ACTIVE,
+    )
+    organization.created_at = datetime(2025, 3, 1, tzinfo=UTC)
+    organization.updated_at = datetime(2025, 3, 2, tzinfo=UTC)
+    organization.created_by = ffc_extension
+    organization.updated_by = ffc_extension
+
+    data = get_model_serializer(Organization, OrganizationRead).to_dict(
+        organization, exclude_none=True
+    )
+
+    assert data == convert_model_to_schema(OrganizationRead, organization).model_dump(
+        mode="json", exclude_none=True
+    )
+    assert "linked_organization_id" not in data
+    assert "deleted" not in data["events"]
+    assert data["events"]["created"] == {
+        "at": "2025-03-01T00:00:00Z",
+        "by": {"id": ffc_extension.id, "type": "system", "name": ffc_extension.name},
+    }
+
+
+def test_model_serializer_unsupported_events_schema():
+    class UnsupportedEventsSchema(BaseModel):
+        created: ActorRead
+
+    class UnsupportedRead(BaseModel):
+        events: UnsupportedEventsSchema
+
+    with pytest.raises(TypeError, match="Unsupported schema type"):
+        get_model_serializer(Organization, UnsupportedRead)
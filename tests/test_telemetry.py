@@ -1,9 +1,36 @@
+import asyncio
+import json
+import pathlib
+import random
+import subprocess
+import sys
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.metrics.export import ConsoleMetricExporter
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import Decision
+from opentelemetry.trace import NonRecordingSpan, SpanContext, StatusCode, TraceFlags
 from pytest_mock import MockerFixture
 
 from app.telemetry import (
+    ErrorSpanProcessor,
+    FilteredSpanProcessor,
+    RouteRatioSampler,
+    capture_telemetry_cli_command,
+    cli_command_outer_phase,
+    cli_command_phase,
+    get_current_run_report,
+    get_metric_exporter,
+    record_cli_job_items,
+    record_cli_job_throughput,
     setup_fastapi_instrumentor,
     setup_sqlalchemy_instrumentor,
     setup_telemetry,
+    slow_sqlalchemy_queries,
 )
 
 
@@ -12,13 +39,21 @@ def test_setup_telemetry(mocker: MockerFixture):
     mock_settings.opentelemetry_exporter = "azure_app_insights"
     mock_settings.opentelemetry_connection_string = "mock_connection_string"
     mock_settings.opentelemetry_sqlalchemy_min_query_duration_ms = None
+    mock_settings.opentelemetry_metrics_connection_string = None
+    mock_settings.opentelemetry_metrics_export_interval_ms = 60000
+    mock_settings.opentelemetry_sampling_ratio = 0.5
+    mock_settings.opentelemetry_sampling_ratio_overrides = {"GET /expenses": 0.01}
+    mock_settings.opentelemetry_always_sample_errors = False
+    mock_settings.opentelemetry_batch_max_queue_size = 4096
+    mock_settings.opentelemetry_batch_max_export_batch_size = 256
+    mock_settings.opentelemetry_batch_schedule_delay_ms = 1000
     mocked_exporter = mocker.MagicMock()
     mocked_tracer_provider = mocker.MagicMock()
     mocked_set_tracer_provider = mocker.patch(
         "app.telemetry.trace.set_tracer_provider",
     )
     mocked_exporter_ctor = mocker.patch(
-        "app.telemetry.AzureMonitorTraceExporter",
+        "azure.monitor.opentelemetry.exporter.AzureMonitorTraceExporter",
         return_value=mocked_exporter,
     )
     mocked_batch_span_processor = mocker.MagicMock()
@@ -30,14 +65,30 @@ def test_setup_telemetry(mocker: MockerFixture):
         "app.telemetry.TracerProvider",
         return_value=mocked_tracer_provider,
     )
+    mocked_metric_exporter = mocker.MagicMock()
+    mocked_metric_exporter_ctor = mocker.patch(
+        "azure.monitor.opentelemetry.exporter.AzureMonitorMetricExporter",
+        return_value=mocked_metric_exporter,
+    )
+    mocked_metric_reader = mocker.MagicMock()
+    mocked_metric_reader_ctor = mocker.patch(
+        "app.telemetry.PeriodicExportingMetricReader",
+        return_value=mocked_metric_reader,
+    )
+    mocked_meter_provider = mocker.MagicMock()
+    mocked_meter_provider_ctor = mocker.patch(
+        "app.telemetry.MeterProvider",
+        return_value=mocked_meter_provider,
+    )
+    mocked_set_meter_provider = mocker.patch("app.telemetry.metrics.set_meter_provider")
     mocked_instrument_httpx = mocker.MagicMock()
     mocked_instrument_httpx_ctor = mocker.patch(
-        "app.telemetry.HTTPXClientInstrumentor",
+        "opentelemetry.instrumentation.httpx.HTTPXClientInstrumentor",
         return_value=mocked_instrument_httpx,
     )
     mocked_instrument_logging = mocker.MagicMock()
     mocked_instrument_logging_ctor = mocker.patch(
-        "app.telemetry.LoggingInstrumentor",
+        "opentelemetry.instrumentation.logging.LoggingInstrumentor",
         return_value=mocked_instrument_logging,
     )
     setup_telemetry(mock_settings)
@@ -45,10 +96,30 @@ def test_setup_telemetry(mocker: MockerFixture):
     mocked_exporter_ctor.assert_called_once_with(
         connection_string=mock_settings.opentelemetry_connection_string,
     )
-    mocked_batch_span_processor_ctor.assert_called_once_with(mocked_exporter)
+    mocked_batch_span_processor_ctor.assert_called_once_with(
+        mocked_exporter,
+        max_queue_size=4096,
+        max_export_batch_size=256,
+        schedule_delay_millis=1000,
+    )
     mocked_tracer_provider_ctor.assert_called_once()
+    sampler = mocked_tracer_provider_ctor.call_args.kwargs["sampler"]
+    assert isinstance(sampler, RouteRatioSampler)
+    assert sampler.default_sampler.rate == 0.5
+    assert sampler.samplers["GET /expenses"].rate == 0.01
+    assert not sampler.record_unsampled
     mocked_tracer_provider.add_span_processor.assert_called_once_with(mocked_batch_span_processor)
     mocked_set_tracer_provider.assert_called_once_with(mocked_tracer_provider)
+    mocked_metric_exporter_ctor.assert_called_once_with(
+        connection_string=mock_settings.opentelemetry_connection_string,
+    )
+    mocked_metric_reader_ctor.assert_called_once_with(
+        mocked_metric_exporter, export_interval_millis=60000
+    )
+    mocked_meter_provider_ctor.assert_called_once_with(
+        resource=mocker.ANY, metric_readers=[mocked_metric_reader]
+    )
+    mocked_set_meter_provider.assert_called_once_with(mocked_meter_provider)
     mocked_instrument_httpx_ctor.assert_called_once()
     mocked_instrument_httpx.instrument.assert_called_once()
     mocked_instrument_logging_ctor.assert_called_once()
@@ -64,7 +135,7 @@ def test_setup_telemetry_disabled(mocker: MockerFixture):
         "app.telemetry.trace.set_tracer_provider",
     )
     mocked_exporter_ctor = mocker.patch(
-        "app.telemetry.AzureMonitorTraceExporter",
+        "azure.monitor.opentelemetry.exporter.AzureMonitorTraceExporter",
         return_value=mocked_exporter,
     )
     mocked_batch_span_processor = mocker.MagicMock()
@@ -78,12 +149,12 @@ def test_setup_telemetry_disabled(mocker: MockerFixture):
     )
     mocked_instrument_httpx = mocker.MagicMock()
     mocked_instrument_httpx_ctor = mocker.patch(
-        "app.telemetry.HTTPXClientInstrumentor",
+        "opentelemetry.instrumentation.httpx.HTTPXClientInstrumentor",
         return_value=mocked_instrument_httpx,
     )
     mocked_instrument_logging = mocker.MagicMock()
     mocked_instrument_logging_ctor = mocker.patch(
-        "app.telemetry.LoggingInstrumentor",
+        "opentelemetry.instrumentation.logging.LoggingInstrumentor",
         return_value=mocked_instrument_logging,
     )
     setup_telemetry(mock_settings)
@@ -96,12 +167,26 @@ def test_setup_telemetry_disabled(mocker: MockerFixture):
     mocked_instrument_logging_ctor.assert_not_called()
 
 
+def test_exporters_and_instrumentors_are_imported_lazily():
+    code = (
+        "import sys\n"
+        "import app.telemetry\n"
+        "print(any(name.startswith(('azure.monitor', 'opentelemetry.exporter', "
+        "'opentelemetry.instrumentation.')) for name in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+
+    assert output.strip() == "False"
+
+
 def test_setup_fastapi_instrumentor(mocker: MockerFixture):
     mock_settings = mocker.MagicMock()
     mock_settings.opentelemetry_exporter = "azure_app_insights"
     mock_settings.opentelemetry_connection_string = "mock_connection_string"
     mocked_instrument_app = mocker.patch(
-        "app.telemetry.FastAPIInstrumentor.instrument_app",
+        "opentelemetry.instrumentation.fastapi.FastAPIInstrumentor.instrument_app",
     )
     mocked_app = mocker.MagicMock()
 
@@ -114,7 +199,7 @@ def test_setup_fastapi_instrumentor_disabled(mocker: MockerFixture):
     mock_settings = mocker.MagicMock()
     mock_settings.opentelemetry_exporter = None
     mocked_instrument_app = mocker.patch(
-        "app.telemetry.FastAPIInstrumentor.instrument_app",
+        "opentelemetry.instrumentation.fastapi.FastAPIInstrumentor.instrument_app",
     )
     mocked_app = mocker.MagicMock()
 
@@ -129,7 +214,7 @@ def test_setup_sqlalchemy_instrumentor(mocker: MockerFixture):
     mock_settings.opentelemetry_connection_string = "mock_connection_string"
     mocked_instrument_sqlalchemy = mocker.MagicMock()
     mocker.patch(
-        "app.telemetry.SQLAlchemyInstrumentor",
+        "opentelemetry.instrumentation.sqlalchemy.SQLAlchemyInstrumentor",
         return_value=mocked_instrument_sqlalchemy,
     )
     mocked_dbengine = mocker.MagicMock()
@@ -147,7 +232,7 @@ def test_setup_sqlalchemy_disabled(mocker: MockerFixture):
     mock_settings.opentelemetry_exporter = None
     mocked_instrument_sqlalchemy = mocker.MagicMock()
     mocker.patch(
-        "app.telemetry.SQLAlchemyInstrumentor",
+        "opentelemetry.instrumentation.sqlalchemy.SQLAlchemyInstrumentor",
         return_value=mocked_instrument_sqlalchemy,
     )
     mocked_dbengine = mocker.MagicMock()
@@ -155,3 +240,246 @@ def test_setup_sqlalchemy_disabled(mocker: MockerFixture):
     setup_sqlalchemy_instrumentor(mock_settings, mocked_dbengine)
 
     mocked_instrument_sqlalchemy.instrument.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("exporter", "metrics_connection_string", "expected_endpoint"),
+    [
+        ("jaeger", None, "http://collector:4318/v1/metrics"),
+        ("jaeger", "http://metrics:4318/v1/metrics", "http://metrics:4318/v1/metrics"),
+    ],
+)
+def test_get_metric_exporter_otlp(
+    mocker: MockerFixture,
+    exporter: str,
+    metrics_connection_string: str | None,
+    expected_endpoint: str,
+):
+    mock_settings = mocker.MagicMock()
+    mock_settings.opentelemetry_exporter = exporter
+    mock_settings.opentelemetry_connection_string = "http://collector:4318/v1/traces"
+    mock_settings.opentelemetry_metrics_connection_string = metrics_connection_string
+    mocked_exporter_ctor = mocker.patch(
+        "opentelemetry.exporter.otlp.proto.http.metric_exporter.OTLPMetricExporter"
+    )
+
+    assert get_metric_exporter(mock_settings) == mocked_exporter_ctor.return_value
+    mocked_exporter_ctor.assert_called_once_with(endpoint=expected_endpoint)
+
+
+def test_get_metric_exporter_console(mocker: MockerFixture):
+    mock_settings = mocker.MagicMock()
+    mock_settings.opentelemetry_exporter = "console"
+
+    assert isinstance(get_metric_exporter(mock_settings), ConsoleMetricExporter)
+
+
+def test_get_metric_exporter_unsupported(mocker: MockerFixture):
+    mock_settings = mocker.MagicMock()
+    mock_settings.opentelemetry_exporter = "unsupported"
+
+    with pytest.raises(ValueError, match="Unsupported OpenTelemetry exporter: unsupported"):
+        get_metric_exporter(mock_settings)
+
+
+async def test_cli_command_run_report(mocker: MockerFixture, tmp_path: pathlib.Path):
+    mocked_items_counter = mocker.patch("app.telemetry.cli_job_items_counter")
+    mocked_throughput_histogram = mocker.patch("app.telemetry.cli_job_throughput_histogram")
+    mocked_phase_histogram = mocker.patch("app.telemetry.cli_command_phase_duration_histogram")
+    report_path = tmp_path / "report.json"
+    mocker.patch("app.telemetry._run_report_path", str(report_path))
+
+    @capture_telemetry_cli_command(__name__, "My Command")
+    async def my_command() -> None:
+        for _ in range(2):
+            with cli_command_phase("fetch"):
+                await asyncio.sleep(0)
+        with cli_command_phase("store", frequency="daily"):
+            record_cli_job_throughput("rows", 50, 2.0, frequency="daily")
+        record_cli_job_items("organizations", 2)
+
+    await my_command()
+
+    report = json.loads(report_path.read_text())
+    assert report["command"] == "My Command"
+    assert report["status"] == "success"
+    assert report["error"] is None
+    assert report["finished_at"] >= report["started_at"]
+    assert report["duration"] > 0
+    assert report["phases"].keys() == {"fetch", "store"}
+    assert report["phases"]["fetch"]["calls"] == 2
+    assert report["phases"]["store"]["calls"] == 1
+    assert report["items"] == {"rows": 50, "organizations": 2}
+
+    rows_attributes = {"cli.command": "My Command", "cli.job.item": "rows", "frequency": "daily"}
+    mocked_items_counter.add.assert_any_call(50, rows_attributes)
+    mocked_items_counter.add.assert_any_call(
+        2, {"cli.command": "My Command", "cli.job.item": "organizations"}
+    )
+    mocked_throughput_histogram.record.assert_called_once_with(25.0, rows_attributes)
+    mocked_phase_histogram.record.assert_any_call(
+        mocker.ANY,
+        {"cli.command": "My Command", "cli.command.phase": "store", "frequency": "daily"},
+    )
+    assert mocked_phase_histogram.record.call_count == 3
+
+
+async def test_cli_command_run_report_error(
+    mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+):
+    mocker.patch("app.telemetry._run_report_path", "-")
+
+    @capture_telemetry_cli_command(__name__, "My Command")
+    async def my_command() -> None:
+        with cli_command_phase("fetch"):
+            await asyncio.sleep(0)
+            raise RuntimeError("Optscale is down")
+
+    with pytest.raises(RuntimeError):
+        await my_command()
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["status"] == "error"
+    assert report["error"] == "Optscale is down"
+    assert report["phases"]["fetch"]["calls"] == 1
+
+
+def test_cli_command_phase_outside_command(mocker: MockerFixture):
+    mocked_phase_histogram = mocker.patch("app.telemetry.cli_command_phase_duration_histogram")
+
+    with cli_command_phase("notify"):
+        pass
+
+    assert get_current_run_report() is None
+    mocked_phase_histogram.record.assert_not_called()
+
+
+async def test_cli_command_outer_phase(mocker: MockerFixture):
+    mocker.patch("app.telemetry._run_report_path", None)
+    mocked_get_tracer = mocker.patch("app.telemetry.trace.get_tracer", wraps=trace.get_tracer)
+    reports = []
+
+    @capture_telemetry_cli_command(__name__, "My Command")
+    async def my_command() -> None:
+        with cli_command_phase("fetch"):
+            await asyncio.sleep(0)
+            with cli_command_outer_phase("notify"):
+                pass
+        with cli_command_outer_phase("notify"):
+            pass
+        reports.append(get_current_run_report())
+
+    await my_command()
+
+    [report] = reports
+    assert report.phases.keys() == {"fetch", "notify"}
+    assert report.phases["notify"].calls == 1
+
+    mocked_get_tracer.reset_mock()
+    with cli_command_outer_phase("notify"):
+        pass
+
+    mocked_get_tracer.assert_not_called()
+
+
+def get_sampling_decision(
+    sampler: RouteRatioSampler, name: str, parent_context: Context | None = None
+) -> Decision:
+    return sampler.should_sample(
+        parent_context, trace_id=random.getrandbits(128), name=name
+    ).decision
+
+
+def test_route_ratio_sampler_overrides():
+    sampler = RouteRatioSampler(1.0, {"GET /expenses": 0.0})
+
+    assert get_sampling_decision(sampler, "GET /entitlements") == Decision.RECORD_AND_SAMPLE
+    assert get_sampling_decision(sampler, "GET /expenses") == Decision.DROP
+
+
+def test_route_ratio_sampler_records_unsampled():
+    sampler = RouteRatioSampler(0.0, record_unsampled=True)
+
+    assert get_sampling_decision(sampler, "GET /entitlements") == Decision.RECORD_ONLY
+
+
+@pytest.mark.parametrize(
+    ("parent_sampled", "record_unsampled", "expected"),
+    [
+        (True, False, Decision.RECORD_AND_SAMPLE),
+        (False, False, Decision.DROP),
+        (False, True, Decision.RECORD_ONLY),
+    ],
+)
+def test_route_ratio_sampler_follows_parent(
+    parent_sampled: bool, record_unsampled: bool, expected: Decision
+):
+    # The requests continuing a trace started by another service are sampled like it,
+    # whatever the ratio configured for them
+    sampler = RouteRatioSampler(
+        0.0 if parent_sampled else 1.0,
+        {"GET /expenses": 0.0 if parent_sampled else 1.0},
+        record_unsampled=record_unsampled,
+    )
+    parent_context = trace.set_span_in_context(
+        NonRecordingSpan(
+            SpanContext(
+                trace_id=random.getrandbits(128),
+                span_id=random.getrandbits(64),
+                is_remote=True,
+                trace_flags=TraceFlags(TraceFlags.SAMPLED if parent_sampled else 0),
+            )
+        )
+    )
+
+    assert get_sampling_decision(sampler, "GET /expenses", parent_context) == expected
+
+
+def test_error_spans_of_unsampled_traces_are_exported():
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider(
+        sampler=RouteRatioSampler(0.0, {"GET /errors": 1.0}, record_unsampled=True)
+    )
+    tracer_provider.add_span_processor(ErrorSpanProcessor(SimpleSpanProcessor(exporter)))
+    tracer = tracer_provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("GET /errors"):
+        pass
+    with tracer.start_as_current_span("GET /entitlements"):
+        with tracer.start_as_current_span("SELECT") as span:
+            span.set_status(StatusCode.ERROR)
+        with tracer.start_as_current_span("SELECT"):
+            pass
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["GET /errors", "SELECT"]
+    assert all(span.context.trace_flags.sampled for span in exporter.get_finished_spans())
+
+
+def test_error_spans_of_unsampled_traces_are_filtered():
+    exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider(
+        sampler=RouteRatioSampler(0.0, {"GET /errors": 1.0}, record_unsampled=True)
+    )
+    tracer_provider.add_span_processor(
+        ErrorSpanProcessor(
+            FilteredSpanProcessor(
+                SimpleSpanProcessor(exporter), slow_sqlalchemy_queries(min_duration_ms=1000)
+            )
+        )
+    )
+    tracer = tracer_provider.get_tracer(__name__)
+    sqlalchemy_tracer = tracer_provider.get_tracer("opentelemetry.instrumentation.sqlalchemy")
+
+    with tracer.start_as_current_span("GET /errors"):
+        with sqlalchemy_tracer.start_as_current_span("SELECT sampled"):
+            pass
+    with tracer.start_as_current_span("GET /entitlements"):
+        with sqlalchemy_tracer.start_as_current_span("SELECT failed") as span:
+            span.set_status(StatusCode.ERROR)
+        with sqlalchemy_tracer.start_as_current_span("SELECT unsampled"):
+            pass
+
+    assert [span.name for span in exporter.get_finished_spans()] == [
+        "GET /errors",
+        "SELECT failed",
+    ]